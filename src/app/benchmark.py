@@ -0,0 +1,179 @@
+import argparse
+import logging
+import os
+import time
+import yaml
+import numpy as np
+import pandas as pd
+from sklearn.metrics import recall_score, roc_auc_score
+
+from src.data.sampling import resample, SAMPLING_METHODS
+from src.models.model_factory import build_model, resolve_params, MODEL_BUILDERS
+from src.models.predict_model import labels_from_proba
+
+logger = logging.getLogger(__name__)
+
+def _load_processed(config: dict):
+    """Carrega os dados de treino e teste processados definidos no config."""
+    data = config['data']
+    X_train = pd.read_csv(data['train_features_path'])
+    y_train = pd.read_csv(data['train_target_path']).squeeze()
+    X_test = pd.read_csv(data['test_features_path'])
+    y_test = pd.read_csv(data['test_target_path']).squeeze()
+    return X_train, y_train, X_test, y_test
+
+def benchmark_sampling(config: dict, methods=SAMPLING_METHODS) -> dict:
+    """
+    Compara as estratégias de balanceamento: tempo de reamostragem, tempo de treino,
+    recall e ROC AUC no conjunto de teste, usando o modelo configurado em training.
+
+    Args:
+        config (dict): Configuração do projeto (config.yaml).
+        methods: Estratégias a comparar.
+
+    Returns:
+        dict: Resultados por estratégia.
+    """
+    X_train, y_train, X_test, y_test = _load_processed(config)
+    preprocessing = config.get('preprocessing', {})
+    model_type = config['training']['model_type']
+    params = resolve_params(config['training'])
+
+    results = {}
+    for method in methods:
+        logger.info(f"Avaliando estratégia de balanceamento: {method}")
+        start = time.perf_counter()
+        X_res, y_res = resample(
+            X_train, y_train,
+            method=method,
+            sampling_ratio=preprocessing.get('sampling_ratio', 1.0),
+            k_neighbors=preprocessing.get('smote_k_neighbors', 5),
+            random_state=params.get('random_state', 42)
+        )
+        resample_seconds = time.perf_counter() - start
+
+        model = build_model(model_type, params)
+        start = time.perf_counter()
+        model.fit(X_res, y_res)
+        fit_seconds = time.perf_counter() - start
+
+        probabilities = model.predict_proba(X_test)
+        y_pred = labels_from_proba(model, probabilities)
+        y_proba = probabilities[:, 1]
+        results[method] = {
+            'train_rows': int(len(y_res)),
+            'resample_seconds': round(resample_seconds, 4),
+            'fit_seconds': round(fit_seconds, 4),
+            'recall': float(recall_score(y_test, y_pred)),
+            'roc_auc': float(roc_auc_score(y_test, y_proba)),
+        }
+        logger.info(f"{method}: {results[method]}")
+
+    return results
+
+def _measure_inference(model, X: pd.DataFrame, n_single_rows: int = 200) -> dict:
+    """
+    Mede a latência de inferência: custo por linha em lote e latência de uma única linha
+    (mediana e p95), que é o cenário de uma chamada online.
+    """
+    start = time.perf_counter()
+    model.predict_proba(X)
+    batch_seconds = time.perf_counter() - start
+
+    single_latencies = []
+    for i in range(min(n_single_rows, len(X))):
+        row = X.iloc[[i]]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single_latencies.append(time.perf_counter() - start)
+
+    return {
+        'batch_seconds': round(batch_seconds, 4),
+        'batch_us_per_row': round(1e6 * batch_seconds / len(X), 3),
+        'single_row_ms_p50': round(1e3 * float(np.percentile(single_latencies, 50)), 4),
+        'single_row_ms_p95': round(1e3 * float(np.percentile(single_latencies, 95)), 4),
+    }
+
+def benchmark_models(config: dict, model_types=tuple(MODEL_BUILDERS)) -> dict:
+    """
+    Compara os backends de modelo: tempo de treino, latência de inferência e ROC AUC.
+
+    Cada backend usa os seus parâmetros de training.params (ver model_factory.resolve_params)
+    sobre os padrões de model_factory.DEFAULT_PARAMS. O balanceamento configurado é aplicado
+    igualmente a todos.
+
+    Args:
+        config (dict): Configuração do projeto (config.yaml).
+        model_types: Backends a comparar.
+
+    Returns:
+        dict: Resultados por backend.
+    """
+    X_train, y_train, X_test, y_test = _load_processed(config)
+    preprocessing = config.get('preprocessing', {})
+    X_train, y_train = resample(
+        X_train, y_train,
+        method=preprocessing.get('sampling_method', 'none'),
+        sampling_ratio=preprocessing.get('sampling_ratio', 1.0),
+        k_neighbors=preprocessing.get('smote_k_neighbors', 5),
+        random_state=resolve_params(config['training']).get('random_state', 42)
+    )
+
+    results = {}
+    for model_type in model_types:
+        params = resolve_params(config['training'], model_type)
+        logger.info(f"Avaliando backend: {model_type}")
+
+        model = build_model(model_type, params)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        probabilities = model.predict_proba(X_test)
+        results[model_type] = {
+            'fit_seconds': round(fit_seconds, 4),
+            'roc_auc': float(roc_auc_score(y_test, probabilities[:, 1])),
+            'recall': float(recall_score(y_test, labels_from_proba(model, probabilities))),
+            'inference': _measure_inference(model, X_test),
+        }
+        logger.info(f"{model_type}: {results[model_type]}")
+
+    return results
+
+def _save_results(results: dict, output_path: str) -> None:
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w') as f:
+        yaml.safe_dump(results, f, sort_keys=False)
+    logger.info(f"Resultados do benchmark salvos em: {output_path}")
+
+def main():
+    """
+    Função principal para executar os benchmarks via linha de comando.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Executa benchmarks de desempenho do pipeline.")
+    parser.add_argument('--config', type=str, default='config.yaml', help='Caminho para o arquivo de configuração YAML.')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    sampling_parser = subparsers.add_parser('sampling', help='Compara estratégias de balanceamento (tempo de treino e recall).')
+    sampling_parser.add_argument('--methods', nargs='+', default=list(SAMPLING_METHODS), choices=SAMPLING_METHODS)
+    sampling_parser.add_argument('--output', type=str, default='runs/benchmarks/sampling.yaml', help='Arquivo YAML de saída.')
+
+    models_parser = subparsers.add_parser('models', help='Compara backends de modelo (treino, inferência e ROC AUC).')
+    models_parser.add_argument('--model-types', nargs='+', default=list(MODEL_BUILDERS), choices=list(MODEL_BUILDERS))
+    models_parser.add_argument('--output', type=str, default='runs/benchmarks/models.yaml', help='Arquivo YAML de saída.')
+
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    if args.benchmark == 'sampling':
+        results = benchmark_sampling(config, args.methods)
+    elif args.benchmark == 'models':
+        results = benchmark_models(config, args.model_types)
+    _save_results(results, args.output)
+
+if __name__ == '__main__':
+    main()
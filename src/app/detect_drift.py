@@ -1,34 +1,107 @@
-import pandas as pd
 import argparse
 import logging
+import os
 import sys
 import json
 from pathlib import Path
-from scipy.stats import ks_2samp, chi2_contingency
+from typing import Optional
+
+from src.utils.model_utils import load_feature_manifest, FEATURE_MANIFEST_FILENAME
 
 # Configuração do logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def detect_drift(reference_path: str, current_path: str, report_path: str, alpha: float = 0.01) -> None:
+def _compare_with_profile(profile: dict, current_data, common_cols: list, alpha: float, drift_results: dict) -> None:
+    """
+    Testa cada feature contra o perfil de referência (teste Qui-quadrado de aderência).
+
+    Numéricas: contagens dos dados atuais nas faixas de quantis do treino contra as proporções
+    do treino; categóricas: frequência de cada categoria contra a do treino. Preenche
+    drift_results['feature_details'] e drift_results['drifted_features_list'].
+    """
+    import numpy as np
+    from scipy.stats import chisquare
+    from src.data.profiling import bin_counts
+
+    for col in sorted(common_cols):
+        reference = profile['features'][col]
+        values = current_data[col].dropna()
+        if len(values) < 2:
+            logger.warning(f"Feature '{col}' pulada: não há amostras suficientes para o teste.")
+            continue
+
+        if reference['type'] == 'numerical':
+            observed = bin_counts(values, reference['edges'])
+            expected_share = np.asarray(reference['proportions'], dtype=np.float64)
+        else:
+            categories = sorted(reference['proportions'])
+            current_counts = values.astype(str).value_counts()
+            if not set(current_counts.index) <= set(categories):
+                logger.warning(f"Feature '{col}' pulada: categorias ausentes no perfil de referência. "
+                               "Não é adequado para o teste Qui-quadrado.")
+                continue
+            observed = np.array([current_counts.get(cat, 0) for cat in categories])
+            expected_share = np.array([reference['proportions'][cat] for cat in categories])
+
+        # Faixas/categorias sem ocorrência no treino não entram no teste
+        keep = expected_share > 0
+        if keep.sum() < 2:
+            logger.warning(f"Feature '{col}' pulada: o perfil tem menos de 2 faixas/categorias.")
+            continue
+        observed, expected_share = observed[keep], expected_share[keep]
+        expected = expected_share / expected_share.sum() * observed.sum()
+
+        chi2, p_value = chisquare(observed, expected)
+        is_drifted = p_value < alpha
+        drift_results['feature_details'][col] = {
+            'type': reference['type'], 'test': 'Chi-squared (perfil de referência)',
+            'statistic': float(chi2), 'p_value': float(p_value), 'drifted': bool(is_drifted)
+        }
+        if is_drifted:
+            drift_results['drifted_features_list'].append(col)
+
+def detect_drift(reference_path: str, current_path: str, report_path: str, alpha: float = 0.01, model_path: Optional[str] = None) -> None:
     """
     Detecta desvio de dados entre dois datasets usando testes estatísticos (KS e Qui-quadrado).
 
         Args:
-        reference_path (str): Caminho para o arquivo CSV de referência.
+        reference_path (str): Caminho para o CSV de referência ou para o perfil de referência
+            salvo pelo pipeline de treino (drift_reference.json; ver src.data.profiling).
         current_path (str): Caminho para o arquivo CSV atual.
         report_path (str): Caminho para salvar o relatório JSON de desvio.
         alpha (float): Nível de significância para os testes estatísticos.
+        model_path (str, opcional): Modelo cujo manifesto de features restringe a análise
+            (e a leitura dos CSVs) às colunas usadas pelo modelo.
     """
+    # Importados sob demanda: a API e o agendador importam este módulo na inicialização
+    import pandas as pd
+    from scipy.stats import ks_2samp, chi2_contingency
+
     logger.info("DETECÇÃO DE DESVIO DE DADOS")
     logger.info(f"Dados de Referência: {reference_path}")
     logger.info(f"Dados Atuais: {current_path}")
     logger.info(f"Nível de Significância (alpha): {alpha}")
 
     # --- Carregar Dados ---
+    usecols = None
+    if model_path:
+        manifest = load_feature_manifest(model_path)
+        if manifest is not None:
+            model_features = set(manifest['names'])
+            usecols = lambda col: col in model_features
+            logger.info(f"Analisando apenas as {len(model_features)} features do modelo: {model_path}")
+
+    # Perfil salvo pelo pipeline (drift_reference.json): compara com as faixas do treino sem relê-lo
+    use_profile = str(reference_path).endswith('.json')
     try:
-        reference_data = pd.read_csv(reference_path)
-        current_data = pd.read_csv(current_path)
+        if use_profile:
+            from src.data.profiling import load_drift_reference
+            profile = load_drift_reference(reference_path)
+            reference_data = pd.DataFrame(columns=list(profile['features']))
+        else:
+            reference_data = pd.read_csv(reference_path, usecols=usecols)
+        current_data = pd.read_csv(current_path, usecols=usecols)
         logger.info("Dados carregados com sucesso.")
     except Exception as e:
         logger.error(f"Erro ao carregar dados: {e}")
@@ -39,6 +112,8 @@ def detect_drift(reference_path: str, current_path: str, report_path: str, alpha
         reference_data = reference_data.drop(columns=['Class'])
     if 'Class' in current_data.columns:
         current_data = current_data.drop(columns=['Class'])
+    if use_profile and usecols is not None:
+        reference_data = reference_data[[col for col in reference_data.columns if usecols(col)]]
 
     common_cols = list(set(reference_data.columns) & set(current_data.columns))
     if not common_cols:
@@ -56,9 +131,13 @@ def detect_drift(reference_path: str, current_path: str, report_path: str, alpha
         'feature_details': {}
     }
 
-    # Identificar colunas numéricas e categóricas (com base nos dados de referência)
-    numerical_cols = reference_data.select_dtypes(include=['number']).columns
-    categorical_cols = reference_data.select_dtypes(exclude=['number']).columns
+    if use_profile:
+        _compare_with_profile(profile, current_data, common_cols, alpha, drift_results)
+        numerical_cols = categorical_cols = []
+    else:
+        # Identificar colunas numéricas e categóricas (com base nos dados de referência)
+        numerical_cols = reference_data.select_dtypes(include=['number']).columns
+        categorical_cols = reference_data.select_dtypes(exclude=['number']).columns
 
     # 1. Drift em Features Numéricas (Teste KS)
     for col in numerical_cols:
@@ -129,20 +208,61 @@ def detect_drift(reference_path: str, current_path: str, report_path: str, alpha
 
     return drift_results
 
+def run_cached_drift_check(cache, reference_path: str, current_path: str, report_path: str, alpha: float = 0.01,
+                           model_path: Optional[str] = None):
+    """
+    Igual a detect_drift, mas reaproveita o relatório de uma checagem idêntica anterior.
+
+    A chave combina as impressões digitais (tamanho, data de modificação e SHA-256) da
+    referência, dos dados atuais e, quando model_path é informado, do manifesto de features do
+    run (que define as colunas analisadas) com alpha. Em um acerto, o
+    relatório só é regravado em report_path se o arquivo existente for diferente.
+
+    Args:
+        cache (ResultCache): Cache de resultados.
+        (demais argumentos: ver detect_drift)
+
+    Returns:
+        (dict, bool): Resultados da análise e se eles vieram do cache.
+    """
+    key = cache.make_key(
+        'drift',
+        reference=cache.fingerprint(reference_path),
+        current=cache.fingerprint(current_path),
+        manifest=cache.fingerprint_if_exists(os.path.join(os.path.dirname(model_path), FEATURE_MANIFEST_FILENAME))
+        if model_path else None,
+        alpha=alpha
+    )
+    cached_path = cache.get_path('drift', key)
+    if cached_path is not None:
+        with open(cached_path, 'rb') as f:
+            report = f.read()
+        report_path = Path(report_path)
+        if not report_path.exists() or report_path.read_bytes() != report:
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_bytes(report)
+        logger.info(f"Relatório de desvio reaproveitado do cache: {report_path.absolute()}")
+        return json.loads(report), True
+
+    drift_results = detect_drift(reference_path, current_path, report_path, alpha, model_path)
+    cache.put_json('drift', key, drift_results)
+    return drift_results, False
+
 
 def main():
     parser = argparse.ArgumentParser(
         description="Detecta desvio de dados entre dois datasets usando testes estatísticos (Scipy).",
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
-    parser.add_argument('--reference', type=str, required=True, help='Caminho para o CSV de referência.')
+    parser.add_argument('--reference', type=str, required=True, help='CSV de referência ou perfil drift_reference.json gerado pelo pipeline.')
     parser.add_argument('--current', type=str, required=True, help='Caminho para o CSV atual.')
     parser.add_argument('--report_path', type=str, default='drift_report.json', help='Caminho para salvar o relatório JSON.')
     parser.add_argument('--alpha', type=float, default=0.05, help='Nível de significância (p-value threshold).')
+    parser.add_argument('--model-path', type=str, default=None, help='Modelo cujo manifesto de features restringe as colunas analisadas.')
     
     args = parser.parse_args()
     
-    results = detect_drift(args.reference, args.current, args.report_path, args.alpha)
+    results = detect_drift(args.reference, args.current, args.report_path, args.alpha, args.model_path)
 
     # Sair com status apropriado para uso em CLI
     if results['drift_detected']:
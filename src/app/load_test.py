@@ -0,0 +1,304 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import pandas as pd
+import psutil
+
+from src.models.predict_model import required_input_columns
+from src.utils.model_utils import load_feature_manifest, load_feature_transformer
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ('batch-predict', 'upload', 'check-drift')
+
+# Colunas do dataset original (usadas quando o run não tem manifesto de features)
+DEFAULT_COLUMNS = ['Time'] + [f'V{i}' for i in range(1, 29)] + ['Amount']
+
+def make_synthetic_batches(output_dir: str, columns: list, n_batches: int = 10, rows_per_batch: int = 1000,
+                           seed: int = 42) -> list:
+    """
+    Gera lotes CSV sintéticos de transações com as colunas informadas.
+
+    Returns:
+        list: Caminhos dos CSVs gerados.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(n_batches):
+        batch = pd.DataFrame(rng.normal(size=(rows_per_batch, len(columns))), columns=columns)
+        if 'Time' in batch:
+            batch['Time'] = np.sort(rng.uniform(0, 172_800, rows_per_batch))
+        if 'Amount' in batch:
+            batch['Amount'] = rng.lognormal(3, 1.5, rows_per_batch)
+        path = os.path.join(output_dir, f'batch_{i:04d}.csv')
+        batch.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+def build_requests(scenario: str, batch_paths: list, n_requests: int, model_path: str,
+                   reference_path: str = None, report_dir: str = None) -> list:
+    """
+    Monta as requisições do cenário, reutilizando os lotes sintéticos em rodízio.
+
+    Returns:
+        list: Dicionários com 'method', 'url' e argumentos do httpx.
+    """
+    requests = []
+    for i in range(n_requests):
+        batch_path = batch_paths[i % len(batch_paths)]
+        if scenario == 'batch-predict':
+            requests.append({'method': 'POST', 'url': '/batch-predict',
+                             'json': {'model_path': model_path, 'input_data_path': batch_path}})
+        elif scenario == 'upload':
+            with open(batch_path, 'rb') as f:
+                content = f.read()
+            requests.append({'method': 'POST', 'url': '/batch-predict/upload',
+                             'params': {'model_path': model_path},
+                             'headers': {'Content-Type': 'text/csv'}, 'content': content})
+        elif scenario == 'check-drift':
+            requests.append({'method': 'POST', 'url': '/check-drift',
+                             'json': {'reference_path': reference_path, 'current_path': batch_path,
+                                      'report_path': os.path.join(report_dir, f'drift_{i:05d}.json'),
+                                      'model_path': model_path}})
+        else:
+            raise ValueError(f"Cenário '{scenario}' não suportado. Opções: {SCENARIOS}")
+    return requests
+
+def _percentiles(latencies: list) -> dict:
+    if not latencies:
+        return {'p50': None, 'p95': None, 'p99': None, 'mean': None, 'max': None}
+    values = 1e3 * np.asarray(latencies)
+    return {
+        'p50': round(float(np.percentile(values, 50)), 3),
+        'p95': round(float(np.percentile(values, 95)), 3),
+        'p99': round(float(np.percentile(values, 99)), 3),
+        'mean': round(float(values.mean()), 3),
+        'max': round(float(values.max()), 3),
+    }
+
+async def _sample_rss(pid: int, interval: float, start: float, timeline: list, stop: asyncio.Event) -> None:
+    process = psutil.Process(pid)
+    while not stop.is_set():
+        timeline.append({'t': round(time.perf_counter() - start, 3),
+                         'rss_mb': round(process.memory_info().rss / 2 ** 20, 2)})
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+async def run_load_test(client: httpx.AsyncClient, requests: list, concurrency: int = 4, rate: float = None,
+                        server_pid: int = None, sample_interval: float = 0.5) -> dict:
+    """
+    Dispara as requisições com no máximo 'concurrency' em andamento.
+
+    Sem 'rate', cada requisição sai assim que uma vaga é liberada (carga fechada). Com 'rate'
+    (requisições/s), as requisições são agendadas em intervalos fixos, independentemente das
+    respostas (carga aberta); a latência inclui a espera por uma vaga.
+
+    Returns:
+        dict: Resumo (latência p50/p95/p99, vazão, taxa de erro), códigos de status e a série de RSS.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors, status_codes = [], [], {}
+    rss_timeline = []
+    start = time.perf_counter()
+    stop_sampling = asyncio.Event()
+    sampler = None
+    if server_pid is not None:
+        sampler = asyncio.create_task(_sample_rss(server_pid, sample_interval, start, rss_timeline, stop_sampling))
+
+    async def send(spec: dict, scheduled: float = None) -> None:
+        async with semaphore:
+            # Carga fechada: a latência conta a partir do envio; carga aberta: a partir do agendamento
+            scheduled = scheduled or time.perf_counter()
+            request = {k: v for k, v in spec.items() if k not in ('method', 'url')}
+            try:
+                response = await client.request(spec['method'], spec['url'], **request)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latency = time.perf_counter() - scheduled
+            status_codes[str(status)] = status_codes.get(str(status), 0) + 1
+            if isinstance(status, int) and status < 400:
+                latencies.append(latency)
+            else:
+                errors.append(latency)
+
+    tasks = []
+    for i, spec in enumerate(requests):
+        scheduled = None
+        if rate:
+            scheduled = start + i / rate
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        tasks.append(asyncio.create_task(send(spec, scheduled)))
+    await asyncio.gather(*tasks)
+    wall_seconds = time.perf_counter() - start
+
+    if sampler is not None:
+        stop_sampling.set()
+        await sampler
+
+    n_requests = len(requests)
+    return {
+        'summary': {
+            'requests': n_requests,
+            'errors': len(errors),
+            'error_rate': round(len(errors) / n_requests, 4) if n_requests else 0.0,
+            'wall_seconds': round(wall_seconds, 3),
+            'throughput_rps': round(n_requests / wall_seconds, 3) if wall_seconds > 0 else None,
+            'latency_ms': _percentiles(latencies),
+        },
+        'status_codes': status_codes,
+        'rss_timeline': rss_timeline,
+        'rss_peak_mb': max((s['rss_mb'] for s in rss_timeline), default=None),
+    }
+
+def compare_results(baseline: dict, current: dict) -> dict:
+    """Variação relativa (atual / base - 1) das latências e da vazão entre duas execuções salvas."""
+    deltas = {}
+    for key in ('p50', 'p95', 'p99'):
+        before = baseline['summary']['latency_ms'][key]
+        after = current['summary']['latency_ms'][key]
+        deltas[f'latency_{key}'] = round(after / before - 1, 4) if before and after is not None else None
+    before, after = baseline['summary']['throughput_rps'], current['summary']['throughput_rps']
+    deltas['throughput_rps'] = round(after / before - 1, 4) if before and after is not None else None
+    return deltas
+
+def _isolated_run_copy(model_path: str, work_dir: str) -> str:
+    """
+    Copia os arquivos do run (modelo, manifesto, transformador, referências de score; sem os
+    subdiretórios predictN/jobs) para o diretório temporário do teste.
+
+    Returns:
+        str: Caminho do modelo na cópia. As saídas e o registro de scores do tráfego sintético
+        ficam na cópia, sem poluir o run real (ex: o GET /score-drift dele).
+    """
+    run_dir = os.path.dirname(os.path.abspath(model_path))
+    copy_dir = os.path.join(work_dir, 'run', os.path.basename(run_dir))
+    os.makedirs(copy_dir)
+    for name in os.listdir(run_dir):
+        path = os.path.join(run_dir, name)
+        if os.path.isfile(path):
+            shutil.copy2(path, copy_dir)
+    return os.path.join(copy_dir, os.path.basename(model_path))
+
+def run(scenario: str, model_path: str, n_requests: int = 50, concurrency: int = 4, rate: float = None,
+        n_batches: int = None, rows_per_batch: int = 1000, base_url: str = None, server_pid: int = None,
+        reference_path: str = None, output_path: str = None, timeout: float = 300.0) -> dict:
+    """
+    Executa um teste de carga contra a API, em processo (ASGI) ou em uma instância local.
+
+    Args:
+        scenario (str): 'batch-predict', 'upload' ou 'check-drift'.
+        model_path (str): Modelo usado nas requisições.
+        n_requests (int): Total de requisições.
+        concurrency (int): Máximo de requisições simultâneas.
+        rate (float, opcional): Taxa alvo de requisições por segundo (carga aberta).
+        n_batches (int, opcional): Lotes sintéticos distintos, usados em rodízio. O padrão é um
+            lote por requisição: a API guarda em cache o resultado de entradas repetidas, e
+            lotes repetidos mediriam acertos de cache em vez de leitura e pontuação.
+        rows_per_batch (int): Transações por lote.
+        base_url (str, opcional): URL de uma instância em execução (ex: http://localhost:8000).
+            Se omitida, a aplicação é carregada no próprio processo e pontua uma cópia temporária
+            do run de model_path, para não gravar saídas nem scores sintéticos no run real.
+        server_pid (int, opcional): PID do servidor para amostrar o RSS (padrão: o próprio
+            processo no modo em processo).
+        reference_path (str, opcional): CSV de referência do cenário 'check-drift'.
+        output_path (str, opcional): JSON de resultados (padrão: runs/loadtest/<cenário>_<data>.json).
+        timeout (float): Timeout de cada requisição, em segundos.
+
+    Returns:
+        dict: Resultados salvos no JSON.
+    """
+    n_batches = n_batches or n_requests
+    manifest = load_feature_manifest(model_path)
+    columns = required_input_columns(manifest, load_feature_transformer(model_path)) if manifest else DEFAULT_COLUMNS
+
+    with tempfile.TemporaryDirectory(prefix='loadtest_') as work_dir:
+        batch_paths = make_synthetic_batches(os.path.join(work_dir, 'batches'), columns, n_batches, rows_per_batch)
+        if scenario == 'check-drift' and reference_path is None:
+            reference_path = make_synthetic_batches(os.path.join(work_dir, 'reference'), columns, 1,
+                                                    rows_per_batch, seed=0)[0]
+        if base_url:
+            transport, target = None, base_url
+            request_model_path = model_path
+        else:
+            from src.app.main import app
+            transport, target = httpx.ASGITransport(app=app), 'http://loadtest'
+            server_pid = server_pid or os.getpid()
+            request_model_path = _isolated_run_copy(model_path, work_dir)
+        requests = build_requests(scenario, batch_paths, n_requests, request_model_path, reference_path,
+                                  os.path.join(work_dir, 'drift'))
+
+        async def _run() -> dict:
+            async with httpx.AsyncClient(transport=transport, base_url=target, timeout=timeout) as client:
+                return await run_load_test(client, requests, concurrency, rate, server_pid)
+
+        logger.info(f"Teste de carga '{scenario}': {n_requests} requisições, concorrência {concurrency}, "
+                    f"taxa {rate or 'livre'} req/s, alvo {base_url or 'em processo'}.")
+        results = asyncio.run(_run())
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'config': {
+            'scenario': scenario, 'model_path': model_path, 'n_requests': n_requests,
+            'concurrency': concurrency, 'rate': rate, 'n_batches': n_batches,
+            'rows_per_batch': rows_per_batch, 'target': base_url or 'in-process',
+        },
+        **results,
+    }
+    if output_path is None:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_path = os.path.join('runs', 'loadtest', f'{scenario}_{stamp}.json')
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=4)
+    logger.info(f"Resumo: {results['summary']}")
+    logger.info(f"Resultados do teste de carga salvos em: {output_path}")
+    return results
+
+def main():
+    """
+    Função principal para executar o teste de carga via linha de comando.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Teste de carga local da API de detecção de fraude.")
+    parser.add_argument('--scenario', choices=SCENARIOS, default='batch-predict', help='Endpoint exercitado.')
+    parser.add_argument('--model-path', type=str, default='runs/train1/model.pkl', help='Modelo usado nas requisições.')
+    parser.add_argument('--requests', type=int, default=50, help='Total de requisições.')
+    parser.add_argument('--concurrency', type=int, default=4, help='Máximo de requisições simultâneas.')
+    parser.add_argument('--rate', type=float, default=None, help='Taxa alvo (req/s); omitido = o mais rápido possível.')
+    parser.add_argument('--batches', type=int, default=None,
+                        help='Lotes sintéticos distintos (padrão: um por requisição, sem acertos de cache).')
+    parser.add_argument('--rows-per-batch', type=int, default=1000, help='Transações por lote.')
+    parser.add_argument('--base-url', type=str, default=None, help='Instância local (ex: http://localhost:8000); omitido = em processo.')
+    parser.add_argument('--server-pid', type=int, default=None, help='PID do servidor para amostrar o RSS.')
+    parser.add_argument('--reference', type=str, default=None, help='CSV de referência do cenário check-drift.')
+    parser.add_argument('--output', type=str, default=None, help='Arquivo JSON de resultados.')
+    parser.add_argument('--baseline', type=str, default=None, help='JSON de uma execução anterior para comparação.')
+    args = parser.parse_args()
+
+    results = run(
+        scenario=args.scenario, model_path=args.model_path, n_requests=args.requests,
+        concurrency=args.concurrency, rate=args.rate, n_batches=args.batches,
+        rows_per_batch=args.rows_per_batch, base_url=args.base_url, server_pid=args.server_pid,
+        reference_path=args.reference, output_path=args.output
+    )
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        logger.info(f"Variação em relação a {args.baseline}: {compare_results(baseline, results)}")
+
+if __name__ == '__main__':
+    main()
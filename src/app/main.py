@@ -1,19 +1,57 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
+from typing import Optional
+import asyncio
+import json
 import logging
 from pathlib import Path
 import os
 import sys
 
 # Import refactored functions
-from src.app.predict import run_batch_predictions
-from src.app.detect_drift import detect_drift
+from src.app.predict import run_batch_predictions, run_cached_batch_predictions, run_stream_predictions, run_shadow_predictions
+from src.app.detect_drift import detect_drift, run_cached_drift_check
+from src.utils.stream_reader import QueueStreamReader
 
 # Para esta configuração inicial, elas são executadas de forma síncrona.
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Limites da ingestão por upload (configuráveis por variáveis de ambiente)
+MAX_UPLOAD_BYTES = int(os.getenv('BATCH_PREDICT_MAX_UPLOAD_BYTES', str(1024 ** 3)))
+UPLOAD_CHUNK_ROWS = int(os.getenv('BATCH_PREDICT_CHUNK_ROWS', '50000'))
+
+# Métricas publicadas pelo agendador de diretório (src.app.scheduler)
+SCHEDULER_METRICS_PATH = os.getenv('SCHEDULER_METRICS_PATH', 'runs/scheduler/metrics.json')
+
+# Cache de resultados de /batch-predict e /check-drift (RESULT_CACHE_MAX_BYTES=0 desativa)
+RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR', 'runs/cache')
+RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', str(1024 ** 3)))
+_result_cache = None
+
+def get_result_cache():
+    """Abre o cache de resultados na primeira requisição que o usa (None se estiver desativado)."""
+    global _result_cache
+    if RESULT_CACHE_MAX_BYTES <= 0:
+        return None
+    if _result_cache is None:
+        from src.utils.result_cache import ResultCache
+        _result_cache = ResultCache(RESULT_CACHE_DIR, RESULT_CACHE_MAX_BYTES)
+    return _result_cache
+
+# Content-Types reconhecidos no upload, mapeados para o formato de leitura
+# (os mesmos de predict_model.SUPPORTED_STREAM_FORMATS, sem importar pandas na inicialização)
+STREAM_CONTENT_TYPES = {
+    'text/csv': 'csv',
+    'application/csv': 'csv',
+    'application/vnd.apache.arrow.stream': 'arrow',
+}
+SUPPORTED_STREAM_FORMATS = tuple(sorted(set(STREAM_CONTENT_TYPES.values())))
+
+class UploadTooLargeError(Exception):
+    """Corpo da requisição excedeu MAX_UPLOAD_BYTES."""
+
 app = FastAPI(
     title="API de Detecção de Fraudes em Cartões de Crédito",
     description="API para previsões em lote e detecção de desvio de dados para modelos de fraude em cartões de crédito.",
@@ -23,12 +61,21 @@ app = FastAPI(
 class BatchPredictRequest(BaseModel):
     model_path: str = "runs/train1/model.pkl"
     input_data_path: str = "data/raw/new_transactions.csv"
+    cascade: bool = False # Pontuação em cascata (requer model_cascade.pkl no run)
+    explain_top_k: int = 0 # Top-k features que explicam cada transação classificada como fraude
+
+class ShadowPredictRequest(BaseModel):
+    model_path: str = "runs/train1/model.pkl" # Modelo campeão (em produção)
+    challenger_paths: list[str] = ["runs/train2/model.pkl"] # Modelos candidatos à promoção
+    input_data_path: str = "data/raw/new_transactions.csv"
+    chunksize: int = 100_000
 
 class DriftCheckRequest(BaseModel):
-    reference_path: str = "data/processed/train_features.csv"
+    reference_path: str = "data/processed/drift_reference.json" # Perfil do treino salvo pelo pipeline (ou um CSV)
     current_path: str = "data/raw/production_features_batch.csv"
     report_path: str = "runs/drift_report.json" # Saída padrão para o relatório
     alpha: float = 0.01 # Nível de significância para a detecção de desvio
+    model_path: Optional[str] = None # Restringe a análise às features do manifesto do modelo
 
 @app.get("/")
 async def read_root():
@@ -41,17 +88,145 @@ async def batch_predict(request: BatchPredictRequest):
     """
     logger.info(f"Requisição de previsão em lote recebida: {request}")
     try:
-        output_file_path = run_batch_predictions(
+        cache = get_result_cache()
+        if cache is None:
+            output_file_path = run_batch_predictions(
+                model_path=request.model_path,
+                input_data_path=request.input_data_path,
+                cascade=request.cascade,
+                explain_top_k=request.explain_top_k
+            )
+            return {"message": "Previsões em lote concluídas com sucesso.", "output_file": output_file_path}
+
+        output_file_path, hit = run_cached_batch_predictions(
+            cache,
             model_path=request.model_path,
-            input_data_path=request.input_data_path
+            input_data_path=request.input_data_path,
+            cascade=request.cascade,
+            explain_top_k=request.explain_top_k
         )
-        return {"message": "Previsões em lote concluídas com sucesso.", "output_file": output_file_path}
+        return {
+            "message": "Previsões em lote concluídas com sucesso.",
+            "output_file": output_file_path,
+            "cache": "hit" if hit else "miss"
+        }
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=f"Arquivo não encontrado: {e}")
     except Exception as e:
         logger.error(f"Erro durante a previsão em lote: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erro interno do servidor: {e}")
 
+@app.post("/shadow-predict")
+async def shadow_predict(request: ShadowPredictRequest):
+    """
+    Pontua um arquivo com o modelo campeão e os desafiantes em uma única leitura e retorna
+    a concordância de cada desafiante com o campeão.
+    """
+    logger.info(f"Requisição de pontuação sombra recebida: {request}")
+    from src.models.shadow_scoring import SHADOW_SUMMARY_FILENAME
+
+    try:
+        output_file_path = run_shadow_predictions(
+            model_path=request.model_path,
+            challenger_paths=request.challenger_paths,
+            input_data_path=request.input_data_path,
+            chunksize=request.chunksize
+        )
+        with open(os.path.join(os.path.dirname(output_file_path), SHADOW_SUMMARY_FILENAME), 'r') as f:
+            summary = json.load(f)
+        return {"message": "Pontuação sombra concluída.", "output_file": output_file_path, "summary": summary}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Arquivo não encontrado: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro durante a pontuação sombra: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Erro interno do servidor: {e}")
+
+def _score_upload(model_path: str, reader: QueueStreamReader, input_format: str, cascade: bool) -> str:
+    """Consome o fluxo do upload em uma thread de trabalho e fecha o leitor ao terminar."""
+    try:
+        return run_stream_predictions(
+            model_path=model_path,
+            source=reader,
+            input_format=input_format,
+            chunksize=UPLOAD_CHUNK_ROWS,
+            cascade=cascade
+        )
+    finally:
+        reader.close()
+
+@app.post("/batch-predict/upload")
+async def batch_predict_upload(request: Request, model_path: str = "runs/train1/model.pkl", input_format: Optional[str] = None,
+                               cascade: bool = False):
+    """
+    Executa previsões em lote sobre o corpo da requisição (CSV ou Arrow IPC), sem arquivo no servidor.
+
+    O corpo é lido de forma incremental e cada bloco é pontuado enquanto o restante do
+    upload ainda está chegando. O formato é inferido do Content-Type
+    ('text/csv' ou 'application/vnd.apache.arrow.stream') ou informado em 'input_format'.
+    """
+    content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    input_format = input_format or STREAM_CONTENT_TYPES.get(content_type)
+    if input_format not in SUPPORTED_STREAM_FORMATS:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Formato não suportado: '{content_type}'. Use um de {list(STREAM_CONTENT_TYPES)}."
+        )
+
+    content_length = request.headers.get('content-length')
+    if content_length:
+        try:
+            content_length = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Cabeçalho Content-Length inválido: '{content_length}'.")
+    if content_length and content_length > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Upload excede o limite de {MAX_UPLOAD_BYTES} bytes.")
+
+    if not os.path.exists(model_path):
+        raise HTTPException(status_code=404, detail=f"Arquivo não encontrado: {model_path}")
+
+    logger.info(f"Upload de previsão em lote recebido: model_path={model_path}, formato={input_format}")
+    reader = QueueStreamReader()
+    scoring = asyncio.create_task(asyncio.to_thread(_score_upload, model_path, reader, input_format, cascade))
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_UPLOAD_BYTES:
+                raise UploadTooLargeError()
+            await asyncio.to_thread(reader.feed, chunk)
+        await asyncio.to_thread(reader.close_feed)
+    except UploadTooLargeError as e:
+        reader.abort(e)
+        await asyncio.gather(scoring, return_exceptions=True)
+        raise HTTPException(status_code=413, detail=f"Upload excede o limite de {MAX_UPLOAD_BYTES} bytes.")
+    except ValueError:
+        # O consumidor fechou o leitor antes do fim do upload; o erro real vem da tarefa de pontuação
+        pass
+    except Exception as e:
+        # Ex: cliente desconectou no meio do upload; libera a thread de pontuação
+        reader.abort(e)
+        await asyncio.gather(scoring, return_exceptions=True)
+        raise
+
+    try:
+        output_file_path = await scoring
+        return {
+            "message": "Previsões em lote concluídas com sucesso.",
+            "output_file": output_file_path,
+            "bytes_received": received
+        }
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Arquivo não encontrado: {e}")
+    except ValueError as e:
+        # Corpo vazio (pandas.errors.EmptyDataError) ou sem as colunas exigidas pelo modelo
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro durante a previsão em lote por upload: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Erro interno do servidor: {e}")
+
 @app.post("/check-drift")
 async def check_drift(request: DriftCheckRequest):
     """
@@ -59,16 +234,66 @@ async def check_drift(request: DriftCheckRequest):
     """
     logger.info(f"Requisição de verificação de desvio recebida: {request}")
     try:
-        # Chama a função detect_drift refatorada
-        drift_results = detect_drift(
+        cache = get_result_cache()
+        if cache is None:
+            drift_results = detect_drift(
+                reference_path=request.reference_path,
+                current_path=request.current_path,
+                report_path=request.report_path,
+                alpha=request.alpha,
+                model_path=request.model_path
+            )
+            return {"message": "Detecção de desvio concluída.", "results": drift_results}
+
+        drift_results, hit = run_cached_drift_check(
+            cache,
             reference_path=request.reference_path,
             current_path=request.current_path,
             report_path=request.report_path,
-            alpha=request.alpha
+            alpha=request.alpha,
+            model_path=request.model_path
         )
-        return {"message": "Detecção de desvio concluída.", "results": drift_results}
+        return {"message": "Detecção de desvio concluída.", "results": drift_results, "cache": "hit" if hit else "miss"}
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=f"Arquivo não encontrado: {e}")
     except Exception as e:
         logger.error(f"Erro durante a detecção de desvio: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erro interno do servidor: {e}")
+
+@app.get("/score-drift")
+async def score_drift(model_path: str, last_n: Optional[int] = None):
+    """
+    Retorna o PSI da distribuição de scores de cada lote pontuado em relação à distribuição
+    de referência do conjunto de teste, sem reler nenhum dado de features.
+    """
+    logger.info(f"Requisição de desvio de scores recebida: model_path={model_path}, last_n={last_n}")
+    from src.models.score_monitor import score_drift_report
+
+    try:
+        report = score_drift_report(os.path.dirname(model_path), last_n)
+        return {"message": "Monitoramento de scores consultado.", "results": report}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Arquivo não encontrado: {e}")
+    except Exception as e:
+        logger.error(f"Erro ao consultar o monitoramento de scores: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Erro interno do servidor: {e}")
+
+@app.get("/scheduler/metrics")
+async def scheduler_metrics():
+    """
+    Retorna as métricas mais recentes do agendador de diretório: vazão, profundidade e atraso da fila.
+    """
+    if not os.path.exists(SCHEDULER_METRICS_PATH):
+        raise HTTPException(status_code=404, detail=f"Métricas do agendador não encontradas: {SCHEDULER_METRICS_PATH}")
+    with open(SCHEDULER_METRICS_PATH, 'r') as f:
+        return json.load(f)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Retorna o estado do cache de resultados: entradas, bytes ocupados e acertos/falhas por tipo.
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -1,55 +1,87 @@
 import logging
 import os
-import pandas as pd
+import shutil
+import uuid
 import argparse
 
-from src.utils.model_utils import load_model_from_pkl
+# pandas, scikit-learn e scipy são importados dentro das funções que os usam, para que
+# importar este módulo (API, agendador, '--help' da CLI) não pague o custo de carregá-los.
+from src.utils.model_utils import (
+    load_model_from_pkl, load_feature_transformer, FEATURE_MANIFEST_FILENAME, FEATURE_TRANSFORMER_FILENAME
+)
 from src.utils.path_manager import get_next_version_dir
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def run_batch_predictions(model_path: str, input_data_path: str):
+def _load_scoring_model(model_path: str, cascade: bool = False):
+    """Carrega o modelo do run; com cascade=True, usa o modelo em cascata salvo no mesmo diretório."""
+    if cascade:
+        from src.models.cascade import CASCADE_MODEL_FILENAME
+        cascade_path = os.path.join(os.path.dirname(model_path), CASCADE_MODEL_FILENAME)
+        if not os.path.exists(cascade_path):
+            raise FileNotFoundError(
+                f"Modelo em cascata não encontrado: {cascade_path}. Treine com training.cascade.enable: true."
+            )
+        logger.info("Modo cascata ativado: árvores avaliadas em estágios com saída antecipada.")
+        return load_model_from_pkl(cascade_path)
+    return load_model_from_pkl(model_path)
+
+def _build_explainer(model, model_path: str, top_k: int):
+    """
+    Cria o explicador das transações sinalizadas. Modelos de serving derivados (compacto,
+    cascata) não guardam os scores dos nós internos; nesse caso a floresta original do run é usada.
+    """
+    from src.models.explain import TreePathExplainer, supports_explanations
+
+    forest = model if supports_explanations(model) else load_model_from_pkl(model_path)
+    if not supports_explanations(forest):
+        logger.warning(f"Explicações suportadas apenas para florestas de decisão; {type(forest).__name__} ignorado.")
+        return None
+    return TreePathExplainer(forest, top_k)
+
+def run_batch_predictions(model_path: str, input_data_path: str, cascade: bool = False, explain_top_k: int = 0):
     """
     Carrega um modelo, realiza predições em um conjunto de dados e salva os resultados.
 
     Args:
         model_path (str): Caminho para o arquivo do modelo treinado (.pkl).
         input_data_path (str): Caminho para o arquivo de dados de entrada (CSV).
+        cascade (bool): Usa a pontuação em cascata (model_cascade.pkl do mesmo run).
+        explain_top_k (int): Se > 0, adiciona às transações classificadas como fraude as
+            top_k features que mais contribuíram para o score (0 desativa).
     """
+    import pandas as pd
+    from src.models.predict_model import predict_dataframe, resolve_feature_manifest, manifest_usecols
+    from src.models.score_monitor import ScoreMonitor
+
     try:
         # Carregar o modelo
-        model = load_model_from_pkl(model_path)
+        model = _load_scoring_model(model_path, cascade)
 
         # Carregar os dados de entrada
         logger.info(f"Carregando dados de entrada de: {input_data_path}")
         if not os.path.exists(input_data_path):
             raise FileNotFoundError(f"Arquivo de dados de entrada não encontrado: {input_data_path}")
         
-        input_df = pd.read_csv(input_data_path)
-        logger.info("Dados de entrada carregados com sucesso.")
+        # Ler apenas as colunas usadas pelo modelo (manifesto salvo no treino)
+        manifest = resolve_feature_manifest(model, model_path)
+        transformer = load_feature_transformer(model_path)
+        input_df = pd.read_csv(input_data_path, usecols=manifest_usecols(manifest, transformer))
+        logger.info(f"Dados de entrada carregados com sucesso. Shape: {input_df.shape}")
 
         # Realizar predições e obter probabilidades
         logger.info("Realizando predições no conjunto de dados de entrada...")
-        predictions = model.predict(input_df)
-        probabilities = model.predict_proba(input_df)
+        monitor = ScoreMonitor()
+        explainer = _build_explainer(model, model_path, explain_top_k) if explain_top_k > 0 else None
+        output_df = predict_dataframe(model, input_df, manifest, transformer, monitor, explainer)
         logger.info("Predições realizadas com sucesso.")
-
-        # Mapear predições numéricas para strings "FRAUDE" ou "NÃO_FRAUDE"
-        status_predicao = ['FRAUDE' if p == 1 else 'NÃO_FRAUDE' for p in predictions]
-
-        # Probabilidade da classe predita (certeza da predição)
-        probabilidade_predita = probabilities.max(axis=1)
-
-        # Salvar as predições no novo formato
-        output_df = pd.DataFrame({
-            'status_predicao': status_predicao,
-            'predicao_raw': predictions,
-            'probabilidade': probabilidade_predita
-        })
         
-        # Gerar diretório de saída dentro do diretório do modelo
+        # Registrar a distribuição de scores do lote no monitoramento do run
         model_run_dir = os.path.dirname(model_path) # Ex: runs/train1
+        monitor.flush(model_run_dir, source=input_data_path)
+
+        # Gerar diretório de saída dentro do diretório do modelo
         output_dir = get_next_version_dir(base_dir=model_run_dir, prefix='predict')
         output_data_path = os.path.join(output_dir, "predictions.csv")
 
@@ -65,14 +97,260 @@ def run_batch_predictions(model_path: str, input_data_path: str):
         logger.error(f"Ocorreu um erro inesperado durante a execução do batch de predições: {e}", exc_info=True)
         raise
 
+def run_cached_batch_predictions(cache, model_path: str, input_data_path: str, cascade: bool = False, explain_top_k: int = 0):
+    """
+    Igual a run_batch_predictions, mas reaproveita a saída de uma pontuação idêntica anterior.
+
+    A chave combina as impressões digitais (tamanho, data de modificação e SHA-256) da
+    entrada, do arquivo de modelo efetivamente usado (o limiar da cascata está salvo nele),
+    do manifesto e do transformador de features do run com explain_top_k. Em um acerto, a
+    saída guardada é copiada para um novo diretório predictN sem reler nem repontuar os
+    dados; o lote também não é registrado de novo no monitoramento de scores.
+
+    Args:
+        cache (ResultCache): Cache de resultados.
+        (demais argumentos: ver run_batch_predictions)
+
+    Returns:
+        (str, bool): Caminho do CSV de predições e se ele veio do cache.
+    """
+    from src.models.cascade import CASCADE_MODEL_FILENAME
+
+    run_dir = os.path.dirname(model_path)
+    scoring_model_path = os.path.join(os.path.dirname(model_path), CASCADE_MODEL_FILENAME) if cascade else model_path
+    if not os.path.exists(input_data_path) or not os.path.exists(scoring_model_path):
+        # Sem cache: run_batch_predictions reporta o arquivo ausente
+        return run_batch_predictions(model_path, input_data_path, cascade, explain_top_k), False
+
+    key = cache.make_key(
+        'predictions',
+        input=cache.fingerprint(input_data_path),
+        model=cache.fingerprint(scoring_model_path),
+        # A saída também depende das features projetadas e das derivadas geradas no serving
+        manifest=cache.fingerprint_if_exists(os.path.join(run_dir, FEATURE_MANIFEST_FILENAME)),
+        transformer=cache.fingerprint_if_exists(os.path.join(run_dir, FEATURE_TRANSFORMER_FILENAME)),
+        explain_top_k=explain_top_k
+    )
+    cached_path = cache.get_path('predictions', key)
+    if cached_path is not None:
+        output_dir = get_next_version_dir(base_dir=run_dir, prefix='predict')
+        output_data_path = os.path.join(output_dir, "predictions.csv")
+        try:
+            shutil.copyfile(cached_path, output_data_path)
+            logger.info(f"Predições reaproveitadas do cache em: {output_data_path}")
+            return output_data_path, True
+        except FileNotFoundError:
+            # Entrada removida do cache entre a busca e a cópia
+            os.rmdir(output_dir)
+
+    output_data_path = run_batch_predictions(model_path, input_data_path, cascade, explain_top_k)
+    cache.put_file('predictions', key, output_data_path)
+    return output_data_path, False
+
+def run_stream_predictions(model_path: str, source, input_format: str = 'csv', chunksize: int = 50_000, cascade: bool = False) -> str:
+    """
+    Carrega um modelo e pontua um fluxo de dados (CSV ou Arrow IPC) à medida que ele é lido.
+
+    Diferente de run_batch_predictions, a entrada não precisa existir no sistema de arquivos
+    do servidor: qualquer objeto binário com read() serve (ex: o corpo de uma requisição).
+
+    Args:
+        model_path (str): Caminho para o arquivo do modelo treinado (.pkl).
+        source: Objeto binário com os dados de entrada.
+        input_format (str): 'csv' ou 'arrow'.
+        chunksize (int): Número de linhas por bloco na leitura de CSV.
+        cascade (bool): Usa a pontuação em cascata (model_cascade.pkl do mesmo run).
+
+    Returns:
+        str: Caminho para o CSV de predições.
+    """
+    from src.models.predict_model import stream_predictions, resolve_feature_manifest
+    from src.models.score_monitor import ScoreMonitor
+
+    output_dir = None
+    try:
+        model = _load_scoring_model(model_path, cascade)
+        manifest = resolve_feature_manifest(model, model_path)
+        transformer = load_feature_transformer(model_path)
+
+        model_run_dir = os.path.dirname(model_path)
+        output_dir = get_next_version_dir(base_dir=model_run_dir, prefix='predict')
+        output_data_path = os.path.join(output_dir, "predictions.csv")
+
+        logger.info(f"Pontuando fluxo de entrada ({input_format}) em blocos de {chunksize} linhas...")
+        monitor = ScoreMonitor()
+        total_rows = stream_predictions(model, source, output_data_path, input_format, chunksize, manifest, transformer, monitor)
+        monitor.flush(model_run_dir, source=f'upload:{input_format}')
+        logger.info(f"{total_rows} predições salvas com sucesso em: {output_data_path}")
+
+        return output_data_path
+
+    except Exception as e:
+        logger.error(f"Ocorreu um erro durante a pontuação do fluxo de entrada: {e}", exc_info=True)
+        if output_dir is not None:
+            # Entrada rejeitada (ex: vazia ou sem as colunas do modelo): não deixa um predictN incompleto
+            shutil.rmtree(output_dir, ignore_errors=True)
+        raise
+
+def run_checkpointed_predictions(model_path: str, input_data_path: str, job_id: str = None, chunksize: int = 100_000,
+                                 workers: int = 1, cascade: bool = False) -> str:
+    """
+    Pontua um arquivo grande em blocos com checkpoint, retomável pelo job ID.
+
+    O job fica em runs/trainN/jobs/<job_id>/ (manifest.json com o progresso e as partes já
+    gravadas). Executar novamente com o mesmo job_id continua a partir do último bloco
+    concluído, em vez de recomeçar do início em um novo diretório predictN.
+
+    Args:
+        model_path (str): Caminho para o arquivo do modelo treinado (.pkl).
+        input_data_path (str): Caminho para o arquivo de dados de entrada (CSV).
+        job_id (str, opcional): Identificador do job; se omitido, um novo é gerado.
+        chunksize (int): Linhas por bloco.
+        workers (int): Processos de pontuação em paralelo (a ordem da saída é preservada).
+        cascade (bool): Usa a pontuação em cascata (model_cascade.pkl do mesmo run).
+
+    Returns:
+        str: Caminho para o CSV de predições.
+    """
+    from src.models.batch_job import run_checkpointed_job
+    from src.models.cascade import CASCADE_MODEL_FILENAME
+    from src.models.predict_model import resolve_feature_manifest
+
+    try:
+        if not os.path.exists(input_data_path):
+            raise FileNotFoundError(f"Arquivo de dados de entrada não encontrado: {input_data_path}")
+        model = _load_scoring_model(model_path, cascade)
+        manifest = resolve_feature_manifest(model, model_path)
+        transformer = load_feature_transformer(model_path)
+
+        job_id = job_id or uuid.uuid4().hex[:12]
+        model_run_dir = os.path.dirname(model_path)
+        job_dir = os.path.join(model_run_dir, 'jobs', job_id)
+        logger.info(f"Job de predição '{job_id}' ({workers} processo(s), blocos de {chunksize} linhas): {job_dir}")
+
+        model_file = CASCADE_MODEL_FILENAME if cascade else os.path.basename(model_path)
+        output_data_path, monitor = run_checkpointed_job(
+            model, model_file, input_data_path, job_dir, chunksize, workers, manifest, transformer
+        )
+        if monitor is not None:
+            monitor.flush(model_run_dir, source=input_data_path)
+        logger.info(f"Predições salvas com sucesso em: {output_data_path}")
+
+        return output_data_path
+
+    except FileNotFoundError as e:
+        logger.error(f"Erro de arquivo não encontrado: {e}", exc_info=True)
+        raise
+    except Exception as e:
+        logger.error(f"Ocorreu um erro durante o job de predição: {e}", exc_info=True)
+        raise
+
+def run_shadow_predictions(model_path: str, challenger_paths: list, input_data_path: str, chunksize: int = 100_000) -> str:
+    """
+    Pontua um arquivo com o modelo campeão e um ou mais desafiantes em uma única leitura.
+
+    A saída vai para runs/trainN/shadowM/ (N = run do campeão): predictions.csv com as
+    probabilidades e predições de cada modelo lado a lado e summary.json com a concordância
+    de cada desafiante com o campeão. A distribuição de scores de cada modelo é registrada
+    no monitoramento do seu próprio run.
+
+    Args:
+        model_path (str): Caminho do modelo campeão (.pkl).
+        challenger_paths (list[str]): Caminhos dos modelos desafiantes.
+        input_data_path (str): Caminho para o arquivo de dados de entrada (CSV).
+        chunksize (int): Linhas por bloco.
+
+    Returns:
+        str: Caminho para o CSV de predições lado a lado.
+    """
+    from src.models.predict_model import resolve_feature_manifest
+    from src.models.score_monitor import ScoreMonitor
+    from src.models.shadow_scoring import shadow_score, shadow_model_name, save_shadow_summary
+
+    try:
+        if not os.path.exists(input_data_path):
+            raise FileNotFoundError(f"Arquivo de dados de entrada não encontrado: {input_data_path}")
+        if not challenger_paths:
+            raise ValueError("Informe ao menos um modelo desafiante.")
+
+        models = []
+        for path in [model_path, *challenger_paths]:
+            model = load_model_from_pkl(path)
+            models.append({
+                'name': shadow_model_name(path),
+                'model_path': path,
+                'model': model,
+                'manifest': resolve_feature_manifest(model, path),
+                'transformer': load_feature_transformer(path),
+                'monitor': ScoreMonitor(),
+            })
+        names = [entry['name'] for entry in models]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Modelos repetidos na comparação: {names}")
+
+        output_dir = get_next_version_dir(base_dir=os.path.dirname(model_path), prefix='shadow')
+        output_data_path = os.path.join(output_dir, "predictions.csv")
+        logger.info(f"Pontuação sombra: campeão {names[0]}, desafiantes {names[1:]}")
+        summary = shadow_score(models, input_data_path, output_data_path, chunksize)
+        save_shadow_summary(summary, output_dir)
+
+        for entry in models:
+            entry['monitor'].flush(os.path.dirname(entry['model_path']), source=f'shadow:{input_data_path}')
+        for name, comparison in summary['comparisons'].items():
+            logger.info(
+                f"{name} vs {names[0]}: concordância {comparison['agreement_rate']:.4f} "
+                f"({comparison['only_champion']} alertas só do campeão, {comparison['only_challenger']} só do desafiante)"
+            )
+        logger.info(f"Predições lado a lado salvas em: {output_data_path}")
+
+        return output_data_path
+
+    except FileNotFoundError as e:
+        logger.error(f"Erro de arquivo não encontrado: {e}", exc_info=True)
+        raise
+    except Exception as e:
+        logger.error(f"Ocorreu um erro durante a pontuação sombra: {e}", exc_info=True)
+        raise
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Executa predições em batch em um conjunto de dados.")
     parser.add_argument("--model-path", type=str, required=True, help="Caminho para o arquivo do modelo .pkl.")
     parser.add_argument("--input-data", type=str, required=True, help="Caminho para o arquivo CSV de dados de entrada.")
+    parser.add_argument("--cascade", action="store_true", help="Usa a pontuação em cascata (saída antecipada).")
+    parser.add_argument("--explain-top-k", type=int, default=0, help="Explica as transações classificadas como fraude com as top-k features.")
+    parser.add_argument("--job-id", type=str, default=None, help="Executa (ou retoma) um job com checkpoint por blocos.")
+    parser.add_argument("--chunksize", type=int, default=None, help="Linhas por bloco no job com checkpoint (padrão: 100000).")
+    parser.add_argument("--workers", type=int, default=None, help="Processos de pontuação no job com checkpoint (padrão: 1).")
+    parser.add_argument("--challenger", action="append", default=None,
+                        help="Modelo desafiante pontuado na mesma leitura que o campeão (--model-path); pode ser repetido.")
     
     args = parser.parse_args()
+    if args.explain_top_k and (args.challenger or args.job_id or args.chunksize or args.workers):
+        parser.error("--explain-top-k só é suportado na predição em lote simples (sem --job-id, --chunksize, "
+                     "--workers ou --challenger).")
+    if args.cascade and args.challenger:
+        parser.error("--cascade não é suportado no modo sombra (--challenger): os modelos são pontuados sem cascata.")
 
-    run_batch_predictions(
-        model_path=args.model_path,
-        input_data_path=args.input_data
-    )
+    if args.challenger:
+        run_shadow_predictions(
+            model_path=args.model_path,
+            challenger_paths=args.challenger,
+            input_data_path=args.input_data,
+            chunksize=args.chunksize or 100_000
+        )
+    elif args.job_id or args.chunksize or args.workers:
+        run_checkpointed_predictions(
+            model_path=args.model_path,
+            input_data_path=args.input_data,
+            job_id=args.job_id,
+            chunksize=args.chunksize or 100_000,
+            workers=args.workers or 1,
+            cascade=args.cascade
+        )
+    else:
+        run_batch_predictions(
+            model_path=args.model_path,
+            input_data_path=args.input_data,
+            cascade=args.cascade,
+            explain_top_k=args.explain_top_k
+        )
@@ -0,0 +1,354 @@
+import argparse
+import itertools
+import json
+import logging
+import os
+import queue
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+import yaml
+
+from src.app.predict import run_batch_predictions
+from src.app.detect_drift import detect_drift
+
+logger = logging.getLogger(__name__)
+
+# Prioridades da fila (menor = atendido antes): pontuação sempre antes das checagens de desvio
+PRIORITY_SCORE = 0
+PRIORITY_DRIFT = 1
+
+# Estados registrados no ledger
+STATUS_QUEUED = 'queued'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class FileLedger:
+    """
+    Registro persistente (SQLite) dos arquivos vistos pelo agendador.
+
+    Cada arquivo é identificado por nome, tamanho e data de modificação. Um arquivo com
+    status 'done' ou 'failed' nunca é pontuado novamente, mesmo após reiniciar o serviço;
+    arquivos que ficaram 'queued' (serviço interrompido antes do fim) voltam para a fila.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS files (
+                    name TEXT, size INTEGER, mtime REAL, status TEXT,
+                    enqueued_at TEXT, finished_at TEXT, output TEXT, error TEXT,
+                    PRIMARY KEY (name, size, mtime)
+                )"""
+            )
+
+    def status(self, key: tuple):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM files WHERE name = ? AND size = ? AND mtime = ?", key
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_queued(self, key: tuple) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (name, size, mtime, status, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, STATUS_QUEUED, _now())
+            )
+
+    def mark_finished(self, key: tuple, status: str, output: str = None, error: str = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE files SET status = ?, finished_at = ?, output = ?, error = ? "
+                "WHERE name = ? AND size = ? AND mtime = ?",
+                (status, _now(), output, error, *key)
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+class SchedulerMetrics:
+    """Contadores de vazão e atraso de fila, atualizados pelos workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.files_scored = 0
+        self.files_failed = 0
+        self.rows_scored = 0
+        self.drift_checks = 0
+        self.scoring_seconds = 0.0
+        # Agregados do atraso de fila (memória constante em um serviço de longa duração)
+        self.lag_count = 0
+        self.lag_sum = 0.0
+        self.lag_max = None
+        self.lag_last = None
+
+    def record_start(self, lag: float) -> None:
+        with self._lock:
+            self.lag_count += 1
+            self.lag_sum += lag
+            self.lag_max = lag if self.lag_max is None else max(self.lag_max, lag)
+            self.lag_last = lag
+
+    def record_scoring(self, ok: bool, rows: int, seconds: float) -> None:
+        with self._lock:
+            if ok:
+                self.files_scored += 1
+                self.rows_scored += rows
+            else:
+                self.files_failed += 1
+            self.scoring_seconds += seconds
+
+    def record_drift(self) -> None:
+        with self._lock:
+            self.drift_checks += 1
+
+    def snapshot(self, queue_depth: int) -> dict:
+        with self._lock:
+            uptime = time.time() - self.started_at
+            n_files = self.files_scored + self.files_failed
+            return {
+                'timestamp': _now(),
+                'uptime_seconds': round(uptime, 2),
+                'queue_depth': queue_depth,
+                'files_scored': self.files_scored,
+                'files_failed': self.files_failed,
+                'rows_scored': self.rows_scored,
+                'drift_checks': self.drift_checks,
+                'throughput_rows_per_second': round(self.rows_scored / uptime, 2) if uptime > 0 else 0.0,
+                'throughput_files_per_minute': round(60 * self.files_scored / uptime, 3) if uptime > 0 else 0.0,
+                'mean_scoring_seconds': round(self.scoring_seconds / n_files, 3) if n_files else None,
+                'queue_lag_seconds': {
+                    'last': round(self.lag_last, 3) if self.lag_count else None,
+                    'mean': round(self.lag_sum / self.lag_count, 3) if self.lag_count else None,
+                    'max': round(self.lag_max, 3) if self.lag_count else None,
+                },
+            }
+
+def _unique_destination(directory: str, name: str) -> str:
+    """Caminho de destino que não sobrescreve um arquivo já movido com o mesmo nome."""
+    destination = os.path.join(directory, name)
+    counter = 1
+    while os.path.exists(destination):
+        stem, ext = os.path.splitext(name)
+        destination = os.path.join(directory, f"{stem}.{counter}{ext}")
+        counter += 1
+    return destination
+
+class InboxScheduler:
+    """
+    Observa um diretório de entrada e pontua cada novo CSV com um pool limitado de workers.
+
+    O diretório é lido por polling (sem dependências externas). Um arquivo só é enfileirado
+    quando seu tamanho e data de modificação não mudam entre duas varreduras, para não
+    pontuar arquivos ainda em cópia. Os workers consomem uma fila de prioridade em que a
+    pontuação sempre passa à frente das checagens de desvio. Ao final, o arquivo é movido
+    para done/ ou failed/ e o resultado é registrado no ledger.
+    """
+
+    def __init__(self, config: dict):
+        scheduler = config.get('scheduler', {})
+        self.inbox_dir = scheduler.get('inbox_dir', 'data/inbox')
+        self.done_dir = scheduler.get('done_dir', os.path.join(self.inbox_dir, 'done'))
+        self.failed_dir = scheduler.get('failed_dir', os.path.join(self.inbox_dir, 'failed'))
+        self.model_path = scheduler.get('model_path', 'runs/train1/model.pkl')
+        self.cascade = scheduler.get('cascade', False)
+        self.poll_interval = scheduler.get('poll_interval_seconds', 5)
+        self.max_workers = scheduler.get('max_workers', 2)
+        self.metrics_path = scheduler.get('metrics_path', 'runs/scheduler/metrics.json')
+        self.drift = scheduler.get('drift_check', {})
+
+        for directory in (self.inbox_dir, self.done_dir, self.failed_dir):
+            os.makedirs(directory, exist_ok=True)
+        self.ledger = FileLedger(scheduler.get('ledger_path', os.path.join(self.inbox_dir, 'ledger.sqlite')))
+        self.metrics = SchedulerMetrics()
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._pending_sizes = {}
+        self._in_flight = set()
+        self._stop = threading.Event()
+        self._workers = []
+
+    def _put(self, priority: int, kind: str, payload: dict) -> None:
+        self._queue.put((priority, next(self._sequence), kind, payload))
+
+    def scan(self) -> int:
+        """
+        Varre o diretório de entrada e enfileira os arquivos novos e estáveis.
+
+        Returns:
+            int: Número de arquivos enfileirados nesta varredura.
+        """
+        enqueued = 0
+        current = {}
+        for entry in sorted(os.scandir(self.inbox_dir), key=lambda e: e.name):
+            if not entry.is_file() or not entry.name.endswith('.csv') or entry.path in self._in_flight:
+                continue
+            stat = entry.stat()
+            key = (entry.name, stat.st_size, stat.st_mtime)
+            status = self.ledger.status(key)
+            if status in (STATUS_DONE, STATUS_FAILED):
+                # Processado antes de uma interrupção, mas não chegou a ser movido
+                try:
+                    self._move(entry.path, self.done_dir if status == STATUS_DONE else self.failed_dir)
+                except OSError as e:
+                    logger.error(f"Falha ao mover {entry.path}: {e}")
+                continue
+
+            current[entry.path] = key
+            if status is None and self._pending_sizes.get(entry.path) != key:
+                continue # Ainda pode estar sendo copiado; confirma na próxima varredura
+
+            self.ledger.mark_queued(key)
+            self._in_flight.add(entry.path)
+            self._put(PRIORITY_SCORE, 'score', {'path': entry.path, 'key': key, 'enqueued': time.time()})
+            enqueued += 1
+        self._pending_sizes = current
+        return enqueued
+
+    def _move(self, path: str, directory: str) -> str:
+        destination = _unique_destination(directory, os.path.basename(path))
+        shutil.move(path, destination)
+        return destination
+
+    def _mark_failed(self, path: str, key: tuple, error: str) -> None:
+        """Registra a falha e move o arquivo para failed/, sem propagar erros de ledger ou de disco."""
+        try:
+            self.ledger.mark_finished(key, STATUS_FAILED, error=error)
+        except Exception as e:
+            logger.error(f"Falha ao registrar {path} como '{STATUS_FAILED}' no ledger: {e}")
+        try:
+            self._move(path, self.failed_dir)
+        except Exception as e:
+            logger.error(f"Falha ao mover {path} para {self.failed_dir}: {e}")
+
+    def _score(self, task: dict) -> None:
+        path, key = task['path'], task['key']
+        start = time.time()
+        self.metrics.record_start(start - task['enqueued'])
+        try:
+            try:
+                output_path = run_batch_predictions(self.model_path, path, cascade=self.cascade)
+                with open(output_path, 'rb') as f:
+                    rows = max(sum(1 for _ in f) - 1, 0)
+                # O ledger é atualizado antes de mover: após uma interrupção, o arquivo não é repontuado
+                self.ledger.mark_finished(key, STATUS_DONE, output=output_path)
+                done_path = self._move(path, self.done_dir)
+            except Exception as e:
+                # Inclui falhas no ledger (ex: SQLite ocupado) e ao mover (arquivo removido, sem permissão)
+                logger.error(f"Falha ao pontuar {path}: {e}")
+                self._mark_failed(path, key, str(e))
+                self.metrics.record_scoring(False, 0, time.time() - start)
+                return
+        finally:
+            self._in_flight.discard(path)
+        self.metrics.record_scoring(True, rows, time.time() - start)
+        logger.info(f"{path} pontuado ({rows} linhas) em {time.time() - start:.2f}s: {output_path}")
+
+        if self.drift.get('enable', False):
+            self._put(PRIORITY_DRIFT, 'drift', {'path': done_path, 'enqueued': time.time()})
+
+    def _check_drift(self, task: dict) -> None:
+        stem = os.path.splitext(os.path.basename(task['path']))[0]
+        report_path = os.path.join(self.drift.get('report_dir', 'runs/scheduler/drift'), f"{stem}.json")
+        try:
+            detect_drift(
+                reference_path=self.drift.get('reference_path', 'data/processed/drift_reference.json'),
+                current_path=task['path'],
+                report_path=report_path,
+                alpha=self.drift.get('alpha', 0.01),
+                model_path=self.model_path
+            )
+            self.metrics.record_drift()
+        except (Exception, SystemExit) as e:
+            # detect_drift encerra o processo (sys.exit) em erros de leitura na CLI
+            logger.error(f"Falha na checagem de desvio de {task['path']}: {e}")
+
+    def _worker_loop(self) -> None:
+        while True:
+            _, _, kind, payload = self._queue.get()
+            try:
+                if kind == 'stop':
+                    return
+                if kind == 'score':
+                    self._score(payload)
+                else:
+                    self._check_drift(payload)
+            except Exception:
+                # Um erro inesperado não pode encerrar o worker: o pool encolheria em silêncio
+                logger.exception(f"Erro inesperado no worker do agendador ({kind}): {payload}")
+            finally:
+                self._queue.task_done()
+
+    def write_metrics(self) -> dict:
+        snapshot = self.metrics.snapshot(self._queue.qsize())
+        os.makedirs(os.path.dirname(self.metrics_path) or '.', exist_ok=True)
+        tmp_path = f"{self.metrics_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, indent=4)
+        os.replace(tmp_path, self.metrics_path)
+        return snapshot
+
+    def start(self) -> None:
+        for _ in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def drain(self) -> None:
+        """Aguarda o processamento de tudo que está na fila (incluindo checagens de desvio)."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for _ in self._workers:
+            # Prioridade mais baixa: os workers encerram depois de esvaziar a fila
+            self._put(PRIORITY_DRIFT + 1, 'stop', {})
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        self.write_metrics()
+        self.ledger.close()
+
+    def run_forever(self) -> None:
+        logger.info(f"Agendador observando {self.inbox_dir} ({self.max_workers} workers, modelo: {self.model_path})")
+        self.start()
+        try:
+            while not self._stop.is_set():
+                enqueued = self.scan()
+                if enqueued:
+                    logger.info(f"{enqueued} arquivo(s) enfileirado(s).")
+                self.write_metrics()
+                self._stop.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            logger.info("Encerrando o agendador...")
+        finally:
+            self.stop()
+
+def main():
+    """
+    Função principal para executar o agendador via linha de comando.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Pontua automaticamente os CSVs que chegam a um diretório de entrada.")
+    parser.add_argument('--config', type=str, default='config.yaml', help='Caminho para o arquivo de configuração YAML.')
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    InboxScheduler(config).run_forever()
+
+if __name__ == '__main__':
+    main()
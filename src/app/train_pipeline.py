@@ -1,8 +1,60 @@
+import os
+import shutil
 import yaml
 import argparse
 import logging
-from src.data import process_data
-from src.models import train_model, evaluate_model
+from src.data import process_data, profiling
+from src.models import train_model
+from src.utils.stage_dag import Stage, run_stages
+
+PIPELINE_TIMING_FILENAME = 'pipeline_timing.yaml'
+
+# Etapas do pipeline: funções de módulo (executadas em processos separados), com as entradas
+# recebidas como argumentos nomeados e as saídas retornadas em um dict
+
+def _stage_process_data(config: dict) -> dict:
+    process_data.run(config)
+    return {'processed_data': config['data']['processed_data_dir']}
+
+def _stage_dataset_stats(config: dict, processed_data: str) -> dict:
+    return {'dataset_stats': profiling.build_dataset_stats(config)}
+
+def _stage_drift_reference(config: dict, processed_data: str) -> dict:
+    return {'drift_reference': profiling.build_drift_reference(config)}
+
+def _stage_train(config: dict, processed_data: str) -> dict:
+    return {'model_path': train_model.run(config)}
+
+def _stage_evaluate(config: dict, model_path: str) -> dict:
+    # Importado aqui: carrega o scikit-learn.metrics e o monitoramento de scores
+    from src.models import evaluate_model
+    return {'evaluation': evaluate_model.compute_evaluation(config, model_path)}
+
+def _stage_evaluation_plots(evaluation) -> dict:
+    # Importado aqui: a geração de gráficos carrega matplotlib e seaborn
+    from src.models import evaluate_model
+    if evaluation is not None:
+        evaluate_model.render_evaluation_plots(evaluation)
+    return {'evaluation_plots': evaluation['run_dir'] if evaluation is not None else None}
+
+def _stage_package_run(model_path: str, dataset_stats: str, drift_reference: str) -> dict:
+    # O diretório processado é sobrescrito a cada execução: as cópias no run preservam o perfil
+    # dos dados com que o modelo foi treinado (referência da checagem de desvio deste modelo)
+    run_dir = os.path.dirname(model_path)
+    for path in (dataset_stats, drift_reference):
+        shutil.copy2(path, run_dir)
+    return {'run_profiles': run_dir}
+
+PIPELINE_STAGES = [
+    Stage('process_data', _stage_process_data, inputs=['config'], outputs=['processed_data']),
+    Stage('dataset_stats', _stage_dataset_stats, inputs=['config', 'processed_data'], outputs=['dataset_stats']),
+    Stage('drift_reference', _stage_drift_reference, inputs=['config', 'processed_data'], outputs=['drift_reference']),
+    Stage('train', _stage_train, inputs=['config', 'processed_data'], outputs=['model_path']),
+    Stage('evaluate', _stage_evaluate, inputs=['config', 'model_path'], outputs=['evaluation']),
+    Stage('evaluation_plots', _stage_evaluation_plots, inputs=['evaluation'], outputs=['evaluation_plots']),
+    Stage('package_run', _stage_package_run, inputs=['model_path', 'dataset_stats', 'drift_reference'],
+          outputs=['run_profiles']),
+]
 
 def run_pipeline(config_path: str) -> None:
     """
@@ -25,17 +77,21 @@ def run_pipeline(config_path: str) -> None:
         logger.error(f"Erro ao carregar o arquivo YAML: {e}")
         return
 
-    # Executando as etapas do Pipeline em sequência
-
-    # 1. Pré-processamento dos dados
-    process_data.run(config)
-
-    # 2. Treinamento do Modelo
-    model_path = train_model.run(config)
-
-    # 3. Avaliação do Modelo
-    evaluate_model.run(config, model_path)
+    # Executando as etapas do Pipeline: as independentes (perfis do dataset e treino; gráficos)
+    # rodam em paralelo, até pipeline.max_workers processos ao mesmo tempo (padrão: sequencial)
+    max_workers = config.get('pipeline', {}).get('max_workers', 1)
+    artifacts, timing = run_stages(PIPELINE_STAGES, initial={'config': config}, max_workers=max_workers)
     # Se o modelo atual é melhor que o anterior for, ele poderia ser 'promovido' ou registrado.
+
+    critical = timing['critical_path']
+    logger.info(
+        f"Pipeline executado em {timing['wall_seconds']:.2f}s ({timing['serial_seconds']:.2f}s somando as etapas); "
+        f"caminho crítico: {' -> '.join(critical['stages'])} ({critical['seconds']:.2f}s)"
+    )
+    timing_path = os.path.join(os.path.dirname(artifacts['model_path']), PIPELINE_TIMING_FILENAME)
+    with open(timing_path, 'w') as f:
+        yaml.safe_dump(timing, f, sort_keys=False)
+    logger.info(f"Resumo de tempos do pipeline salvo em: {timing_path}")
     
     logger.info("\n--- Pipeline Concluído ---")
 
@@ -2,13 +2,15 @@ import pandas as pd
 import numpy as np
 import os
 import logging
-from ..features.build_features import select_features
+import joblib
+from ..features.build_features import select_features, DerivedFeatureTransformer
+from ..utils.model_utils import FEATURE_TRANSFORMER_FILENAME
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
 def run(config: dict) -> None:
     """
-    Carrega, pré-processa e balanceia o conjunto de dados de fraude de cartão de crédito
+    Carrega e pré-processa o conjunto de dados de fraude de cartão de crédito
     usando as configurações fornecidas.
     """
     # Configurar logging
@@ -22,6 +24,7 @@ def run(config: dict) -> None:
     test_data_ratio = config['preprocessing']['test_data_ratio']
     feature_selection = config['features']['feature_selection']
     top_n_features = config['features']['top_n_features']
+    create_derived_features = config['features'].get('create_derived_features', False)
 
     # Garante que o diretório de saída exista
     if not os.path.exists(output_dir):
@@ -58,12 +61,27 @@ def run(config: dict) -> None:
     )
     logger.info(f"Dados divididos em treino ({X_train.shape}) e teste ({X_test.shape}).")
 
+    # Features derivadas (hora do dia, log do valor), ajustadas apenas no treino e aplicadas
+    # em cada divisão separadamente, como no serving
+    transformer_path = os.path.join(output_dir, FEATURE_TRANSFORMER_FILENAME)
+    if create_derived_features:
+        transformer = DerivedFeatureTransformer()
+        transformer.fit_transform(X_train)
+        transformer.transform(X_test)
+        joblib.dump(transformer, transformer_path)
+        logger.info(f"Features derivadas criadas: {transformer.output_columns}")
+        logger.info(f"Transformador de features salvo em: {transformer_path}")
+    elif os.path.exists(transformer_path):
+        # Evita que um transformador de uma execução anterior seja empacotado com o modelo
+        os.remove(transformer_path)
+
 
     #Random Forest não precisa de escalonamento
     # Árvores de decisão fazem divisões por comparações de valores, não por distâncias
     # StandardScaler (desnecessario manter o mesmo peso na modelagem)
     # Cada feature é avaliada independentemente e escala não afeta as árvores
-    #TODO: Balancear os dados apenas no treino pra aumentar a performance do modelo
+    # O balanceamento (preprocessing.sampling_method) é aplicado na etapa de treino,
+    # apenas sobre os dados de treino, para não contaminar o teste nem os folds de validação
 
     # Salvar os dados de treino e teste processados
     X_train.to_csv(os.path.join(output_dir, 'train_processed.csv'), index=False)
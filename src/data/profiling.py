@@ -0,0 +1,114 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATASET_STATS_FILENAME = 'dataset_stats.json'
+DRIFT_REFERENCE_FILENAME = 'drift_reference.json'
+
+def _save_json(data: dict, output_dir: str, filename: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, filename)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
+    return path
+
+def bin_counts(values, edges) -> np.ndarray:
+    """
+    Conta os valores em cada faixa do perfil de referência (as mesmas faixas na construção do
+    perfil e na checagem de desvio). As faixas são abertas nas pontas: valores fora do
+    intervalo do treino caem na primeira/última.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    n_bins = max(len(edges) - 1, 1)
+    positions = np.searchsorted(edges, np.asarray(values, dtype=np.float64), side='right') - 1
+    return np.bincount(np.clip(positions, 0, n_bins - 1), minlength=n_bins)
+
+def load_drift_reference(path: str) -> dict:
+    """Carrega um perfil de referência salvo por build_drift_reference."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _split_stats(features_path: str, target_path: str) -> dict:
+    X = pd.read_csv(features_path)
+    y = pd.read_csv(target_path).squeeze('columns')
+    numeric = X.select_dtypes(include=['number'])
+    quantiles = numeric.quantile([0.01, 0.5, 0.99])
+    class_counts = y.value_counts().sort_index()
+    return {
+        'n_rows': len(X),
+        'n_columns': X.shape[1],
+        'class_counts': {str(label): int(count) for label, count in class_counts.items()},
+        'fraud_rate': float((y == class_counts.index.max()).mean()) if len(y) else 0.0,
+        'columns': {
+            col: {
+                'dtype': str(X[col].dtype),
+                'missing': int(X[col].isna().sum()),
+                **({
+                    'mean': float(numeric[col].mean()),
+                    'std': float(numeric[col].std()),
+                    'min': float(numeric[col].min()),
+                    'p01': float(quantiles.at[0.01, col]),
+                    'p50': float(quantiles.at[0.5, col]),
+                    'p99': float(quantiles.at[0.99, col]),
+                    'max': float(numeric[col].max()),
+                } if col in numeric.columns else {'n_unique': int(X[col].nunique())}),
+            }
+            for col in X.columns
+        },
+    }
+
+def build_dataset_stats(config: dict) -> str:
+    """
+    Calcula estatísticas descritivas das divisões de treino e teste processadas (linhas,
+    classes, ausentes e resumo de cada coluna) e as salva em dataset_stats.json no
+    diretório de dados processados.
+
+    Returns:
+        str: Caminho do arquivo gerado.
+    """
+    data = config['data']
+    stats = {
+        'train': _split_stats(data['train_features_path'], data['train_target_path']),
+        'test': _split_stats(data['test_features_path'], data['test_target_path']),
+    }
+    path = _save_json(stats, data['processed_data_dir'], DATASET_STATS_FILENAME)
+    logger.info(f"Estatísticas do dataset salvas em: {path}")
+    return path
+
+def build_drift_reference(config: dict, n_bins: int = 10) -> str:
+    """
+    Monta o perfil de referência para a detecção de desvio a partir do treino processado.
+
+    Para cada feature numérica, guarda as bordas dos quantis (n_bins faixas) e a proporção de
+    linhas em cada faixa; para as categóricas, a frequência de cada valor. Um lote novo pode
+    ser comparado com esse perfil (ex: por PSI) sem reler o dataset de treino.
+
+    Returns:
+        str: Caminho do arquivo gerado (drift_reference.json no diretório de dados processados).
+    """
+    data = config['data']
+    X = pd.read_csv(data['train_features_path'])
+    profile = {'source': data['train_features_path'], 'n_rows': len(X), 'n_bins': n_bins, 'features': {}}
+    for col in X.columns:
+        values = X[col].dropna()
+        if pd.api.types.is_numeric_dtype(values):
+            edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+            counts = bin_counts(values, edges)
+            profile['features'][col] = {
+                'type': 'numerical',
+                'edges': edges.tolist(),
+                'proportions': (counts / max(len(values), 1)).tolist(),
+            }
+        else:
+            frequencies = values.value_counts(normalize=True)
+            profile['features'][col] = {
+                'type': 'categorical',
+                'proportions': {str(k): float(v) for k, v in frequencies.items()},
+            }
+    path = _save_json(profile, data['processed_data_dir'], DRIFT_REFERENCE_FILENAME)
+    logger.info(f"Perfil de referência para desvio salvo em: {path}")
+    return path
@@ -0,0 +1,123 @@
+import logging
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import NearestNeighbors
+
+logger = logging.getLogger(__name__)
+
+# Opções aceitas em preprocessing.sampling_method
+SAMPLING_METHODS = ('none', 'undersample', 'SMOTE')
+
+def _split_classes(y: pd.Series):
+    """Retorna (rótulo minoritário, índices posicionais da minoria, índices posicionais da maioria)."""
+    counts = y.value_counts()
+    if len(counts) != 2:
+        raise ValueError(f"Balanceamento requer exatamente 2 classes, encontradas: {list(counts.index)}")
+    minority_label = counts.idxmin()
+    is_minority = (y.to_numpy() == minority_label)
+    return minority_label, np.flatnonzero(is_minority), np.flatnonzero(~is_minority)
+
+def _check_sampling_ratio(sampling_ratio: float) -> None:
+    """Valida a razão minoria/maioria: deve estar em (0, 1] (1.0 = classes iguais)."""
+    if not 0 < sampling_ratio <= 1:
+        raise ValueError(f"sampling_ratio deve estar no intervalo (0, 1], recebido: {sampling_ratio}")
+
+def random_undersample(X: pd.DataFrame, y: pd.Series, sampling_ratio: float = 1.0, random_state: int = 42):
+    """
+    Subamostra aleatoriamente a classe majoritária.
+
+    Args:
+        X: Features de treino.
+        y: Alvo de treino.
+        sampling_ratio: Razão minoria/maioria desejada após a subamostragem (1.0 = classes iguais).
+        random_state: Semente do gerador aleatório.
+
+    Returns:
+        (X, y) subamostrados, preservando a ordem original das linhas mantidas.
+    """
+    _check_sampling_ratio(sampling_ratio)
+    _, minority_idx, majority_idx = _split_classes(y)
+    n_majority = min(len(majority_idx), int(np.ceil(len(minority_idx) / sampling_ratio)))
+
+    rng = np.random.default_rng(random_state)
+    kept_majority = rng.choice(majority_idx, size=n_majority, replace=False)
+    keep = np.sort(np.concatenate([minority_idx, kept_majority]))
+    return X.iloc[keep].reset_index(drop=True), y.iloc[keep].reset_index(drop=True)
+
+def smote(X: pd.DataFrame, y: pd.Series, sampling_ratio: float = 1.0, k_neighbors: int = 5,
+          random_state: int = 42, n_jobs: int = -1):
+    """
+    Sobreamostra a classe minoritária com SMOTE (interpolação entre vizinhos da minoria).
+
+    A busca de vizinhos usa uma KD-tree construída apenas sobre a classe minoritária e as
+    consultas rodam em paralelo (n_jobs), de modo que o custo não depende do tamanho da
+    classe majoritária, e a geração das amostras sintéticas é totalmente vetorizada.
+
+    Args:
+        X: Features de treino (numéricas).
+        y: Alvo de treino.
+        sampling_ratio: Razão minoria/maioria desejada após a sobreamostragem.
+        k_neighbors: Número de vizinhos considerados para a interpolação.
+        random_state: Semente do gerador aleatório.
+        n_jobs: Processos usados na busca de vizinhos (-1 = todos os núcleos).
+
+    Returns:
+        (X, y) com as amostras sintéticas anexadas ao final.
+    """
+    _check_sampling_ratio(sampling_ratio)
+    minority_label, minority_idx, majority_idx = _split_classes(y)
+    n_synthetic = int(sampling_ratio * len(majority_idx)) - len(minority_idx)
+    if n_synthetic <= 0:
+        logger.info("Classe minoritária já atende à razão de balanceamento. SMOTE não aplicado.")
+        return X, y
+    if len(minority_idx) < 2:
+        raise ValueError("SMOTE requer pelo menos 2 amostras da classe minoritária.")
+
+    X_minority = X.iloc[minority_idx].to_numpy(dtype=np.float64)
+    k = min(k_neighbors, len(minority_idx) - 1)
+
+    # n_neighbors = k + 1 porque cada ponto é o seu próprio vizinho mais próximo
+    nn = NearestNeighbors(n_neighbors=k + 1, algorithm='kd_tree', n_jobs=n_jobs).fit(X_minority)
+    neighbors = nn.kneighbors(X_minority, return_distance=False)[:, 1:]
+
+    rng = np.random.default_rng(random_state)
+    base = rng.integers(0, len(X_minority), size=n_synthetic)
+    neighbor = neighbors[base, rng.integers(0, k, size=n_synthetic)]
+    gap = rng.random((n_synthetic, 1))
+    synthetic = X_minority[base] + gap * (X_minority[neighbor] - X_minority[base])
+
+    X_synthetic = pd.DataFrame(synthetic, columns=X.columns).astype(X.dtypes.to_dict(), errors='ignore')
+    y_synthetic = pd.Series(np.full(n_synthetic, minority_label), name=y.name, dtype=y.dtype)
+
+    X_resampled = pd.concat([X.reset_index(drop=True), X_synthetic], ignore_index=True)
+    y_resampled = pd.concat([y.reset_index(drop=True), y_synthetic], ignore_index=True)
+    return X_resampled, y_resampled
+
+def resample(X: pd.DataFrame, y: pd.Series, method: str = 'none', sampling_ratio: float = 1.0,
+             k_neighbors: int = 5, random_state: int = 42):
+    """
+    Aplica a estratégia de balanceamento configurada. Deve ser usada apenas nos dados de treino.
+
+    Args:
+        X: Features de treino.
+        y: Alvo de treino.
+        method: 'none', 'undersample' ou 'SMOTE'.
+        sampling_ratio: Razão minoria/maioria desejada após o balanceamento.
+        k_neighbors: Vizinhos usados pelo SMOTE.
+        random_state: Semente do gerador aleatório.
+
+    Returns:
+        (X, y) balanceados.
+    """
+    if method == 'none':
+        return X, y
+    if method == 'undersample':
+        X_res, y_res = random_undersample(X, y, sampling_ratio, random_state)
+    elif method == 'SMOTE':
+        X_res, y_res = smote(X, y, sampling_ratio, k_neighbors, random_state)
+    else:
+        raise ValueError(f"Método de balanceamento '{method}' não suportado. Opções: {SAMPLING_METHODS}")
+
+    logger.info(f"Balanceamento '{method}': {len(y)} -> {len(y_res)} linhas. "
+                f"Distribuição das classes: {y_res.value_counts().to_dict()}")
+    return X_res, y_res
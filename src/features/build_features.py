@@ -57,11 +57,66 @@ def select_features(df: pd.DataFrame, feature_selection: str = 'all', top_n_feat
     logger.warning(f"Método de seleção '{feature_selection}' não reconhecido. Retornando todas as features.")
     return df
 
-def create_time_features(df):
-    """Cria features de tempo (hora do dia) a partir da coluna 'Time' em segundos."""
-    if 'Time' not in df.columns:
-        raise ValueError("A coluna 'Time' não existe no DataFrame.")
-    df_copy = df.copy()
-    # Converte segundos para horas e pega o módulo 24 para ter a hora do dia
-    df_copy['Time_hour'] = (df_copy['Time'] / 3600) % 24
-    return df_copy
\ No newline at end of file
+class DerivedFeatureTransformer:
+    """
+    Gera as features derivadas do projeto a partir das colunas 'Time' e 'Amount'.
+
+    A mesma instância ajustada é usada no treino (process_data.run) e no serving
+    (predições em lote e API): ela é salva no diretório do run ao lado do modelo,
+    garantindo que as duas pontas usem exatamente a mesma implementação.
+
+    Features geradas:
+        - Time_hour: hora do dia, a partir de 'Time' em segundos.
+        - Amount_log: log(1 + Amount), reduz a assimetria dos valores.
+
+    Cada feature depende apenas da própria linha, então o resultado é o mesmo qualquer que
+    seja a divisão dos dados em lotes (treino, teste, blocos de arquivo ou requisições da API).
+    Features que dependem de outras linhas (ex: taxa de transações por janela de 'Time') não
+    entram aqui: no serving, cada lote chega sem as transações anteriores.
+
+    As colunas são adicionadas no próprio DataFrame (sem cópia) e calculadas de forma
+    vetorizada por coluna.
+    """
+
+    input_columns = ['Time', 'Amount']
+    output_columns = ['Time_hour', 'Amount_log']
+
+    def __init__(self):
+        self.fitted_ = False
+
+    def fit(self, df: pd.DataFrame) -> 'DerivedFeatureTransformer':
+        """Valida as colunas de entrada no treino; as features não têm parâmetros aprendidos."""
+        self._check_columns(df)
+        self.fitted_ = True
+        return self
+
+    def transform(self, df: pd.DataFrame, inplace: bool = True) -> pd.DataFrame:
+        """
+        Adiciona as features derivadas ao DataFrame.
+
+        Args:
+            df: DataFrame com as colunas 'Time' e 'Amount'.
+            inplace: Se False, trabalha sobre uma cópia (mantém o DataFrame original intacto).
+
+        Returns:
+            DataFrame com as colunas de output_columns adicionadas.
+        """
+        if not getattr(self, 'fitted_', False):
+            raise ValueError("DerivedFeatureTransformer precisa ser ajustado (fit) antes do transform.")
+        self._check_columns(df)
+        if not inplace:
+            df = df.copy()
+
+        time = df['Time'].to_numpy(dtype=np.float64)
+        # Converte segundos para horas e pega o módulo 24 para ter a hora do dia
+        df['Time_hour'] = np.mod(time / 3600.0, 24.0)
+        df['Amount_log'] = np.log1p(df['Amount'].to_numpy(dtype=np.float64))
+        return df
+
+    def fit_transform(self, df: pd.DataFrame, inplace: bool = True) -> pd.DataFrame:
+        return self.fit(df).transform(df, inplace=inplace)
+
+    def _check_columns(self, df: pd.DataFrame) -> None:
+        missing = [col for col in self.input_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Colunas necessárias para as features derivadas não existem no DataFrame: {missing}")
@@ -0,0 +1,194 @@
+import os
+import json
+import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+import pandas as pd
+
+from .predict_model import predict_dataframe, manifest_usecols, PREDICTION_COLUMNS
+from .score_monitor import ScoreMonitor
+
+logger = logging.getLogger(__name__)
+
+JOB_MANIFEST_FILENAME = 'manifest.json'
+JOB_OUTPUT_FILENAME = 'predictions.csv'
+PARTS_DIRNAME = 'parts'
+
+# Estado de cada processo de trabalho (carregado uma única vez no initializer)
+_worker_state = {}
+
+def _atomic_write_json(data: dict, path: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+def _part_path(job_dir: str, index: int) -> str:
+    return os.path.join(job_dir, PARTS_DIRNAME, f'part-{index:05d}.csv')
+
+def _input_fingerprint(input_path: str) -> dict:
+    stat = os.stat(input_path)
+    return {'path': os.path.abspath(input_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def _score_chunk(model, chunk: pd.DataFrame, index: int, job_dir: str, manifest, transformer) -> dict:
+    """
+    Pontua um bloco e grava sua saída de forma atômica (arquivo temporário + os.replace).
+
+    Returns:
+        dict: Resumo do bloco (linhas, alertas e histograma de scores) para o checkpoint.
+    """
+    monitor = ScoreMonitor()
+    if chunk.empty:
+        # Entrada só com cabeçalho: o pandas entrega um único bloco vazio, que o modelo não aceita
+        output_df = pd.DataFrame(columns=PREDICTION_COLUMNS)
+    else:
+        output_df = predict_dataframe(model, chunk, manifest, transformer, monitor)
+    part_path = _part_path(job_dir, index)
+    tmp_path = f"{part_path}.tmp"
+    output_df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, part_path)
+    return {
+        'index': index,
+        'rows': int(monitor.n_rows),
+        'flagged': int(monitor.n_flagged),
+        'histogram': monitor.counts.tolist(),
+    }
+
+def _init_worker(model, manifest, transformer) -> None:
+    _worker_state.update(model=model, manifest=manifest, transformer=transformer)
+
+def _score_chunk_in_worker(chunk: pd.DataFrame, index: int, job_dir: str) -> dict:
+    return _score_chunk(_worker_state['model'], chunk, index, job_dir,
+                        _worker_state['manifest'], _worker_state['transformer'])
+
+def _load_job_manifest(job_dir: str, fingerprint: dict, chunksize: int, model_file: str) -> dict:
+    """
+    Carrega o checkpoint de um job existente ou cria um novo.
+
+    Um job só pode ser retomado com a mesma entrada (caminho, tamanho e data de modificação),
+    o mesmo tamanho de bloco e o mesmo modelo; caso contrário os blocos já gravados não
+    corresponderiam às linhas da entrada.
+    """
+    manifest_path = os.path.join(job_dir, JOB_MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            job = json.load(f)
+        if job['input'] != fingerprint or job['chunksize'] != chunksize or job['model_file'] != model_file:
+            raise ValueError(
+                f"O job em {job_dir} foi criado com outra entrada, modelo ou tamanho de bloco; "
+                f"use outro job ID para processar estes dados."
+            )
+        return job
+
+    job = {
+        'job_id': os.path.basename(job_dir),
+        'model_file': model_file,
+        'input': fingerprint,
+        'chunksize': chunksize,
+        'status': 'running',
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'n_chunks': None,
+        'chunks': {},
+    }
+    _atomic_write_json(job, manifest_path)
+    return job
+
+def _concatenate_parts(job_dir: str, n_chunks: int) -> str:
+    """Concatena as partes, na ordem dos blocos, em um único CSV (gravado de forma atômica)."""
+    output_path = os.path.join(job_dir, JOB_OUTPUT_FILENAME)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as out:
+        if n_chunks == 0:
+            # Nenhum bloco lido: a saída tem só o cabeçalho, como em um bloco vazio
+            out.write((','.join(PREDICTION_COLUMNS) + '\n').encode())
+        for index in range(n_chunks):
+            with open(_part_path(job_dir, index), 'rb') as part:
+                if index > 0:
+                    part.readline() # cabeçalho já escrito pela primeira parte
+                shutil.copyfileobj(part, out)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def run_checkpointed_job(model, model_file: str, input_path: str, job_dir: str, chunksize: int = 100_000,
+                         workers: int = 1, manifest=None, transformer=None):
+    """
+    Pontua um CSV grande em blocos numerados, com checkpoint após cada bloco concluído.
+
+    Cada bloco é gravado como uma parte em job_dir/parts e registrado no manifest.json do
+    job. Se o job for interrompido, uma nova execução com o mesmo job_dir pula os blocos já
+    concluídos e continua do ponto em que parou. Ao final, as partes são concatenadas na
+    ordem original em job_dir/predictions.csv.
+
+    Args:
+        model: Modelo treinado.
+        model_file (str): Arquivo do modelo usado (registrado no checkpoint).
+        input_path (str): CSV de entrada.
+        job_dir (str): Diretório do job (ex: runs/train1/jobs/<job_id>).
+        chunksize (int): Linhas por bloco.
+        workers (int): Processos de pontuação; 1 pontua no próprio processo.
+        manifest (dict | None): Manifesto de features do modelo.
+        transformer (DerivedFeatureTransformer | None): Transformador salvo com o modelo.
+
+    Returns:
+        (caminho do CSV de predições, ScoreMonitor com a distribuição de scores de todos os
+        blocos, ou None se o job já estava concluído)
+    """
+    os.makedirs(os.path.join(job_dir, PARTS_DIRNAME), exist_ok=True)
+    manifest_path = os.path.join(job_dir, JOB_MANIFEST_FILENAME)
+    job = _load_job_manifest(job_dir, _input_fingerprint(input_path), chunksize, model_file)
+
+    if job['status'] == 'completed':
+        logger.info(f"Job '{job['job_id']}' já concluído; nada a processar.")
+        return os.path.join(job_dir, JOB_OUTPUT_FILENAME), None
+
+    completed = {int(i) for i in job['chunks'] if os.path.exists(_part_path(job_dir, int(i)))}
+    if completed:
+        logger.info(f"Retomando job '{job['job_id']}': {len(completed)} blocos já concluídos.")
+
+    def record(summary: dict) -> None:
+        job['chunks'][str(summary['index'])] = {k: v for k, v in summary.items() if k != 'index'}
+        _atomic_write_json(job, manifest_path)
+        logger.info(f"Bloco {summary['index']} concluído ({summary['rows']} linhas).")
+
+    # Os blocos são sempre os do mesmo leitor, desde o início do arquivo: os já concluídos são
+    # lidos (apenas as colunas usadas) e descartados sem pontuar. Pular linhas brutas do arquivo
+    # desalinharia os blocos com linhas em branco ou campos entre aspas com quebra de linha.
+    n_chunks = 0
+    with pd.read_csv(input_path, chunksize=chunksize, usecols=manifest_usecols(manifest, transformer)) as reader:
+        chunks = enumerate(reader)
+        if workers <= 1:
+            for index, chunk in chunks:
+                n_chunks = index + 1
+                if index not in completed:
+                    record(_score_chunk(model, chunk, index, job_dir, manifest, transformer))
+        else:
+            # No máximo 2 blocos por processo em trânsito, para limitar a memória
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(model, manifest, transformer)) as executor:
+                pending = set()
+                for index, chunk in chunks:
+                    n_chunks = index + 1
+                    if index in completed:
+                        continue
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            record(future.result())
+                    pending.add(executor.submit(_score_chunk_in_worker, chunk, index, job_dir))
+                for future in wait(pending).done:
+                    record(future.result())
+
+    job['n_chunks'] = n_chunks
+    _concatenate_parts(job_dir, n_chunks)
+    job['status'] = 'completed'
+    job['completed_at'] = datetime.now(timezone.utc).isoformat()
+    _atomic_write_json(job, manifest_path)
+    shutil.rmtree(os.path.join(job_dir, PARTS_DIRNAME), ignore_errors=True)
+
+    monitor = ScoreMonitor()
+    for summary in job['chunks'].values():
+        monitor.counts += summary['histogram']
+        monitor.n_rows += summary['rows']
+        monitor.n_flagged += summary['flagged']
+    return os.path.join(job_dir, JOB_OUTPUT_FILENAME), monitor
@@ -0,0 +1,189 @@
+import os
+import logging
+import time
+import joblib
+import numpy as np
+import yaml
+
+from .compact_model import CompactForest
+
+logger = logging.getLogger(__name__)
+
+CASCADE_MODEL_FILENAME = 'model_cascade.pkl'
+CASCADE_REPORT_FILENAME = 'cascade.yaml'
+
+class CascadeForest(CompactForest):
+    """
+    Floresta com pontuação em cascata (saída antecipada) para a maioria não-fraude.
+
+    As árvores são avaliadas em estágios. Ao fim de cada estágio, as linhas cujo score
+    parcial (média das árvores avaliadas até ali) está abaixo da margem calibrada do
+    estágio saem da cascata com esse score parcial; apenas as demais seguem para as
+    próximas árvores. A última etapa sempre usa a floresta inteira.
+
+    Como ~99,8% das transações são legítimas e recebem scores muito baixos logo nas
+    primeiras árvores, o custo médio por linha cai para uma fração das árvores.
+    """
+
+    def __init__(self, forest, stage_boundaries, margins, threshold: float = 0.5, tree_indices=None):
+        super().__init__(forest, tree_indices)
+        if len(margins) != len(stage_boundaries):
+            raise ValueError("É necessária uma margem para cada fronteira de estágio.")
+        self.stage_boundaries_ = [int(b) for b in stage_boundaries]
+        self.margins_ = [float(min(m, threshold)) for m in margins]
+        self.threshold = threshold
+
+    def score_with_exits(self, X):
+        """
+        Calcula o score de fraude com saída antecipada.
+
+        Returns:
+            (scores, exit_stage): score da classe positiva por linha e o índice do estágio
+            em que cada linha saiu (len(stage_boundaries_) = avaliou a floresta inteira).
+        """
+        X = self._validate_X(X)
+        n_rows = X.shape[0]
+        sums = np.zeros(n_rows, dtype=np.float64)
+        scores = np.empty(n_rows, dtype=np.float64)
+        exit_stage = np.full(n_rows, len(self.stage_boundaries_), dtype=np.int32)
+        active = np.arange(n_rows)
+
+        start_tree = 0
+        for stage, (boundary, margin) in enumerate(zip(self.stage_boundaries_, self.margins_)):
+            if len(active) == 0:
+                break
+            leaf_values = self.tree_leaf_values(X[active], slice(start_tree, boundary))
+            sums[active] += leaf_values.sum(axis=1, dtype=np.float64)
+            partial = sums[active] / boundary
+
+            exits = partial < margin
+            exited = active[exits]
+            scores[exited] = partial[exits]
+            exit_stage[exited] = stage
+            active = active[~exits]
+            start_tree = boundary
+
+        if len(active):
+            if start_tree < self.n_trees:
+                leaf_values = self.tree_leaf_values(X[active], slice(start_tree, None))
+                sums[active] += leaf_values.sum(axis=1, dtype=np.float64)
+            scores[active] = sums[active] / self.n_trees
+
+        return scores, exit_stage
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive, _ = self.score_with_exits(X)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[(self.predict_proba(X)[:, 1] > self.threshold).astype(int)]
+
+def calibrate_margins(forest, X_val, stage_boundaries, max_recall_loss: float = 0.01,
+                      threshold: float = 0.5, tree_indices=None):
+    """
+    Calibra as margens de saída de cada estágio na validação.
+
+    O orçamento de perda de recall (em relação à floresta completa) é dividido igualmente
+    entre os estágios. Em cada estágio, a margem é o quantil 'perda por estágio' dos scores
+    parciais das linhas que a floresta completa sinaliza como fraude e que ainda estão na
+    cascata; assim, no máximo essa fração delas sai antes do fim.
+
+    Returns:
+        list: Margens por estágio (nunca acima do limiar de fraude).
+    """
+    per_tree = CompactForest(forest, tree_indices).tree_leaf_values(X_val).astype(np.float64)
+    cumulative = np.cumsum(per_tree, axis=1)
+    full_score = cumulative[:, -1] / per_tree.shape[1]
+    flagged = np.flatnonzero(full_score > threshold)
+
+    loss_per_stage = max_recall_loss / len(stage_boundaries)
+    margins = []
+    still_active = flagged
+    for boundary in stage_boundaries:
+        if len(still_active) == 0:
+            margins.append(threshold)
+            continue
+        partial = cumulative[still_active, boundary - 1] / boundary
+        margin = float(np.quantile(partial, loss_per_stage, method='lower'))
+        margin = min(margin, threshold)
+        margins.append(margin)
+        still_active = still_active[partial >= margin]
+    return margins
+
+def build_cascade(model, model_path: str, X_val, y_val, stage_boundaries, max_recall_loss: float = 0.01,
+                  threshold: float = 0.5):
+    """
+    Calibra e salva o modelo em cascata ao lado do model.pkl, com o relatório de validação.
+
+    Args:
+        model: Floresta treinada (RandomForestClassifier).
+        model_path (str): Caminho do model.pkl original.
+        X_val, y_val: Dados de validação (não usados no treino).
+        stage_boundaries (list): Número acumulado de árvores ao fim de cada estágio (ex: [10, 25, 50]).
+        max_recall_loss (float): Perda máxima de recall aceitável em relação à floresta completa.
+        threshold (float): Limiar de probabilidade para classificar como fraude.
+
+    Returns:
+        str | None: Caminho do modelo em cascata, ou None se o backend não é uma floresta.
+    """
+    if not hasattr(model, 'estimators_') or not hasattr(model.estimators_[0], 'tree_'):
+        logger.warning(f"Cascata suportada apenas para florestas de decisão; {type(model).__name__} ignorado.")
+        return None
+
+    n_trees = len(model.estimators_)
+    stage_boundaries = sorted(b for b in set(stage_boundaries) if 0 < b < n_trees)
+    if not stage_boundaries:
+        logger.warning(f"Nenhuma fronteira de estágio válida para {n_trees} árvores. Cascata não gerada.")
+        return None
+
+    margins = calibrate_margins(model, X_val, stage_boundaries, max_recall_loss, threshold)
+    cascade = CascadeForest(model, stage_boundaries, margins, threshold)
+
+    # Avaliação na validação: custo médio por linha e perda de recall
+    start = time.perf_counter()
+    full_scores = CompactForest(model).predict_proba(X_val)[:, 1]
+    full_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    cascade_scores, exit_stage = cascade.score_with_exits(X_val)
+    cascade_seconds = time.perf_counter() - start
+
+    ends = stage_boundaries + [n_trees]
+    trees_per_row = np.asarray(ends)[exit_stage]
+    full_flags = full_scores > threshold
+    cascade_flags = cascade_scores > threshold
+    y_true = np.asarray(y_val) == model.classes_[1]
+    lost = int(np.sum(full_flags & ~cascade_flags))
+
+    report = {
+        'n_trees': n_trees,
+        'stage_boundaries': stage_boundaries,
+        'margins': margins,
+        'threshold': threshold,
+        'max_recall_loss': max_recall_loss,
+        'validation': {
+            'rows': int(len(exit_stage)),
+            'exit_fraction_per_stage': [float(np.mean(exit_stage == s)) for s in range(len(ends))],
+            'mean_trees_per_row': float(trees_per_row.mean()),
+            'tree_cost_reduction': float(n_trees / trees_per_row.mean()),
+            'flagged_by_full_model': int(full_flags.sum()),
+            'flags_lost_by_cascade': lost,
+            'recall_loss_vs_full_model': float(lost / max(full_flags.sum(), 1)),
+            'recall_full_model': float(full_flags[y_true].mean()) if y_true.any() else None,
+            'recall_cascade': float(cascade_flags[y_true].mean()) if y_true.any() else None,
+            'predict_seconds_full': round(full_seconds, 4),
+            'predict_seconds_cascade': round(cascade_seconds, 4),
+        },
+    }
+
+    run_dir = os.path.dirname(model_path)
+    cascade_path = os.path.join(run_dir, CASCADE_MODEL_FILENAME)
+    joblib.dump(cascade, cascade_path)
+    report_path = os.path.join(run_dir, CASCADE_REPORT_FILENAME)
+    with open(report_path, 'w') as f:
+        yaml.safe_dump(report, f, sort_keys=False)
+
+    logger.info(f"Modelo em cascata salvo em: {cascade_path} "
+                f"(média de {report['validation']['mean_trees_per_row']:.1f}/{n_trees} árvores por linha, "
+                f"perda de recall na validação: {report['validation']['recall_loss_vs_full_model']:.4f})")
+    logger.info(f"Relatório da cascata salvo em: {report_path}")
+    return cascade_path
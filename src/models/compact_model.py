@@ -0,0 +1,221 @@
+import os
+import logging
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.metrics import roc_auc_score
+
+logger = logging.getLogger(__name__)
+
+COMPACT_MODEL_FILENAME = 'model_compact.pkl'
+COMPACTION_REPORT_FILENAME = 'compaction.yaml'
+
+def _float32_floor(values: np.ndarray) -> np.ndarray:
+    """
+    Converte limiares para float32 arredondando para baixo.
+
+    O scikit-learn compara X (convertido para float32) com limiares float64. Arredondar o
+    limiar para o maior float32 <= limiar original preserva exatamente a decisão
+    'x <= limiar' para qualquer x representável em float32.
+    """
+    rounded = values.astype(np.float32)
+    too_high = rounded.astype(np.float64) > values
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+class CompactForest:
+    """
+    Floresta de decisão compacta para serving, derivada de um RandomForestClassifier.
+
+    Guarda apenas o necessário para a inferência binária: filhos (int32), feature (int32),
+    limiar (float32) e a probabilidade da classe positiva em cada folha (float32). Todas as
+    árvores ficam concatenadas em vetores únicos e são percorridas juntas, nível a nível,
+    de forma vetorizada.
+
+    Segue a mesma interface usada no restante do projeto (predict, predict_proba, classes_,
+    feature_names_in_), de modo que pode ser usada no lugar do modelo original.
+    """
+
+    def __init__(self, forest, tree_indices=None):
+        estimators = forest.estimators_
+        if tree_indices is None:
+            tree_indices = range(len(estimators))
+        tree_indices = list(tree_indices)
+
+        self.classes_ = forest.classes_
+        self.n_features_in_ = forest.n_features_in_
+        if hasattr(forest, 'feature_names_in_'):
+            self.feature_names_in_ = forest.feature_names_in_
+        self.tree_indices_ = tree_indices
+
+        left, right, feature, threshold, leaf_value, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for idx in tree_indices:
+            tree = estimators[idx].tree_
+            is_leaf = tree.children_left == -1
+            # Filhos com índices globais (deslocados); folhas mantêm -1
+            left.append(np.where(is_leaf, -1, tree.children_left + offset).astype(np.int32))
+            right.append(np.where(is_leaf, -1, tree.children_right + offset).astype(np.int32))
+            feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            threshold.append(_float32_floor(tree.threshold))
+            values = tree.value[:, 0, :]
+            leaf_value.append((values[:, 1] / values.sum(axis=1)).astype(np.float32))
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.children_left_ = np.concatenate(left)
+        self.children_right_ = np.concatenate(right)
+        self.feature_ = np.concatenate(feature)
+        self.threshold_ = np.concatenate(threshold)
+        self.leaf_value_ = np.concatenate(leaf_value)
+        self.roots_ = np.asarray(roots, dtype=np.int32)
+        self.max_depth_ = max_depth
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots_)
+
+    def _validate_X(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if hasattr(self, 'feature_names_in_') and list(X.columns) != list(self.feature_names_in_):
+                raise ValueError("As colunas de X não correspondem às features usadas no treino do modelo.")
+            X = X.to_numpy()
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X deve ter {self.n_features_in_} colunas, recebeu shape {X.shape}.")
+        return X
+
+    def tree_leaf_values(self, X, tree_slice: slice = slice(None), block_size: int = 8192) -> np.ndarray:
+        """
+        Probabilidade da classe positiva em cada árvore (n_linhas x n_árvores do slice).
+
+        As linhas são processadas em blocos para limitar a memória da matriz de nós.
+        """
+        X = self._validate_X(X)
+        roots = self.roots_[tree_slice]
+        out = np.empty((X.shape[0], len(roots)), dtype=np.float32)
+        for start in range(0, X.shape[0], block_size):
+            block = X[start:start + block_size]
+            rows = np.arange(block.shape[0])[:, None]
+            nodes = np.broadcast_to(roots, (block.shape[0], len(roots))).copy()
+            for _ in range(self.max_depth_):
+                left = self.children_left_[nodes]
+                internal = left != -1
+                if not internal.any():
+                    break
+                go_left = block[rows, self.feature_[nodes]] <= self.threshold_[nodes]
+                nodes = np.where(internal, np.where(go_left, left, self.children_right_[nodes]), nodes)
+            out[start:start + block_size] = self.leaf_value_[nodes]
+        return out
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = self.tree_leaf_values(X).mean(axis=1, dtype=np.float64)
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+def select_trees(forest, X_val: pd.DataFrame, y_val, tolerance: float = 0.001, max_trees: int = None):
+    """
+    Seleciona gulosamente o menor subconjunto de árvores cujo ROC AUC de validação fica a
+    até 'tolerance' do ROC AUC da floresta completa.
+
+    A cada passo adiciona a árvore que mais aumenta o AUC do conjunto já escolhido. As
+    probabilidades de cada árvore na validação são calculadas uma única vez.
+
+    Returns:
+        (índices das árvores escolhidas, AUC da floresta completa, AUC do subconjunto)
+    """
+    per_tree = CompactForest(forest).tree_leaf_values(X_val).astype(np.float64)
+    n_trees = per_tree.shape[1]
+    max_trees = n_trees if max_trees is None else min(max_trees, n_trees)
+    full_auc = roc_auc_score(y_val, per_tree.mean(axis=1))
+
+    selected = []
+    running_sum = np.zeros(per_tree.shape[0])
+    remaining = list(range(n_trees))
+    subset_auc = 0.0
+    while remaining and len(selected) < max_trees:
+        k = len(selected) + 1
+        scores = [roc_auc_score(y_val, (running_sum + per_tree[:, t]) / k) for t in remaining]
+        best = int(np.argmax(scores))
+        tree = remaining.pop(best)
+        selected.append(tree)
+        running_sum += per_tree[:, tree]
+        subset_auc = scores[best]
+        if subset_auc >= full_auc - tolerance:
+            break
+
+    return sorted(selected), float(full_auc), float(subset_auc)
+
+def _timed_load(path: str) -> float:
+    start = time.perf_counter()
+    joblib.load(path)
+    return time.perf_counter() - start
+
+def _timed_predict(model, X) -> float:
+    start = time.perf_counter()
+    model.predict_proba(X)
+    return time.perf_counter() - start
+
+def compact_model(model, model_path: str, X_val: pd.DataFrame, y_val, tolerance: float = 0.001,
+                  max_trees: int = None):
+    """
+    Gera a versão compacta do modelo, salva-a ao lado do original e registra o relatório.
+
+    Args:
+        model: Floresta treinada (RandomForestClassifier).
+        model_path (str): Caminho do model.pkl original.
+        X_val, y_val: Dados de validação (não usados no treino).
+        tolerance (float): Perda máxima aceitável de ROC AUC na validação.
+        max_trees (int, opcional): Limite de árvores no modelo compacto.
+
+    Returns:
+        str | None: Caminho do modelo compacto, ou None se o backend não suporta compactação.
+    """
+    if not hasattr(model, 'estimators_') or not hasattr(model.estimators_[0], 'tree_'):
+        logger.warning(f"Compactação suportada apenas para florestas de decisão; {type(model).__name__} ignorado.")
+        return None
+
+    logger.info(f"Compactando floresta com {len(model.estimators_)} árvores (tolerância de AUC: {tolerance})...")
+    tree_indices, full_auc, compact_auc = select_trees(model, X_val, y_val, tolerance, max_trees)
+    compact = CompactForest(model, tree_indices)
+
+    run_dir = os.path.dirname(model_path)
+    compact_path = os.path.join(run_dir, COMPACT_MODEL_FILENAME)
+    joblib.dump(compact, compact_path)
+
+    original_load = _timed_load(model_path)
+    compact_load = _timed_load(compact_path)
+    original_predict = _timed_predict(model, X_val)
+    compact_predict = _timed_predict(compact, X_val)
+
+    report = {
+        'n_trees_original': len(model.estimators_),
+        'n_trees_compact': compact.n_trees,
+        'tree_indices': [int(i) for i in tree_indices],
+        'tolerance': tolerance,
+        'validation_roc_auc_original': full_auc,
+        'validation_roc_auc_compact': compact_auc,
+        'size_bytes_original': os.path.getsize(model_path),
+        'size_bytes_compact': os.path.getsize(compact_path),
+        'load_seconds_original': round(original_load, 4),
+        'load_seconds_compact': round(compact_load, 4),
+        'predict_seconds_original': round(original_predict, 4),
+        'predict_seconds_compact': round(compact_predict, 4),
+        'inference_speedup': round(original_predict / compact_predict, 2) if compact_predict > 0 else None,
+    }
+    report_path = os.path.join(run_dir, COMPACTION_REPORT_FILENAME)
+    with open(report_path, 'w') as f:
+        yaml.safe_dump(report, f, sort_keys=False)
+
+    logger.info(f"Modelo compacto salvo em: {compact_path} "
+                f"({report['n_trees_compact']}/{report['n_trees_original']} árvores, "
+                f"{report['size_bytes_compact']}/{report['size_bytes_original']} bytes, "
+                f"AUC {compact_auc:.4f} vs {full_auc:.4f}, speedup {report['inference_speedup']}x)")
+    logger.info(f"Relatório de compactação salvo em: {report_path}")
+    return compact_path
@@ -0,0 +1,165 @@
+import os
+import logging
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import (
+    roc_auc_score,
+    average_precision_score,
+    precision_score,
+    recall_score,
+    f1_score,
+)
+
+from ..data.sampling import resample
+from .model_factory import build_model, resolve_params
+from .predict_model import labels_from_proba
+
+logger = logging.getLogger(__name__)
+
+CV_METRICS_FILENAME = 'cv_metrics.yaml'
+
+def _fit_fold(fold: int, train_idx: np.ndarray, val_idx: np.ndarray, X_path: str, y_path: str,
+              feature_names: list, model_type: str, params: dict, sampling: dict) -> dict:
+    """
+    Treina e avalia um fold em um processo de trabalho.
+
+    A matriz de treino é aberta como memmap (somente leitura) a partir do arquivo .npy
+    compartilhado; apenas os índices do fold trafegam entre os processos.
+    """
+    X = np.load(X_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+
+    X_fit = pd.DataFrame(X[train_idx], columns=feature_names)
+    y_fit = pd.Series(y[train_idx], name='Class')
+    X_val = pd.DataFrame(X[val_idx], columns=feature_names)
+    y_val = np.asarray(y[val_idx])
+
+    # O balanceamento acontece dentro do fold, para não vazar amostras sintéticas na validação
+    X_fit, y_fit = resample(X_fit, y_fit, **sampling)
+
+    # Um núcleo por fold: o paralelismo está entre os folds
+    model = build_model(model_type, params, n_jobs=1)
+    start = time.perf_counter()
+    model.fit(X_fit, y_fit)
+    fit_seconds = time.perf_counter() - start
+
+    probabilities = model.predict_proba(X_val)
+    y_proba = probabilities[:, 1]
+    # Mesma regra de decisão da predição (limiar do modelo), para que o CV meça o que é servido
+    y_pred = labels_from_proba(model, probabilities)
+    return {
+        'fold': fold,
+        'train_rows': int(len(y_fit)),
+        'validation_rows': int(len(y_val)),
+        'fit_seconds': round(fit_seconds, 4),
+        'roc_auc': float(roc_auc_score(y_val, y_proba)),
+        'average_precision': float(average_precision_score(y_val, y_proba)),
+        'precision': float(precision_score(y_val, y_pred, zero_division=0)),
+        'recall': float(recall_score(y_val, y_pred, zero_division=0)),
+        'f1': float(f1_score(y_val, y_pred, zero_division=0)),
+    }
+
+def _effective_n_jobs(n_jobs) -> int:
+    """
+    Número de processos para n_jobs, na convenção do scikit-learn: None ou -1 = todos os
+    núcleos; valores negativos contam a partir do total (-2 = todos menos um), com mínimo de 1.
+    """
+    n_cpus = os.cpu_count() or 1
+    if n_jobs is None:
+        return n_cpus
+    if n_jobs == 0:
+        raise ValueError("cross_validation.n_jobs não pode ser 0.")
+    if n_jobs < 0:
+        return max(n_cpus + 1 + n_jobs, 1)
+    return n_jobs
+
+def run_cross_validation(X: pd.DataFrame, y: pd.Series, config: dict) -> dict:
+    """
+    Executa validação cruzada estratificada (k-fold), com os folds treinados em paralelo.
+
+    Os dados de treino são gravados uma única vez em arquivos .npy temporários e cada
+    processo os abre via memmap, em vez de receber uma cópia serializada da matriz.
+
+    Args:
+        X: Features de treino (antes do balanceamento).
+        y: Alvo de treino.
+        config: Configuração do projeto; usa training.cross_validation, training.model_type,
+            training.params e as opções de balanceamento de preprocessing.
+
+    Returns:
+        dict: Métricas por fold ('folds') e agregadas ('summary': média e desvio padrão).
+    """
+    training = config['training']
+    cv_config = training.get('cross_validation', {})
+    n_splits = cv_config.get('n_splits', 5)
+    n_jobs = cv_config.get('n_jobs', -1)
+    max_workers = min(n_splits, _effective_n_jobs(n_jobs))
+    params = resolve_params(training)
+    random_state = params.get('random_state', 42)
+
+    preprocessing = config.get('preprocessing', {})
+    sampling = {
+        'method': preprocessing.get('sampling_method', 'none'),
+        'sampling_ratio': preprocessing.get('sampling_ratio', 1.0),
+        'k_neighbors': preprocessing.get('smote_k_neighbors', 5),
+        'random_state': random_state,
+    }
+
+    logger.info(f"Iniciando validação cruzada estratificada: {n_splits} folds, {max_workers} processos.")
+    start = time.perf_counter()
+
+    shared_dir = tempfile.mkdtemp(prefix='cv_shared_')
+    try:
+        X_path = os.path.join(shared_dir, 'X.npy')
+        y_path = os.path.join(shared_dir, 'y.npy')
+        np.save(X_path, X.to_numpy(dtype=np.float64))
+        np.save(y_path, y.to_numpy())
+
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        folds = list(splitter.split(np.zeros(len(y)), y))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _fit_fold, fold, train_idx, val_idx, X_path, y_path,
+                    list(X.columns), training['model_type'], params, sampling
+                )
+                for fold, (train_idx, val_idx) in enumerate(folds)
+            ]
+            fold_results = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    metric_names = ['roc_auc', 'average_precision', 'precision', 'recall', 'f1', 'fit_seconds']
+    summary = {
+        name: {
+            'mean': float(np.mean([r[name] for r in fold_results])),
+            'std': float(np.std([r[name] for r in fold_results])),
+        }
+        for name in metric_names
+    }
+    wall_seconds = time.perf_counter() - start
+    logger.info(f"Validação cruzada concluída em {wall_seconds:.2f}s. "
+                f"ROC AUC: {summary['roc_auc']['mean']:.4f} ± {summary['roc_auc']['std']:.4f}")
+
+    return {
+        'n_splits': n_splits,
+        'workers': max_workers,
+        'wall_seconds': round(wall_seconds, 4),
+        'folds': fold_results,
+        'summary': summary,
+    }
+
+def save_cv_metrics(results: dict, run_dir: str) -> str:
+    """Salva as métricas da validação cruzada no diretório do run."""
+    cv_path = os.path.join(run_dir, CV_METRICS_FILENAME)
+    with open(cv_path, 'w') as f:
+        yaml.safe_dump(results, f, sort_keys=False)
+    logger.info(f"Métricas da validação cruzada salvas em: {cv_path}")
+    return cv_path
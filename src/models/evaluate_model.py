@@ -8,19 +8,57 @@ from sklearn.metrics import (
     classification_report,
     confusion_matrix,
     roc_auc_score,
+    roc_curve,
+    precision_recall_curve,
+    average_precision_score,
     RocCurveDisplay,
     PrecisionRecallDisplay,
 )
-import matplotlib.pyplot as plt
-import seaborn as sns
 from src.utils.model_utils import load_model_from_pkl
-def run(config: dict, model_path: str):
+from src.models.score_monitor import ScoreMonitor, save_score_reference, save_monitor_reference
+from src.models.streaming_metrics import StreamingEvaluator
+from src.models.predict_model import labels_from_proba
+
+def evaluate_streaming(model, test_features_path: str, test_target_path: str, chunksize: int = 100_000,
+                       n_bins: int = 10_000):
     """
-    Avalia o modelo treinado usando os dados de teste e salva os resultados.
+    Avalia o modelo lendo os dados de teste em blocos, com memória independente do tamanho do teste.
+
+    Features e alvo são lidos em paralelo, bloco a bloco; cada bloco é pontuado uma única vez
+    (a classe predita é a positiva quando a probabilidade supera o limiar do modelo, ou 0.5,
+    como em model.predict; ver labels_from_proba) e descartado
+    depois de atualizar os acumuladores.
+
+    Returns:
+        (StreamingEvaluator, ScoreMonitor): Métricas acumuladas e distribuição de scores.
+    """
+    evaluator = StreamingEvaluator(positive_label=model.classes_[1], n_bins=n_bins)
+    monitor = ScoreMonitor()
+    with pd.read_csv(test_features_path, chunksize=chunksize) as features_reader, \
+            pd.read_csv(test_target_path, chunksize=chunksize) as target_reader:
+        for X_chunk, y_chunk in zip(features_reader, target_reader):
+            if len(X_chunk) != len(y_chunk):
+                raise ValueError("Features e alvo de teste têm números de linhas diferentes.")
+            probabilities = model.predict_proba(X_chunk)
+            y_pred = labels_from_proba(model, probabilities)
+            evaluator.update(y_chunk.iloc[:, 0].to_numpy(), y_pred, probabilities[:, 1])
+            monitor.update(probabilities[:, 1], y_pred)
+        if next(features_reader, None) is not None or next(target_reader, None) is not None:
+            raise ValueError("Features e alvo de teste têm números de linhas diferentes.")
+    return evaluator, monitor
+
+def compute_evaluation(config: dict, model_path: str):
+    """
+    Calcula as métricas do modelo nos dados de teste e salva metrics.yaml e a distribuição
+    de scores de referência no diretório do run.
 
     Args:
         config (dict): Dicionário de configuração carregado do config.yaml.
         model_path (str): Caminho para o arquivo de modelo treinado (.pkl).
+
+    Returns:
+        dict | None: Dados dos gráficos ('run_dir', 'confusion_matrix', 'roc' e 'precision_recall'),
+        ou None se o modelo ou os dados de teste não puderem ser carregados.
     """
     logger = logging.getLogger(__name__)
     logger.info("--- Iniciando Etapa: Avaliação do Modelo ---")
@@ -33,47 +71,101 @@ def run(config: dict, model_path: str):
         model = load_model_from_pkl(model_path)
     except (FileNotFoundError, Exception) as e: # Catch both specific FileNotFoundError and generic Exception from utility
         logger.error(f"Erro ao carregar o modelo: {e}")
-        return
+        return None
 
     # Carregar dados de teste
     test_features_path = config['data']['test_features_path']
     test_target_path = config['data']['test_target_path']
-    
-    try:
-        X_test = pd.read_csv(test_features_path)
-        y_test = pd.read_csv(test_target_path).squeeze()
-        logger.info(f"Dados de teste carregados. Shape: {X_test.shape}")
-    except FileNotFoundError as e:
-        logger.error(f"Erro ao carregar dados de teste: {e}")
-        return
+    streaming = config.get('evaluation', {}).get('streaming', {})
+
+    if streaming.get('enable', False):
+        # Avaliação em blocos: curvas e AUC a partir de histogramas de score de resolução fixa
+        chunksize = streaming.get('chunksize', 100_000)
+        logger.info(f"Avaliando o conjunto de teste em blocos de {chunksize} linhas...")
+        try:
+            evaluator, monitor = evaluate_streaming(
+                model, test_features_path, test_target_path, chunksize, streaming.get('n_bins', 10_000)
+            )
+        except FileNotFoundError as e:
+            logger.error(f"Erro ao carregar dados de teste: {e}")
+            return None
+        logger.info(f"Dados de teste avaliados: {monitor.n_rows} linhas.")
+
+        report = evaluator.classification_report()
+        logger.info(f"\n--- Relatório de Classificação ---\n{yaml.dump(report, default_flow_style=False)}")
+        roc_auc = evaluator.roc_auc()
+        logger.info(f"ROC AUC Score: {roc_auc:.4f}")
 
-    # Realizar previsões
-    y_pred = model.predict(X_test)
-    y_pred_proba = model.predict_proba(X_test)[:, 1]
+        metrics = {'classification_report': report, 'roc_auc_score': roc_auc}
+        cm = evaluator.confusion_matrix()
+        fpr, tpr = evaluator.roc_curve()
+        precision, recall = evaluator.precision_recall_curve()
+        average_precision = evaluator.average_precision()
+    else:
+        try:
+            X_test = pd.read_csv(test_features_path)
+            y_test = pd.read_csv(test_target_path).squeeze()
+            logger.info(f"Dados de teste carregados. Shape: {X_test.shape}")
+        except FileNotFoundError as e:
+            logger.error(f"Erro ao carregar dados de teste: {e}")
+            return None
 
-    # Gerar e logar métricas de avaliação
-    logger.info("\n--- Relatório de Classificação ---")
-    report = classification_report(y_test, y_pred)
-    logger.info(f"\n{report}")
+        # Realizar previsões
+        probabilities = model.predict_proba(X_test)
+        y_pred = labels_from_proba(model, probabilities)
+        y_pred_proba = probabilities[:, 1]
 
-    roc_auc = roc_auc_score(y_test, y_pred_proba)
-    logger.info(f"ROC AUC Score: {roc_auc:.4f}")
+        # Gerar e logar métricas de avaliação
+        logger.info("\n--- Relatório de Classificação ---")
+        report = classification_report(y_test, y_pred)
+        logger.info(f"\n{report}")
+
+        roc_auc = roc_auc_score(y_test, y_pred_proba)
+        logger.info(f"ROC AUC Score: {roc_auc:.4f}")
+
+        metrics = {
+            'classification_report': classification_report(y_test, y_pred, output_dict=True),
+            'roc_auc_score': roc_auc
+        }
+        cm = confusion_matrix(y_test, y_pred)
+        fpr, tpr, _ = roc_curve(y_test, y_pred_proba, pos_label=model.classes_[1])
+        precision, recall, _ = precision_recall_curve(y_test, y_pred_proba, pos_label=model.classes_[1])
+        average_precision = average_precision_score(y_test, y_pred_proba, pos_label=model.classes_[1])
 
     # Salvar métricas em um arquivo YAML
-    metrics = {
-        'classification_report': classification_report(y_test, y_pred, output_dict=True),
-        'roc_auc_score': roc_auc
-    }
     metrics_path = os.path.join(run_dir, 'metrics.yaml')
     with open(metrics_path, 'w') as f:
         yaml.dump(metrics, f, default_flow_style=False)
     logger.info(f"Métricas de avaliação salvas em: {metrics_path}")
 
-    # --- Geração de Gráficos ---
+    # Distribuição de scores de referência para o monitoramento da pontuação
+    if streaming.get('enable', False):
+        save_monitor_reference(monitor, run_dir)
+    else:
+        save_score_reference(y_pred_proba, y_pred, run_dir)
+
+    return {
+        'run_dir': run_dir,
+        'confusion_matrix': cm,
+        'roc': {'fpr': fpr, 'tpr': tpr, 'roc_auc': roc_auc},
+        'precision_recall': {'precision': precision, 'recall': recall, 'average_precision': average_precision},
+    }
+
+def render_evaluation_plots(evaluation: dict) -> None:
+    """
+    Gera os gráficos de avaliação (matrizes de confusão, curvas ROC e Precision-Recall) no
+    diretório do run, a partir do resultado de compute_evaluation (sem reler o modelo ou os dados).
+    """
+    logger = logging.getLogger(__name__)
+    run_dir = evaluation['run_dir']
+    cm = evaluation['confusion_matrix']
+
+    # matplotlib e seaborn são importados apenas aqui, onde os gráficos são gerados
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
     # 1. Matriz de Confusão (Valores Absolutos)
     plt.figure(figsize=(8, 6))
-    cm = confusion_matrix(y_test, y_pred)
     sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', xticklabels=['Não Fraude', 'Fraude'], yticklabels=['Não Fraude', 'Fraude'])
     plt.title('Matriz de Confusão (Valores Absolutos)')
     plt.xlabel('Previsão')
@@ -97,7 +189,7 @@ def run(config: dict, model_path: str):
 
     # 3. Curva ROC
     plt.figure(figsize=(8, 6))
-    roc_display = RocCurveDisplay.from_estimator(model, X_test, y_test)
+    RocCurveDisplay(**evaluation['roc']).plot(ax=plt.gca())
     plt.title('Curva ROC')
     roc_curve_path = os.path.join(run_dir, "roc_curve.png")
     plt.savefig(roc_curve_path)
@@ -106,7 +198,7 @@ def run(config: dict, model_path: str):
 
     # 4. Curva Precision-Recall
     plt.figure(figsize=(8, 6))
-    pr_display = PrecisionRecallDisplay.from_estimator(model, X_test, y_test)
+    PrecisionRecallDisplay(**evaluation['precision_recall']).plot(ax=plt.gca())
     plt.title('Curva Precision-Recall')
     pr_curve_path = os.path.join(run_dir, "precision_recall_curve.png")
     plt.savefig(pr_curve_path)
@@ -114,3 +206,15 @@ def run(config: dict, model_path: str):
     logger.info(f"Curva Precision-Recall salva em: {pr_curve_path}")
 
     logger.info("--- Etapa de Avaliação do Modelo Concluída ---\n")
+
+def run(config: dict, model_path: str):
+    """
+    Avalia o modelo treinado usando os dados de teste e salva os resultados.
+
+    Args:
+        config (dict): Dicionário de configuração carregado do config.yaml.
+        model_path (str): Caminho para o arquivo de modelo treinado (.pkl).
+    """
+    evaluation = compute_evaluation(config, model_path)
+    if evaluation is not None:
+        render_evaluation_plots(evaluation)
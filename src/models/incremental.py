@@ -0,0 +1,155 @@
+import os
+import logging
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+import yaml
+
+from ..utils.model_utils import load_model_from_pkl
+
+logger = logging.getLogger(__name__)
+
+LINEAGE_FILENAME = 'lineage.yaml'
+
+def supports_incremental(model) -> bool:
+    """Crescimento incremental exige uma floresta do scikit-learn com warm_start (ex: RandomForestClassifier)."""
+    if not hasattr(model, 'estimators_') or not hasattr(model, 'get_params'):
+        return False
+    params = model.get_params()
+    return 'warm_start' in params and 'n_estimators' in params
+
+def load_lineage(run_dir: str):
+    """
+    Returns:
+        dict | None: Linhagem do run, ou None se o run foi treinado do zero.
+    """
+    path = os.path.join(run_dir, LINEAGE_FILENAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return yaml.safe_load(f)
+
+def grow_forest(model, X_new: pd.DataFrame, y_new, n_new_trees: int, max_trees: int = None):
+    """
+    Acrescenta n_new_trees árvores ajustadas apenas em X_new à floresta (warm_start) e, se
+    max_trees for informado, descarta as árvores mais antigas acima desse total.
+
+    As árvores existentes não são reajustadas: o custo depende do tamanho de X_new e de
+    n_new_trees, não do histórico usado nos treinos anteriores. O modelo é alterado no lugar.
+
+    Args:
+        model: Floresta treinada (ver supports_incremental).
+        X_new (pd.DataFrame): Dados recentes, com as mesmas features e ordem do treino original.
+        y_new: Target dos dados recentes (precisa conter todas as classes do modelo).
+        n_new_trees (int): Árvores a acrescentar.
+        max_trees (int, opcional): Tamanho da janela deslizante de árvores.
+
+    Returns:
+        (modelo, número de árvores descartadas)
+    """
+    if not supports_incremental(model):
+        raise ValueError(f"Treino incremental suportado apenas para florestas com warm_start; recebeu {type(model).__name__}.")
+    if n_new_trees < 1:
+        raise ValueError("n_new_trees deve ser maior que zero.")
+    # O fit com warm_start redefine os nomes das features sem checar as árvores já existentes
+    if hasattr(model, 'feature_names_in_') and list(X_new.columns) != [str(c) for c in model.feature_names_in_]:
+        raise ValueError(
+            f"As features dos dados novos diferem das do modelo de origem: "
+            f"{list(X_new.columns)} != {list(model.feature_names_in_)}"
+        )
+    missing_classes = set(model.classes_.tolist()) - set(np.unique(y_new).tolist())
+    if missing_classes:
+        raise ValueError(f"Os dados novos não contêm as classes {sorted(missing_classes)}; as novas árvores seriam incompatíveis.")
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_new_trees)
+    model.fit(X_new, y_new)
+    model.set_params(warm_start=False)
+
+    n_dropped = 0
+    if max_trees is not None and len(model.estimators_) > max_trees:
+        n_dropped = len(model.estimators_) - max_trees
+        model.estimators_ = model.estimators_[n_dropped:]
+        model.set_params(n_estimators=len(model.estimators_))
+    return model, n_dropped
+
+def _age_out(segments: list, n_dropped: int) -> list:
+    """Remove n_dropped árvores dos segmentos mais antigos da linhagem."""
+    remaining = []
+    for segment in segments:
+        dropped = min(segment['n_trees'], n_dropped)
+        n_dropped -= dropped
+        if segment['n_trees'] > dropped:
+            remaining.append({**segment, 'n_trees': segment['n_trees'] - dropped})
+    return remaining
+
+def fit_incremental(X_new: pd.DataFrame, y_new, incremental_config: dict):
+    """
+    Carrega o modelo do run de origem e acrescenta árvores ajustadas nos dados novos.
+
+    Args:
+        X_new (pd.DataFrame): Dados recentes (já balanceados, se configurado).
+        y_new: Target dos dados recentes.
+        incremental_config (dict): Seção training.incremental do config.yaml.
+
+    Returns:
+        (modelo, linhagem) — a linhagem é gravada no novo run com save_lineage.
+    """
+    base_model_path = incremental_config['base_model_path']
+    n_new_trees = incremental_config.get('n_new_trees', 20)
+    max_trees = incremental_config.get('max_trees')
+
+    model = load_model_from_pkl(base_model_path)
+    parent_run_dir = os.path.dirname(base_model_path)
+    parent_run = os.path.basename(os.path.abspath(parent_run_dir))
+    n_parent_trees = len(model.estimators_)
+    parent_lineage = load_lineage(parent_run_dir)
+    if parent_lineage is None:
+        segments = [{'run': parent_run, 'n_trees': n_parent_trees}]
+    else:
+        segments = parent_lineage['segments']
+
+    logger.info(
+        f"Treino incremental a partir de {base_model_path} ({n_parent_trees} árvores): "
+        f"+{n_new_trees} árvores em {len(X_new)} linhas novas"
+        + (f", janela de {max_trees} árvores" if max_trees else "")
+    )
+    start = time.perf_counter()
+    model, n_dropped = grow_forest(model, X_new, y_new, n_new_trees, max_trees)
+    fit_seconds = time.perf_counter() - start
+    if n_dropped:
+        logger.info(f"{n_dropped} árvores mais antigas descartadas pela janela deslizante.")
+
+    lineage = {
+        'parent': {
+            'model_path': base_model_path,
+            'run': parent_run,
+            'n_trees': n_parent_trees,
+        },
+        'generation': (parent_lineage['generation'] if parent_lineage else 0) + 1,
+        'ancestors': (parent_lineage['ancestors'] if parent_lineage else []) + [parent_run],
+        'trees_added': n_new_trees,
+        'trees_dropped': n_dropped,
+        'n_trees': len(model.estimators_),
+        'max_trees': max_trees,
+        'new_data_rows': len(X_new),
+        'fit_seconds': round(fit_seconds, 4),
+        # Árvores por run de origem, da mais antiga para a mais nova (o run novo é preenchido em save_lineage)
+        'segments': _age_out(segments + [{'run': None, 'n_trees': n_new_trees}], n_dropped),
+    }
+    return model, lineage
+
+def save_lineage(lineage: dict, run_dir: str) -> str:
+    """Grava lineage.yaml no run novo, preenchendo o nome do run e o segmento das árvores novas."""
+    run = os.path.basename(os.path.abspath(run_dir))
+    lineage = {
+        'run': run,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        **lineage,
+        'segments': [{**s, 'run': s['run'] or run} for s in lineage['segments']],
+    }
+    path = os.path.join(run_dir, LINEAGE_FILENAME)
+    with open(path, 'w') as f:
+        yaml.safe_dump(lineage, f, sort_keys=False)
+    logger.info(f"Linhagem do modelo salva em: {path}")
+    return path
@@ -0,0 +1,82 @@
+import logging
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+
+logger = logging.getLogger(__name__)
+
+# Hiperparâmetros padrão de cada backend. Os valores de training.params.<model_type> são
+# aplicados por cima destes, parâmetro a parâmetro.
+DEFAULT_PARAMS = {
+    'RandomForest': {
+        'n_estimators': 100,
+        'max_depth': 10,
+        'min_samples_split': 10,
+        'class_weight': 'balanced',
+        'random_state': 42,
+    },
+    'HistGradientBoosting': {
+        'max_iter': 300,
+        'learning_rate': 0.1,
+        'max_leaf_nodes': 31,
+        'class_weight': 'balanced',
+        'early_stopping': True,
+        'validation_fraction': 0.1,
+        'n_iter_no_change': 20,
+        'random_state': 42,
+    },
+}
+
+def _build_random_forest(params: dict, n_jobs: int):
+    return RandomForestClassifier(**params, n_jobs=n_jobs)
+
+def _build_hist_gradient_boosting(params: dict, n_jobs: int):
+    # Árvores sobre histogramas (features discretizadas em até 255 bins): o custo de cada
+    # divisão depende do número de bins, não do número de linhas. O paralelismo é feito
+    # com threads OpenMP, então n_jobs não se aplica.
+    return HistGradientBoostingClassifier(**params)
+
+MODEL_BUILDERS = {
+    'RandomForest': _build_random_forest,
+    'HistGradientBoosting': _build_hist_gradient_boosting,
+}
+
+def resolve_params(training: dict, model_type: str = None) -> dict:
+    """
+    Hiperparâmetros configurados para um backend.
+
+    training.params pode ter uma seção por backend (training.params.RandomForest, ...), o que
+    permite trocar training.model_type sem editar os parâmetros, ou o formato antigo com os
+    parâmetros direto em training.params, aplicados apenas ao training.model_type configurado.
+
+    Args:
+        training: Seção 'training' do config.yaml.
+        model_type: Backend desejado (padrão: training.model_type).
+
+    Returns:
+        dict: Parâmetros do config para o backend (sem os padrões de DEFAULT_PARAMS).
+    """
+    model_type = model_type or training['model_type']
+    params = training.get('params') or {}
+    if any(key in MODEL_BUILDERS for key in params):
+        return dict(params.get(model_type) or {})
+    return dict(params) if model_type == training['model_type'] else {}
+
+def build_model(model_type: str, params: dict = None, n_jobs: int = -1):
+    """
+    Instancia o classificador configurado em training.model_type.
+
+    Todos os backends seguem a API do scikit-learn (fit, predict, predict_proba), de modo
+    que o salvamento de artefatos, a predição e a avaliação funcionam sem alterações.
+
+    Args:
+        model_type: Tipo do modelo ('RandomForest' ou 'HistGradientBoosting').
+        params: Hiperparâmetros repassados ao construtor, aplicados por cima de
+            DEFAULT_PARAMS[model_type]. Se None, usa apenas os padrões do backend.
+        n_jobs: Núcleos usados no treino (-1 = todos), quando o backend suporta.
+
+    Returns:
+        Estimador do scikit-learn ainda não treinado.
+    """
+    if model_type not in MODEL_BUILDERS:
+        raise ValueError(f"Tipo de modelo '{model_type}' não suportado. Opções: {list(MODEL_BUILDERS)}")
+    resolved = {**DEFAULT_PARAMS[model_type], **(params or {})}
+    return MODEL_BUILDERS[model_type](resolved, n_jobs)
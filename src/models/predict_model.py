@@ -0,0 +1,201 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from src.utils.model_utils import load_feature_manifest
+
+logger = logging.getLogger(__name__)
+
+# Formatos aceitos na ingestão incremental (ver stream_predictions)
+SUPPORTED_STREAM_FORMATS = ('csv', 'arrow')
+
+def resolve_feature_manifest(model, model_path: str):
+    """
+    Obtém as features esperadas pelo modelo: o manifesto salvo no treino ou, para runs antigos,
+    os nomes registrados pelo scikit-learn em 'feature_names_in_' (sem dtypes).
+
+    Returns:
+        dict | None: {'names': [...], 'dtypes': {...}} ou None se não houver informação.
+    """
+    manifest = load_feature_manifest(model_path)
+    if manifest is None and hasattr(model, 'feature_names_in_'):
+        manifest = {'names': [str(c) for c in model.feature_names_in_], 'dtypes': {}}
+    return manifest
+
+def required_input_columns(manifest, transformer=None):
+    """
+    Colunas que precisam ser lidas da entrada bruta: as features do modelo, trocando as
+    geradas pelo transformador de features derivadas pelas colunas de que ele depende.
+
+    Returns:
+        list | None: Nomes das colunas, ou None se não houver manifesto (ler tudo).
+    """
+    if manifest is None:
+        return None
+    derived = set(transformer.output_columns) if transformer is not None else set()
+    columns = [name for name in manifest['names'] if name not in derived]
+    if transformer is not None:
+        columns += [col for col in transformer.input_columns if col not in columns]
+    return columns
+
+def manifest_usecols(manifest, transformer=None):
+    """Retorna o filtro de colunas para pd.read_csv(usecols=...), lendo apenas as features do modelo."""
+    columns = required_input_columns(manifest, transformer)
+    if columns is None:
+        return None
+    names = set(columns)
+    return lambda col: col in names
+
+def project_features(input_df: pd.DataFrame, manifest) -> pd.DataFrame:
+    """
+    Valida, reordena e converte as colunas de um bloco de dados conforme o manifesto.
+
+    Args:
+        input_df (pd.DataFrame): Dados de entrada (podem conter colunas extras).
+        manifest (dict | None): Manifesto de features; None mantém o DataFrame como está.
+
+    Returns:
+        pd.DataFrame: Apenas as colunas do modelo, na ordem e com os dtypes do treino.
+    """
+    if manifest is None:
+        return input_df
+
+    names = manifest['names']
+    missing = [col for col in names if col not in input_df.columns]
+    if missing:
+        raise ValueError(f"Colunas esperadas pelo modelo ausentes nos dados de entrada: {missing}")
+
+    projected = input_df[names]
+    mismatched = {
+        col: dtype for col, dtype in manifest['dtypes'].items()
+        if str(projected[col].dtype) != dtype
+    }
+    if mismatched:
+        projected = projected.astype(mismatched)
+    return projected
+
+def labels_from_proba(model, probabilities: np.ndarray) -> np.ndarray:
+    """
+    Converte as probabilidades já calculadas em rótulos, sem chamar model.predict (que
+    recalcularia predict_proba: a cascata e a floresta compacta pontuariam o lote duas vezes).
+
+    Usa o limiar do modelo ('threshold', como na cascata) ou 0.5, o mesmo critério de
+    model.predict em todos os modelos do projeto.
+    """
+    threshold = getattr(model, 'threshold', 0.5)
+    return model.classes_[(probabilities[:, 1] > threshold).astype(int)]
+
+# Colunas da saída de predict_dataframe (sem explicações)
+PREDICTION_COLUMNS = ['status_predicao', 'predicao_raw', 'probabilidade']
+
+def predict_dataframe(model, input_df: pd.DataFrame, manifest=None, transformer=None, monitor=None,
+                      explainer=None) -> pd.DataFrame:
+    """
+    Realiza predições em um DataFrame e monta a saída no formato padrão do projeto.
+
+    Args:
+        model: Modelo treinado (compatível com a API do scikit-learn).
+        input_df (pd.DataFrame): Features das transações a serem classificadas.
+        manifest (dict | None): Manifesto de features do modelo (ver resolve_feature_manifest).
+        transformer (DerivedFeatureTransformer | None): Transformador salvo com o modelo; as
+            features derivadas são adicionadas ao próprio input_df antes da projeção.
+        monitor (ScoreMonitor | None): Se informado, acumula a distribuição dos scores de fraude.
+        explainer (TreePathExplainer | None): Se informado, explica apenas as linhas classificadas
+            como fraude, com as colunas 'explicacao_*' (vazias nas demais linhas).
+
+    Returns:
+        pd.DataFrame: Colunas 'status_predicao', 'predicao_raw' e 'probabilidade'.
+    """
+    if transformer is not None:
+        transformer.transform(input_df)
+    input_df = project_features(input_df, manifest)
+    probabilities = model.predict_proba(input_df)
+    predictions = labels_from_proba(model, probabilities)
+    if monitor is not None:
+        monitor.update(probabilities[:, 1], predictions)
+
+    # Mapear predições numéricas para strings "FRAUDE" ou "NÃO_FRAUDE"
+    status_predicao = np.where(predictions == 1, 'FRAUDE', 'NÃO_FRAUDE')
+
+    # Probabilidade da classe predita (certeza da predição)
+    probabilidade_predita = probabilities.max(axis=1)
+
+    output_df = pd.DataFrame({
+        'status_predicao': status_predicao,
+        'predicao_raw': predictions,
+        'probabilidade': probabilidade_predita
+    })
+
+    if explainer is not None:
+        # O custo cresce com o número de alertas, não com o tamanho do lote
+        flagged = np.flatnonzero(predictions == 1)
+        for i in range(1, explainer.top_k + 1):
+            output_df[f'explicacao_feature_{i}'] = None
+            output_df[f'explicacao_contribuicao_{i}'] = np.nan
+        if len(flagged):
+            explanations = explainer.explain(input_df.iloc[flagged])
+            for column in explanations.columns:
+                output_df.loc[flagged, column] = explanations[column].to_numpy()
+    return output_df
+
+def iter_input_chunks(source, input_format: str = 'csv', chunksize: int = 50_000, manifest=None, transformer=None):
+    """
+    Lê um fluxo binário de forma incremental, produzindo DataFrames à medida que os dados chegam.
+
+    Args:
+        source: Objeto binário com método read() (arquivo, corpo de requisição, etc.).
+        input_format (str): 'csv' ou 'arrow' (Arrow IPC streaming format).
+        chunksize (int): Número de linhas por bloco na leitura de CSV.
+        manifest (dict | None): Se informado, apenas as colunas do modelo são lidas.
+        transformer (DerivedFeatureTransformer | None): Acrescenta as colunas de que ele depende.
+
+    Yields:
+        pd.DataFrame: Blocos consecutivos dos dados de entrada.
+    """
+    if input_format == 'csv':
+        with pd.read_csv(source, chunksize=chunksize, usecols=manifest_usecols(manifest, transformer)) as reader:
+            for chunk in reader:
+                yield chunk
+    elif input_format == 'arrow':
+        try:
+            import pyarrow.ipc as ipc
+        except ImportError as e:
+            raise ImportError("O formato 'arrow' requer o pacote 'pyarrow'.") from e
+        columns = required_input_columns(manifest, transformer)
+        with ipc.open_stream(source) as reader:
+            for batch in reader:
+                if columns is not None:
+                    # Projeção colunar antes da conversão para pandas
+                    batch = batch.select([name for name in columns if name in batch.schema.names])
+                yield batch.to_pandas()
+    else:
+        raise ValueError(f"Formato de entrada '{input_format}' não suportado. Opções: {SUPPORTED_STREAM_FORMATS}")
+
+def stream_predictions(model, source, output_path: str, input_format: str = 'csv', chunksize: int = 50_000, manifest=None, transformer=None, monitor=None) -> int:
+    """
+    Pontua os dados de um fluxo bloco a bloco, anexando cada resultado ao CSV de saída.
+
+    A leitura, a pontuação e a escrita acontecem por bloco, de modo que o fluxo nunca
+    precisa estar inteiro em memória (nem em um arquivo temporário).
+
+    Args:
+        model: Modelo treinado.
+        source: Objeto binário com método read().
+        output_path (str): Caminho do CSV de predições.
+        input_format (str): 'csv' ou 'arrow'.
+        chunksize (int): Número de linhas por bloco na leitura de CSV.
+        manifest (dict | None): Manifesto de features do modelo.
+        transformer (DerivedFeatureTransformer | None): Transformador salvo com o modelo.
+        monitor (ScoreMonitor | None): Acumula a distribuição dos scores de todos os blocos.
+
+    Returns:
+        int: Total de linhas pontuadas.
+    """
+    total_rows = 0
+    with open(output_path, 'w', newline='') as f:
+        for i, chunk in enumerate(iter_input_chunks(source, input_format, chunksize, manifest, transformer)):
+            output_df = predict_dataframe(model, chunk, manifest, transformer, monitor)
+            output_df.to_csv(f, index=False, header=(i == 0))
+            total_rows += len(chunk)
+            logger.info(f"Bloco {i} pontuado ({len(chunk)} linhas, {total_rows} no total).")
+    return total_rows
@@ -0,0 +1,159 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+N_SCORE_BINS = 20
+SCORE_REFERENCE_FILENAME = 'score_reference.json'
+SCORE_LOG_FILENAME = 'score_monitor.jsonl'
+
+# Faixas usuais de interpretação do PSI
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+_log_lock = threading.Lock()
+
+def score_histogram(fraud_scores: np.ndarray, n_bins: int = N_SCORE_BINS) -> np.ndarray:
+    """Contagem dos scores de fraude em n_bins faixas fixas e iguais de [0, 1]."""
+    bins = np.minimum((np.asarray(fraud_scores) * n_bins).astype(np.int64), n_bins - 1)
+    return np.bincount(np.maximum(bins, 0), minlength=n_bins)
+
+def population_stability_index(reference_counts, current_counts, eps: float = 1e-4) -> float:
+    """
+    PSI entre duas distribuições de score discretizadas nas mesmas faixas.
+
+    PSI = soma((atual - referência) * ln(atual / referência)), com as proporções limitadas
+    inferiormente por 'eps' para faixas vazias.
+    """
+    reference = np.asarray(reference_counts, dtype=np.float64)
+    current = np.asarray(current_counts, dtype=np.float64)
+    if reference.sum() == 0 or current.sum() == 0:
+        return 0.0
+    reference = np.maximum(reference / reference.sum(), eps)
+    current = np.maximum(current / current.sum(), eps)
+    return float(np.sum((current - reference) * np.log(current / reference)))
+
+def psi_status(psi: float) -> str:
+    if psi >= PSI_SIGNIFICANT:
+        return 'significant'
+    if psi >= PSI_MODERATE:
+        return 'moderate'
+    return 'stable'
+
+class ScoreMonitor:
+    """
+    Acumula, durante a pontuação de um lote, o histograma dos scores de fraude e os contadores
+    de linhas e alertas. O custo por bloco é um bincount sobre os scores já calculados.
+    """
+
+    def __init__(self, n_bins: int = N_SCORE_BINS):
+        self.n_bins = n_bins
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.n_rows = 0
+        self.n_flagged = 0
+
+    def update(self, fraud_scores: np.ndarray, predictions: np.ndarray) -> None:
+        self.counts += score_histogram(fraud_scores, self.n_bins)
+        self.n_rows += len(fraud_scores)
+        self.n_flagged += int(np.sum(predictions == 1))
+
+    def flush(self, run_dir: str, source: str) -> dict:
+        """
+        Registra o lote no log de monitoramento do run (uma linha JSON por lote).
+
+        Returns:
+            dict: Registro salvo.
+        """
+        record = {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'source': source,
+            'n_rows': int(self.n_rows),
+            'n_flagged': int(self.n_flagged),
+            'fraud_rate': float(self.n_flagged / self.n_rows) if self.n_rows else 0.0,
+            'histogram': self.counts.tolist(),
+        }
+        log_path = os.path.join(run_dir, SCORE_LOG_FILENAME)
+        with _log_lock, open(log_path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        return record
+
+def save_score_reference(fraud_scores: np.ndarray, predictions: np.ndarray, run_dir: str,
+                         n_bins: int = N_SCORE_BINS) -> str:
+    """
+    Salva a distribuição de scores de referência (conjunto de teste da avaliação) do run.
+
+    Returns:
+        str: Caminho do arquivo de referência.
+    """
+    monitor = ScoreMonitor(n_bins)
+    monitor.update(fraud_scores, predictions)
+    return save_monitor_reference(monitor, run_dir)
+
+def save_monitor_reference(monitor: ScoreMonitor, run_dir: str) -> str:
+    """Salva como referência do run a distribuição acumulada em um ScoreMonitor (ex: avaliação em blocos)."""
+    reference = {
+        'n_bins': monitor.n_bins,
+        'n_rows': int(monitor.n_rows),
+        'fraud_rate': float(monitor.n_flagged / monitor.n_rows) if monitor.n_rows else 0.0,
+        'histogram': monitor.counts.tolist(),
+    }
+    reference_path = os.path.join(run_dir, SCORE_REFERENCE_FILENAME)
+    with open(reference_path, 'w') as f:
+        json.dump(reference, f, indent=4)
+    logger.info(f"Distribuição de scores de referência salva em: {reference_path}")
+    return reference_path
+
+def score_drift_report(run_dir: str, last_n: int = None) -> dict:
+    """
+    Compara os histogramas de score registrados na pontuação com a referência do run.
+
+    Args:
+        run_dir (str): Diretório do run (ex: runs/train1).
+        last_n (int, opcional): Considera apenas os últimos N lotes.
+
+    Returns:
+        dict: Referência, PSI e taxa de alertas por lote, e o PSI agregado dos lotes considerados.
+    """
+    reference_path = os.path.join(run_dir, SCORE_REFERENCE_FILENAME)
+    if not os.path.exists(reference_path):
+        raise FileNotFoundError(f"Referência de scores não encontrada: {reference_path}. Execute a avaliação do modelo.")
+    with open(reference_path, 'r') as f:
+        reference = json.load(f)
+
+    batches = []
+    log_path = os.path.join(run_dir, SCORE_LOG_FILENAME)
+    if os.path.exists(log_path):
+        with open(log_path, 'r') as f:
+            batches = [json.loads(line) for line in f if line.strip()]
+    if last_n:
+        batches = batches[-last_n:]
+
+    timeline = []
+    aggregate = np.zeros(reference['n_bins'], dtype=np.int64)
+    for batch in batches:
+        psi = population_stability_index(reference['histogram'], batch['histogram'])
+        aggregate += np.asarray(batch['histogram'], dtype=np.int64)
+        timeline.append({
+            'timestamp': batch['timestamp'],
+            'source': batch['source'],
+            'n_rows': batch['n_rows'],
+            'fraud_rate': batch['fraud_rate'],
+            'psi': psi,
+            'status': psi_status(psi),
+        })
+
+    aggregate_psi = population_stability_index(reference['histogram'], aggregate)
+    return {
+        'reference': {'n_rows': reference['n_rows'], 'fraud_rate': reference['fraud_rate']},
+        'batches': timeline,
+        'aggregate': {
+            'n_batches': len(batches),
+            'n_rows': int(aggregate.sum()),
+            'psi': aggregate_psi,
+            'status': psi_status(aggregate_psi),
+        },
+    }
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+from .predict_model import project_features, required_input_columns, labels_from_proba
+
+logger = logging.getLogger(__name__)
+
+SHADOW_SUMMARY_FILENAME = 'summary.json'
+
+def shadow_model_name(model_path: str) -> str:
+    """Rótulo do modelo nas colunas de saída: o nome do run, mais o arquivo se não for model.pkl."""
+    run_name = os.path.basename(os.path.dirname(os.path.abspath(model_path)))
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return run_name if stem == 'model' else f'{run_name}_{stem}'
+
+def _shared_usecols(models: list):
+    """Filtro de leitura com a união das colunas de todos os modelos (None = ler tudo)."""
+    columns = set()
+    for entry in models:
+        required = required_input_columns(entry['manifest'], entry['transformer'])
+        if required is None:
+            return None
+        columns.update(required)
+    return lambda col: col in columns
+
+def _score_model(entry: dict, chunk: pd.DataFrame):
+    """
+    Pontua um bloco com um modelo. O bloco é compartilhado entre as threads, então as
+    features derivadas são adicionadas a uma cópia rasa (sem copiar os dados).
+
+    Returns:
+        (probabilidades de fraude, predições, segundos de inferência)
+    """
+    start = time.perf_counter()
+    input_df = chunk.copy(deep=False)
+    if entry['transformer'] is not None:
+        entry['transformer'].transform(input_df)
+    input_df = project_features(input_df, entry['manifest'])
+    probabilities = entry['model'].predict_proba(input_df)
+    predictions = labels_from_proba(entry['model'], probabilities)
+    fraud_scores = probabilities[:, 1]
+    if entry.get('monitor') is not None:
+        entry['monitor'].update(fraud_scores, predictions)
+    return fraud_scores, predictions, time.perf_counter() - start
+
+def shadow_score(models: list, input_path: str, output_path: str, chunksize: int = 100_000) -> dict:
+    """
+    Pontua um CSV com vários modelos (o primeiro é o campeão) lendo cada bloco uma única vez.
+
+    Cada bloco lido é pontuado por todos os modelos em paralelo (uma thread por modelo; a
+    inferência das árvores do scikit-learn libera o GIL) enquanto o bloco seguinte é lido.
+    A saída traz, lado a lado, a probabilidade de fraude e a predição de cada modelo e a
+    coluna 'concordancia' (todos os modelos com a mesma predição).
+
+    Args:
+        models (list[dict]): Modelos com as chaves 'name', 'model', 'manifest', 'transformer'
+            e, opcionalmente, 'model_path' e 'monitor' (ScoreMonitor).
+        input_path (str): CSV de entrada.
+        output_path (str): CSV de saída.
+        chunksize (int): Linhas por bloco.
+
+    Returns:
+        dict: Resumo do lote: linhas, tempo de leitura, alertas e tempo de inferência por
+        modelo e, para cada desafiante, a concordância com o campeão.
+    """
+    champion = models[0]['name']
+    stats = {entry['name']: {'flagged': 0, 'inference_seconds': 0.0} for entry in models}
+    comparisons = {
+        entry['name']: {'disagreements': 0, 'only_champion': 0, 'only_challenger': 0,
+                        'sum_abs_probability_diff': 0.0, 'max_abs_probability_diff': 0.0}
+        for entry in models[1:]
+    }
+    n_rows, n_chunks, read_seconds = 0, 0, 0.0
+
+    def write(chunk_index: int, futures: list, f) -> None:
+        nonlocal n_rows
+        results = [future.result() for future in futures]
+        columns = {}
+        for entry, (fraud_scores, predictions, seconds) in zip(models, results):
+            columns[f"probabilidade_fraude_{entry['name']}"] = fraud_scores
+            columns[f"predicao_{entry['name']}"] = predictions
+            stats[entry['name']]['flagged'] += int((predictions == 1).sum())
+            stats[entry['name']]['inference_seconds'] += seconds
+
+        champion_scores, champion_preds, _ = results[0]
+        agreement = np.ones(len(champion_preds), dtype=bool)
+        for entry, (fraud_scores, predictions, _) in zip(models[1:], results[1:]):
+            comparison = comparisons[entry['name']]
+            differs = predictions != champion_preds
+            agreement &= ~differs
+            comparison['disagreements'] += int(differs.sum())
+            comparison['only_champion'] += int(((champion_preds == 1) & (predictions != 1)).sum())
+            comparison['only_challenger'] += int(((predictions == 1) & (champion_preds != 1)).sum())
+            abs_diff = np.abs(fraud_scores - champion_scores)
+            comparison['sum_abs_probability_diff'] += float(abs_diff.sum())
+            if len(abs_diff):
+                comparison['max_abs_probability_diff'] = max(comparison['max_abs_probability_diff'], float(abs_diff.max()))
+        columns['concordancia'] = agreement
+
+        pd.DataFrame(columns).to_csv(f, index=False, header=(chunk_index == 0))
+        n_rows += len(champion_preds)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(models)) as executor, open(output_path, 'w', newline='') as f, \
+            pd.read_csv(input_path, chunksize=chunksize, usecols=_shared_usecols(models)) as reader:
+        pending = None
+        while True:
+            read_start = time.perf_counter()
+            chunk = next(reader, None)
+            read_seconds += time.perf_counter() - read_start
+            if pending is not None:
+                write(*pending, f)
+            if chunk is None:
+                break
+            pending = (n_chunks, [executor.submit(_score_model, entry, chunk) for entry in models])
+            n_chunks += 1
+            logger.info(f"Bloco {n_chunks - 1} enviado para {len(models)} modelos ({len(chunk)} linhas).")
+
+    summary = {
+        'input': input_path,
+        'n_rows': n_rows,
+        'n_chunks': n_chunks,
+        'read_seconds': round(read_seconds, 4),
+        'wall_seconds': round(time.perf_counter() - start, 4),
+        'champion': champion,
+        'models': {
+            entry['name']: {
+                'model_path': entry.get('model_path'),
+                'flagged': stats[entry['name']]['flagged'],
+                'fraud_rate': stats[entry['name']]['flagged'] / n_rows if n_rows else 0.0,
+                'inference_seconds': round(stats[entry['name']]['inference_seconds'], 4),
+            }
+            for entry in models
+        },
+        'comparisons': {
+            name: {
+                'agreement_rate': 1.0 - comparison['disagreements'] / n_rows if n_rows else 1.0,
+                'disagreements': comparison['disagreements'],
+                'only_champion': comparison['only_champion'],
+                'only_challenger': comparison['only_challenger'],
+                'mean_abs_probability_diff': comparison['sum_abs_probability_diff'] / n_rows if n_rows else 0.0,
+                'max_abs_probability_diff': comparison['max_abs_probability_diff'],
+            }
+            for name, comparison in comparisons.items()
+        },
+    }
+    return summary
+
+def save_shadow_summary(summary: dict, output_dir: str) -> str:
+    path = os.path.join(output_dir, SHADOW_SUMMARY_FILENAME)
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=4)
+    return path
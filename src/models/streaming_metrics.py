@@ -0,0 +1,127 @@
+import numpy as np
+
+class StreamingEvaluator:
+    """
+    Acumula métricas de classificação binária bloco a bloco, com memória constante.
+
+    Guarda apenas a matriz de confusão (por par de rótulos) e dois histogramas de score de
+    resolução fixa (um por classe verdadeira). Com eles, a matriz de confusão e o relatório
+    por classe são exatos; as curvas ROC/PR e as áreas são calculadas com os limiares nas
+    fronteiras das faixas (com n_bins = 10000, a diferença para o cálculo exato só aparece
+    para scores distintos que caem na mesma faixa de largura 1e-4).
+    """
+
+    def __init__(self, positive_label, n_bins: int = 10_000):
+        self.positive_label = positive_label
+        self.n_bins = n_bins
+        self.positive_hist = np.zeros(n_bins, dtype=np.int64)
+        self.negative_hist = np.zeros(n_bins, dtype=np.int64)
+        self.pair_counts = {}
+
+    def update(self, y_true, y_pred, y_score) -> None:
+        """
+        Args:
+            y_true: Rótulos verdadeiros do bloco.
+            y_pred: Rótulos preditos do bloco.
+            y_score: Score (probabilidade) da classe positiva.
+        """
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        pairs, counts = np.unique(np.column_stack([y_true, y_pred]), axis=0, return_counts=True)
+        for (true_label, pred_label), count in zip(pairs.tolist(), counts.tolist()):
+            key = (true_label, pred_label)
+            self.pair_counts[key] = self.pair_counts.get(key, 0) + count
+
+        bins = np.clip((np.asarray(y_score) * self.n_bins).astype(np.int64), 0, self.n_bins - 1)
+        is_positive = y_true == self.positive_label
+        self.positive_hist += np.bincount(bins[is_positive], minlength=self.n_bins)
+        self.negative_hist += np.bincount(bins[~is_positive], minlength=self.n_bins)
+
+    @property
+    def labels(self) -> list:
+        return sorted({label for pair in self.pair_counts for label in pair})
+
+    def confusion_matrix(self) -> np.ndarray:
+        """Matriz de confusão (linhas: verdadeiro, colunas: predito), na ordem de 'labels'."""
+        labels = self.labels
+        index = {label: i for i, label in enumerate(labels)}
+        cm = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        for (true_label, pred_label), count in self.pair_counts.items():
+            cm[index[true_label], index[pred_label]] += count
+        return cm
+
+    def classification_report(self) -> dict:
+        """Relatório no mesmo formato de sklearn.metrics.classification_report(output_dict=True)."""
+        cm = self.confusion_matrix()
+        true_positives = np.diag(cm).astype(np.float64)
+        support = cm.sum(axis=1).astype(np.float64)
+        predicted = cm.sum(axis=0).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+            recall = np.where(support > 0, true_positives / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+        report = {}
+        for i, label in enumerate(self.labels):
+            report[str(label)] = {
+                'precision': float(precision[i]),
+                'recall': float(recall[i]),
+                'f1-score': float(f1[i]),
+                'support': float(support[i]),
+            }
+        total = support.sum()
+        report['accuracy'] = float(true_positives.sum() / total) if total else 0.0
+        report['macro avg'] = {
+            'precision': float(precision.mean()),
+            'recall': float(recall.mean()),
+            'f1-score': float(f1.mean()),
+            'support': float(total),
+        }
+        weights = support / total if total else support
+        report['weighted avg'] = {
+            'precision': float(np.dot(precision, weights)),
+            'recall': float(np.dot(recall, weights)),
+            'f1-score': float(np.dot(f1, weights)),
+            'support': float(total),
+        }
+        return report
+
+    def _cumulative_counts(self):
+        """Verdadeiros e falsos positivos acumulados, do maior para o menor limiar (faixas não vazias)."""
+        nonempty = (self.positive_hist + self.negative_hist)[::-1] > 0
+        tps = np.cumsum(self.positive_hist[::-1])[nonempty]
+        fps = np.cumsum(self.negative_hist[::-1])[nonempty]
+        return tps, fps
+
+    def roc_curve(self):
+        """
+        Returns:
+            (fpr, tpr): Curva ROC com limiares nas fronteiras das faixas de score.
+        """
+        tps, fps = self._cumulative_counts()
+        n_pos, n_neg = self.positive_hist.sum(), self.negative_hist.sum()
+        fpr = np.concatenate([[0.0], fps / n_neg]) if n_neg else np.full(len(fps) + 1, np.nan)
+        tpr = np.concatenate([[0.0], tps / n_pos]) if n_pos else np.full(len(tps) + 1, np.nan)
+        return fpr, tpr
+
+    def roc_auc(self) -> float:
+        fpr, tpr = self.roc_curve()
+        if np.isnan(fpr).any() or np.isnan(tpr).any():
+            raise ValueError("ROC AUC indefinido: o conjunto de teste precisa conter as duas classes.")
+        return float(np.trapezoid(tpr, fpr))
+
+    def precision_recall_curve(self):
+        """
+        Returns:
+            (precision, recall): Curva PR na mesma convenção do scikit-learn (recall decrescente,
+            terminando em recall 0 e precisão 1).
+        """
+        tps, fps = self._cumulative_counts()
+        n_pos = self.positive_hist.sum()
+        precision = tps / (tps + fps)
+        recall = tps / n_pos if n_pos else np.zeros_like(precision, dtype=np.float64)
+        return np.concatenate([precision[::-1], [1.0]]), np.concatenate([recall[::-1], [0.0]])
+
+    def average_precision(self) -> float:
+        precision, recall = self.precision_recall_curve()
+        return float(-np.sum(np.diff(recall) * precision[:-1]))
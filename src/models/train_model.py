@@ -3,9 +3,18 @@ import numpy as np
 import os
 import logging
 import joblib
+import shutil
 import yaml
-from sklearn.ensemble import RandomForestClassifier
+import time
+from sklearn.model_selection import train_test_split
+from ..data.sampling import resample
+from .model_factory import build_model, resolve_params
+from .cross_validation import run_cross_validation, save_cv_metrics
+from .compact_model import compact_model
+from .cascade import build_cascade
+from .incremental import fit_incremental, save_lineage
 from ..utils.path_manager import get_next_version_dir
+from ..utils.model_utils import save_feature_manifest, FEATURE_TRANSFORMER_FILENAME
 
 def run(config: dict) -> str:
     """
@@ -21,9 +30,19 @@ def run(config: dict) -> str:
     logger = logging.getLogger(__name__)
     logger.info("--- Iniciando Etapa: Treinamento do Modelo ---")
     
-    # Carregar dados de treino
+    # Treino incremental: parte do modelo de um run anterior e ajusta apenas árvores novas nos dados recentes
+    incremental = config['training'].get('incremental', {})
+    is_incremental = incremental.get('enable', False)
+
+    model_type = config['training']['model_type']
+    params = resolve_params(config['training'])
+
+    # Carregar dados de treino (no modo incremental, apenas os dados recentes)
     train_features_path = config['data']['train_features_path']
     train_target_path = config['data']['train_target_path']
+    if is_incremental:
+        train_features_path = incremental.get('features_path') or train_features_path
+        train_target_path = incremental.get('target_path') or train_target_path
     
     logger.info(f"Carregando features de treino de: {train_features_path}")
     logger.info(f"Carregando target de treino de: {train_target_path}")
@@ -32,18 +51,52 @@ def run(config: dict) -> str:
     y_train = pd.read_csv(train_target_path).squeeze()
     
     logger.info(f"Dados de treino carregados. Shape: {X_train.shape}")
+
+    # Validação cruzada estratificada (opcional), antes do balanceamento: cada fold balanceia o próprio treino
+    cv_results = None
+    if config['training'].get('cross_validation', {}).get('enable', False):
+        if is_incremental:
+            # A validação cruzada treina florestas completas do zero, o que anularia o ganho do modo incremental
+            logger.info("Validação cruzada ignorada no treino incremental.")
+        else:
+            cv_results = run_cross_validation(X_train, y_train, config)
+
+    # Separar um conjunto de validação quando alguma etapa pós-treino precisa dele
+    # (compactação da floresta, calibração da cascata). A validação mantém a distribuição real das classes.
+    compaction = config['training'].get('compaction', {})
+    cascade = config['training'].get('cascade', {})
+    X_val = y_val = None
+    if compaction.get('enable', False) or cascade.get('enable', False):
+        X_train, X_val, y_train, y_val = train_test_split(
+            X_train, y_train,
+            test_size=config['training'].get('validation_ratio', 0.2),
+            random_state=params.get('random_state', 42),
+            stratify=y_train
+        )
+        logger.info(f"Conjunto de validação separado do treino. Shape: {X_val.shape}")
+
+    # Balancear apenas os dados de treino (o teste mantém a distribuição real)
+    preprocessing = config.get('preprocessing', {})
+    X_train, y_train = resample(
+        X_train, y_train,
+        method=preprocessing.get('sampling_method', 'none'),
+        sampling_ratio=preprocessing.get('sampling_ratio', 1.0),
+        k_neighbors=preprocessing.get('smote_k_neighbors', 5),
+        random_state=params.get('random_state', 42)
+    )
     
     # Treinar modelo
-    model_type = config['training']['model_type']
-    params = config['training']['params']
-    
-    if model_type == 'RandomForest':
-        logger.info(f"Treinando RandomForest com parâmetros: {params}")
-        model = RandomForestClassifier(**params, n_jobs=-1)
-        model.fit(X_train, y_train)
-        logger.info("Modelo treinado com sucesso!")
+    lineage = None
+    if is_incremental:
+        model, lineage = fit_incremental(X_train, y_train, incremental)
+        logger.info(f"Modelo atualizado com sucesso em {lineage['fit_seconds']:.2f}s ({lineage['n_trees']} árvores)!")
     else:
-        raise ValueError(f"Tipo de modelo '{model_type}' não suportado.")
+        model = build_model(model_type, params)
+        logger.info(f"Treinando {model_type} com parâmetros: {params}")
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        logger.info(f"Modelo treinado com sucesso em {fit_seconds:.2f}s!")
     
     # Gerenciamento de Artefatos do Run
     run_dir = get_next_version_dir(prefix='train')
@@ -53,7 +106,39 @@ def run(config: dict) -> str:
     model_path = os.path.join(run_dir, 'model.pkl')
     joblib.dump(model, model_path)
     logger.info(f"Modelo salvo em: {model_path}")
+
+    # Salvar manifesto de features (nomes, ordem e dtypes vistos no treino)
+    save_feature_manifest(X_train, run_dir)
+
+    # Empacotar o transformador de features derivadas (se houver) junto com o modelo
+    transformer_path = os.path.join(config['data']['processed_data_dir'], FEATURE_TRANSFORMER_FILENAME)
+    if os.path.exists(transformer_path):
+        shutil.copy2(transformer_path, os.path.join(run_dir, FEATURE_TRANSFORMER_FILENAME))
+        logger.info(f"Transformador de features copiado para: {run_dir}")
     
+    if cv_results is not None:
+        save_cv_metrics(cv_results, run_dir)
+
+    if lineage is not None:
+        save_lineage(lineage, run_dir)
+
+    # Compactar a floresta para serving (model_compact.pkl ao lado do model.pkl)
+    if compaction.get('enable', False):
+        compact_model(
+            model, model_path, X_val, y_val,
+            tolerance=compaction.get('tolerance', 0.001),
+            max_trees=compaction.get('max_trees')
+        )
+
+    # Calibrar a pontuação em cascata (model_cascade.pkl ao lado do model.pkl)
+    if cascade.get('enable', False):
+        build_cascade(
+            model, model_path, X_val, y_val,
+            stage_boundaries=cascade.get('stages', [10, 25, 50]),
+            max_recall_loss=cascade.get('max_recall_loss', 0.01),
+            threshold=cascade.get('threshold', 0.5)
+        )
+
     # Salvar hiperparâmetros (args.yaml)
     args_path = os.path.join(run_dir, 'args.yaml')
     with open(args_path, 'w') as f:
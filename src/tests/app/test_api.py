@@ -0,0 +1,330 @@
+import os
+import io
+import pytest
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.ensemble import RandomForestClassifier
+
+from src.app import main
+from src.models.score_monitor import save_score_reference
+from src.utils.model_utils import save_feature_manifest
+
+@pytest.fixture
+def trained_model(tmp_path):
+    """
+    Treina um modelo pequeno em dados sintéticos e o salva em um diretório de run temporário.
+
+    Retorna o caminho do modelo e um DataFrame de transações para pontuação.
+    """
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.random((200, 3)), columns=['V1', 'V2', 'Amount'])
+    y = (X['V1'] > 0.9).astype(int)
+
+    model = RandomForestClassifier(n_estimators=5, random_state=42)
+    model.fit(X, y)
+
+    run_dir = tmp_path / "train1"
+    run_dir.mkdir()
+    model_path = run_dir / "model.pkl"
+    joblib.dump(model, model_path)
+
+    return str(model_path), X
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Cache de resultados isolado por teste
+    monkeypatch.setattr(main, 'RESULT_CACHE_DIR', str(tmp_path / "cache"))
+    monkeypatch.setattr(main, '_result_cache', None)
+    return TestClient(main.app)
+
+def _chunked(data: bytes, size: int = 256):
+    """Simula um upload em partes, como um cliente enviando um arquivo grande."""
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+def test_batch_predict_upload_csv(client, trained_model, monkeypatch):
+    """
+    Testa o upload de CSV em partes: todas as linhas devem ser pontuadas, na ordem original.
+    """
+    # Arrange
+    model_path, X = trained_model
+    body = X.to_csv(index=False).encode()
+    # Blocos pequenos forçam várias rodadas de pontuação durante o upload
+    monkeypatch.setattr(main, "UPLOAD_CHUNK_ROWS", 32)
+
+    # Act
+    response = client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "text/csv"},
+        content=_chunked(body)
+    )
+
+    # Assert
+    assert response.status_code == 200, response.text
+    output_file = response.json()["output_file"]
+    assert os.path.exists(output_file)
+
+    predictions = pd.read_csv(output_file)
+    expected = joblib.load(model_path).predict(X)
+    assert len(predictions) == len(X)
+    np.testing.assert_array_equal(predictions['predicao_raw'].values, expected)
+
+def test_batch_predict_upload_arrow(client, trained_model):
+    """
+    Testa o upload no formato Arrow IPC (streaming).
+    """
+    pa = pytest.importorskip("pyarrow")
+
+    # Arrange
+    model_path, X = trained_model
+    sink = io.BytesIO()
+    table = pa.Table.from_pandas(X, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=50):
+            writer.write_batch(batch)
+
+    # Act
+    response = client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        content=_chunked(sink.getvalue())
+    )
+
+    # Assert
+    assert response.status_code == 200, response.text
+    predictions = pd.read_csv(response.json()["output_file"])
+    assert len(predictions) == len(X)
+
+def test_batch_predict_upload_projects_model_features(client, trained_model):
+    """
+    Testa se colunas extras e fora de ordem são projetadas para as features do modelo.
+    """
+    # Arrange
+    model_path, X = trained_model
+    wide = X[['Amount', 'V2', 'V1']].assign(Extra=1.0, Class=0)
+    body = wide.to_csv(index=False).encode()
+
+    # Act
+    response = client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "text/csv"},
+        content=_chunked(body)
+    )
+
+    # Assert
+    assert response.status_code == 200, response.text
+    predictions = pd.read_csv(response.json()["output_file"])
+    expected = joblib.load(model_path).predict(X)
+    np.testing.assert_array_equal(predictions['predicao_raw'].values, expected)
+
+def test_batch_predict_upload_too_large(client, trained_model, monkeypatch):
+    """
+    Testa se uploads acima do limite configurado são rejeitados com 413.
+    """
+    # Arrange
+    model_path, X = trained_model
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", 1024)
+    body = X.to_csv(index=False).encode()
+
+    # Act
+    response = client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "text/csv"},
+        content=_chunked(body)
+    )
+
+    # Assert
+    assert response.status_code == 413
+
+def test_batch_predict_upload_content_length_invalido(client, trained_model):
+    """
+    Testa se um cabeçalho Content-Length que não é um número é rejeitado com 400 (e não 500).
+    """
+    model_path, _ = trained_model
+
+    response = client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "text/csv", "Content-Length": "abc"},
+        content=b"V1,V2,Amount\n0.1,0.2,3.0\n"
+    )
+
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("body", [b"", b"V9,V10\n0.1,0.2\n"], ids=["vazio", "sem_colunas"])
+def test_batch_predict_upload_entrada_invalida(client, trained_model, body):
+    """
+    Testa se um corpo vazio ou sem as colunas do modelo é rejeitado com 400 (e não 500),
+    sem deixar um diretório predictN vazio no run.
+    """
+    # Arrange
+    model_path, _ = trained_model
+    run_dir = os.path.dirname(model_path)
+
+    # Act
+    response = client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "text/csv"},
+        content=body
+    )
+
+    # Assert
+    assert response.status_code == 400, response.text
+    assert not [d for d in os.listdir(run_dir) if d.startswith('predict')]
+
+def test_batch_predict_upload_unsupported_format(client, trained_model):
+    """
+    Testa se um Content-Type desconhecido é rejeitado com 415.
+    """
+    model_path, _ = trained_model
+
+    response = client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "application/json"},
+        content=b'{}'
+    )
+
+    assert response.status_code == 415
+
+def test_score_drift(client, trained_model):
+    """
+    Testa que a pontuação registra o lote no monitoramento e que o endpoint retorna o PSI.
+    """
+    # Arrange
+    model_path, X = trained_model
+    model = joblib.load(model_path)
+    save_score_reference(model.predict_proba(X)[:, 1], model.predict(X), os.path.dirname(model_path))
+    client.post(
+        "/batch-predict/upload",
+        params={"model_path": model_path},
+        headers={"Content-Type": "text/csv"},
+        content=X.to_csv(index=False).encode()
+    )
+
+    # Act
+    response = client.get("/score-drift", params={"model_path": model_path})
+
+    # Assert
+    assert response.status_code == 200, response.text
+    batches = response.json()["results"]["batches"]
+    assert len(batches) == 1
+    assert batches[0]["n_rows"] == len(X)
+    assert batches[0]["psi"] == pytest.approx(0.0)
+
+def test_score_drift_sem_referencia(client, trained_model):
+    """
+    Testa que o endpoint retorna 404 quando o run não tem distribuição de referência.
+    """
+    model_path, _ = trained_model
+
+    response = client.get("/score-drift", params={"model_path": model_path})
+
+    assert response.status_code == 404
+
+def test_batch_predict_reaproveita_resultado_em_cache(client, trained_model, tmp_path):
+    """
+    Testa que a segunda pontuação do mesmo arquivo vem do cache, com a mesma saída.
+    """
+    # Arrange
+    model_path, X = trained_model
+    input_path = tmp_path / "batch.csv"
+    X.to_csv(input_path, index=False)
+    payload = {"model_path": model_path, "input_data_path": str(input_path)}
+
+    # Act
+    first = client.post("/batch-predict", json=payload).json()
+    second = client.post("/batch-predict", json=payload).json()
+
+    # Assert
+    assert (first["cache"], second["cache"]) == ("miss", "hit")
+    assert second["output_file"] != first["output_file"]
+    pd.testing.assert_frame_equal(pd.read_csv(second["output_file"]), pd.read_csv(first["output_file"]))
+    stats = client.get("/cache/stats").json()
+    assert stats["by_kind"]["predictions"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+def test_batch_predict_cache_depende_do_manifesto_e_saidas_sao_independentes(client, trained_model, tmp_path):
+    """
+    Testa que mudar o manifesto de features do run invalida a entrada do cache e que editar uma
+    saída entregue não altera o cache nem as próximas saídas.
+    """
+    # Arrange
+    model_path, X = trained_model
+    input_path = tmp_path / "batch.csv"
+    X.to_csv(input_path, index=False)
+    payload = {"model_path": model_path, "input_data_path": str(input_path)}
+    first = client.post("/batch-predict", json=payload).json()
+    expected = pd.read_csv(first["output_file"])
+
+    # Act
+    with open(first["output_file"], "w") as f:
+        f.write("editado\n")
+    hit = client.post("/batch-predict", json=payload).json()
+    save_feature_manifest(X, os.path.dirname(model_path))
+    after_manifest = client.post("/batch-predict", json=payload).json()
+
+    # Assert
+    assert hit["cache"] == "hit"
+    pd.testing.assert_frame_equal(pd.read_csv(hit["output_file"]), expected)
+    assert after_manifest["cache"] == "miss"
+
+def test_check_drift_invalida_cache_quando_a_entrada_muda(client, trained_model, tmp_path):
+    """
+    Testa que o relatório vem do cache para o mesmo par de arquivos e é recalculado quando
+    os dados atuais mudam ou quando alpha muda.
+    """
+    # Arrange
+    _, X = trained_model
+    reference_path, current_path = tmp_path / "reference.csv", tmp_path / "current.csv"
+    X.to_csv(reference_path, index=False)
+    X.to_csv(current_path, index=False)
+    payload = {
+        "reference_path": str(reference_path),
+        "current_path": str(current_path),
+        "report_path": str(tmp_path / "drift_report.json"),
+    }
+
+    # Act
+    statuses = [client.post("/check-drift", json=payload).json()["cache"] for _ in range(2)]
+    (X + 1.0).to_csv(current_path, index=False)
+    changed = client.post("/check-drift", json=payload).json()
+    other_alpha = client.post("/check-drift", json={**payload, "alpha": 0.5}).json()
+
+    # Assert
+    assert statuses == ["miss", "hit"]
+    assert changed["cache"] == "miss"
+    assert changed["results"]["drift_detected"]
+    assert other_alpha["cache"] == "miss"
+
+def test_shadow_predict(client, trained_model, tmp_path):
+    """
+    Testa a pontuação sombra pela API: um desafiante treinado em outro run, resumo na resposta.
+    """
+    # Arrange
+    model_path, X = trained_model
+    challenger_dir = tmp_path / "train2"
+    challenger_dir.mkdir()
+    challenger = RandomForestClassifier(n_estimators=5, random_state=7).fit(X, (X['V1'] > 0.8).astype(int))
+    joblib.dump(challenger, challenger_dir / "model.pkl")
+    input_path = tmp_path / "batch.csv"
+    X.to_csv(input_path, index=False)
+
+    # Act
+    response = client.post("/shadow-predict", json={
+        "model_path": model_path,
+        "challenger_paths": [str(challenger_dir / "model.pkl")],
+        "input_data_path": str(input_path),
+    })
+
+    # Assert
+    assert response.status_code == 200, response.text
+    summary = response.json()["summary"]
+    assert summary["n_rows"] == len(X)
+    assert summary["comparisons"]["train2"]["only_challenger"] > 0
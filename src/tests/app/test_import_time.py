@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+import pytest
+
+# Dependências pesadas que não devem ser carregadas ao importar os pontos de entrada
+HEAVY_MODULES = ('pandas', 'numpy', 'sklearn', 'scipy', 'matplotlib', 'seaborn')
+
+# Orçamento de tempo de importação (segundos, melhor de 3 execuções em processo novo)
+IMPORT_TIME_BUDGETS = {
+    'src.app.main': 1.0,
+    'src.app.predict': 0.5,
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def _measure_import(module: str) -> dict:
+    """Importa o módulo em um interpretador novo e retorna o tempo e os módulos pesados carregados."""
+    result = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+@pytest.mark.parametrize("module", sorted(IMPORT_TIME_BUDGETS))
+def test_importacao_nao_carrega_dependencias_pesadas(module):
+    """
+    Testa que importar a API e a CLI de predição não carrega pandas, scikit-learn, scipy nem matplotlib.
+    """
+    # Act
+    measurement = _measure_import(module)
+
+    # Assert
+    assert measurement['loaded'] == []
+
+@pytest.mark.parametrize("module", sorted(IMPORT_TIME_BUDGETS))
+def test_tempo_de_importacao_dentro_do_orcamento(module):
+    """
+    Testa que o tempo de inicialização dos pontos de entrada não regride além do orçamento.
+    """
+    # Act
+    best = min(_measure_import(module)['seconds'] for _ in range(3))
+
+    # Assert
+    assert best < IMPORT_TIME_BUDGETS[module], f"{module} levou {best:.3f}s para importar"
+
+def test_formatos_de_upload_consistentes():
+    """
+    Testa que os formatos aceitos pela API (definidos sem importar pandas) são os mesmos da predição.
+    """
+    from src.app import main
+    from src.models.predict_model import SUPPORTED_STREAM_FORMATS
+
+    assert set(main.SUPPORTED_STREAM_FORMATS) == set(SUPPORTED_STREAM_FORMATS)
@@ -0,0 +1,80 @@
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.app import load_test, main
+from src.utils.model_utils import save_feature_manifest
+
+@pytest.fixture(autouse=True)
+def result_cache_dir(tmp_path, monkeypatch):
+    """Mantém o cache de resultados da API dentro do diretório temporário do teste."""
+    monkeypatch.setattr(main, 'RESULT_CACHE_DIR', str(tmp_path / "cache"))
+    monkeypatch.setattr(main, '_result_cache', None)
+
+@pytest.fixture
+def model_path(tmp_path):
+    """
+    Salva um modelo pequeno e seu manifesto de features em um diretório de run temporário.
+    """
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=['V1', 'V2', 'Amount'])
+    model = RandomForestClassifier(n_estimators=5, random_state=1).fit(X, (X['V1'] > 1).astype(int))
+    run_dir = tmp_path / "train1"
+    run_dir.mkdir()
+    joblib.dump(model, run_dir / "model.pkl")
+    save_feature_manifest(X, str(run_dir))
+    return str(run_dir / "model.pkl")
+
+@pytest.mark.parametrize("scenario", ["batch-predict", "upload", "check-drift"])
+def test_teste_de_carga_em_processo(model_path, tmp_path, scenario):
+    """
+    Testa o teste de carga em processo: todas as requisições bem-sucedidas e resultados salvos em JSON.
+    """
+    # Arrange
+    output_path = tmp_path / f"{scenario}.json"
+
+    # Act
+    results = load_test.run(
+        scenario=scenario, model_path=model_path, n_requests=6, concurrency=2,
+        n_batches=2, rows_per_batch=50, output_path=str(output_path)
+    )
+
+    # Assert
+    summary = results['summary']
+    assert summary['requests'] == 6
+    assert summary['error_rate'] == 0.0, results['status_codes']
+    assert summary['latency_ms']['p50'] <= summary['latency_ms']['p99']
+    assert summary['throughput_rps'] > 0
+    with open(output_path) as f:
+        assert json.load(f)['config']['scenario'] == scenario
+    # O tráfego sintético é pontuado em uma cópia do run: o run real fica intacto
+    assert sorted(os.listdir(os.path.dirname(model_path))) == ['features.yaml', 'model.pkl']
+
+@pytest.mark.parametrize("scenario", ["batch-predict", "check-drift"])
+def test_teste_de_carga_nao_mede_acertos_de_cache(model_path, tmp_path, scenario):
+    """
+    Testa que, por padrão, cada requisição usa um lote próprio: nenhuma é atendida pelo cache.
+    """
+    # Act
+    load_test.run(scenario=scenario, model_path=model_path, n_requests=6, concurrency=2,
+                  rows_per_batch=50, output_path=str(tmp_path / "resultado.json"))
+
+    # Assert
+    stats = main.get_result_cache().stats()
+    assert stats['hits'] == 0
+    assert stats['misses'] == 6
+
+def test_comparacao_entre_execucoes():
+    """
+    Testa a variação relativa de latência e vazão entre duas execuções.
+    """
+    baseline = {'summary': {'latency_ms': {'p50': 10.0, 'p95': 20.0, 'p99': 40.0}, 'throughput_rps': 100.0}}
+    current = {'summary': {'latency_ms': {'p50': 5.0, 'p95': 20.0, 'p99': 60.0}, 'throughput_rps': 150.0}}
+
+    deltas = load_test.compare_results(baseline, current)
+
+    assert deltas == {'latency_p50': -0.5, 'latency_p95': 0.0, 'latency_p99': 0.5, 'throughput_rps': 0.5}
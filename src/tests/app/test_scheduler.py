@@ -0,0 +1,168 @@
+import os
+import shutil
+import sqlite3
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.app.scheduler import InboxScheduler, PRIORITY_DRIFT, PRIORITY_SCORE
+
+@pytest.fixture
+def scheduler_config(tmp_path):
+    """
+    Cria um modelo treinado e a configuração do agendador com diretórios temporários.
+    """
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rng.random((100, 3)), columns=['V1', 'V2', 'Amount'])
+    model = RandomForestClassifier(n_estimators=5, random_state=7).fit(X, (X['V1'] > 0.8).astype(int))
+    run_dir = tmp_path / "train1"
+    run_dir.mkdir()
+    joblib.dump(model, run_dir / "model.pkl")
+
+    inbox = tmp_path / "inbox"
+    config = {
+        'scheduler': {
+            'inbox_dir': str(inbox),
+            'done_dir': str(inbox / "done"),
+            'failed_dir': str(inbox / "failed"),
+            'ledger_path': str(tmp_path / "ledger.sqlite"),
+            'model_path': str(run_dir / "model.pkl"),
+            'metrics_path': str(tmp_path / "metrics.json"),
+            'max_workers': 2,
+        }
+    }
+    return config, X
+
+def _run_until_idle(scheduler: InboxScheduler) -> None:
+    """Duas varreduras (confirmação de arquivo estável), processamento da fila e encerramento."""
+    scheduler.start()
+    scheduler.scan()
+    scheduler.scan()
+    scheduler.drain()
+    scheduler.stop()
+
+def test_scheduler_pontua_e_move_arquivos(scheduler_config):
+    """
+    Testa que arquivos válidos vão para done/, inválidos para failed/, e as métricas são publicadas.
+    """
+    # Arrange
+    config, X = scheduler_config
+    inbox = config['scheduler']['inbox_dir']
+    os.makedirs(inbox)
+    X.iloc[:60].to_csv(os.path.join(inbox, "lote1.csv"), index=False)
+    X.iloc[60:].to_csv(os.path.join(inbox, "lote2.csv"), index=False)
+    X[['V1']].to_csv(os.path.join(inbox, "invalido.csv"), index=False)
+
+    # Act
+    scheduler = InboxScheduler(config)
+    _run_until_idle(scheduler)
+
+    # Assert
+    assert sorted(os.listdir(config['scheduler']['done_dir'])) == ["lote1.csv", "lote2.csv"]
+    assert os.listdir(config['scheduler']['failed_dir']) == ["invalido.csv"]
+    metrics = scheduler.write_metrics()
+    assert metrics['files_scored'] == 2
+    assert metrics['files_failed'] == 1
+    assert metrics['rows_scored'] == len(X)
+    assert metrics['queue_lag_seconds']['max'] is not None
+
+def test_scheduler_nao_repontua_apos_reinicio(scheduler_config):
+    """
+    Testa que o ledger impede pontuar de novo um arquivo já processado, mesmo após reiniciar.
+    """
+    # Arrange
+    config, X = scheduler_config
+    inbox = config['scheduler']['inbox_dir']
+    os.makedirs(inbox)
+    X.to_csv(os.path.join(inbox, "lote.csv"), index=False)
+    _run_until_idle(InboxScheduler(config))
+
+    # O mesmo arquivo (mesmo nome, tamanho e data de modificação) reaparece na entrada
+    shutil.copy2(os.path.join(config['scheduler']['done_dir'], "lote.csv"), os.path.join(inbox, "lote.csv"))
+
+    # Act
+    scheduler = InboxScheduler(config)
+    _run_until_idle(scheduler)
+
+    # Assert
+    assert scheduler.metrics.files_scored == 0
+    assert not os.path.exists(os.path.join(inbox, "lote.csv"))
+    run_dir = os.path.dirname(config['scheduler']['model_path'])
+    assert len([d for d in os.listdir(run_dir) if d.startswith('predict')]) == 1
+
+def test_scheduler_prioriza_pontuacao(scheduler_config):
+    """
+    Testa que a fila entrega a pontuação antes das checagens de desvio enfileiradas antes dela.
+    """
+    config, _ = scheduler_config
+    scheduler = InboxScheduler(config)
+
+    scheduler._put(PRIORITY_DRIFT, 'drift', {})
+    scheduler._put(PRIORITY_SCORE, 'score', {})
+
+    assert scheduler._queue.get()[2] == 'score'
+    assert scheduler._queue.get()[2] == 'drift'
+
+def test_scheduler_muitos_arquivos_em_paralelo_nao_compartilham_saida(scheduler_config):
+    """
+    Testa que, com vários workers pontuando ao mesmo tempo, cada arquivo recebe o seu próprio
+    diretório predictN (nenhuma saída é sobrescrita por outro arquivo).
+    """
+    # Arrange
+    config, X = scheduler_config
+    config['scheduler']['max_workers'] = 8
+    inbox = config['scheduler']['inbox_dir']
+    os.makedirs(inbox)
+    n_files = 60
+    for i in range(n_files):
+        X.iloc[i:i + 10].to_csv(os.path.join(inbox, f"lote{i}.csv"), index=False)
+
+    # Act
+    scheduler = InboxScheduler(config)
+    _run_until_idle(scheduler)
+
+    # Assert
+    run_dir = os.path.dirname(config['scheduler']['model_path'])
+    assert len([d for d in os.listdir(run_dir) if d.startswith('predict')]) == n_files
+    with sqlite3.connect(config['scheduler']['ledger_path']) as conn:
+        outputs = [row[0] for row in conn.execute("SELECT output FROM files WHERE status = 'done'")]
+    assert len(outputs) == n_files
+    assert len(set(outputs)) == n_files
+
+def test_scheduler_falha_ao_mover_nao_encerra_worker(scheduler_config, monkeypatch):
+    """
+    Testa que uma falha ao mover o arquivo é registrada como falha no ledger e que o worker
+    continua consumindo a fila.
+    """
+    # Arrange
+    config, X = scheduler_config
+    config['scheduler']['max_workers'] = 1
+    inbox = config['scheduler']['inbox_dir']
+    os.makedirs(inbox)
+    for i in range(3):
+        X.iloc[i * 10:(i + 1) * 10].to_csv(os.path.join(inbox, f"lote{i}.csv"), index=False)
+    scheduler = InboxScheduler(config)
+
+    def _move_falha(path, directory):
+        raise PermissionError(f"sem permissão: {directory}")
+
+    monkeypatch.setattr(scheduler, '_move', _move_falha)
+
+    # Act
+    scheduler.scan()
+    scheduler.scan()
+    scheduler.start()
+    scheduler.drain()
+    worker_vivo = scheduler._workers[0].is_alive()
+    scheduler.stop()
+
+    # Assert
+    assert worker_vivo
+    assert scheduler.metrics.files_failed == 3
+    assert scheduler.metrics.files_scored == 0
+    with sqlite3.connect(config['scheduler']['ledger_path']) as conn:
+        rows = conn.execute("SELECT status, error FROM files").fetchall()
+    assert len(rows) == 3
+    assert all(status == 'failed' and 'sem permissão' in error for status, error in rows)
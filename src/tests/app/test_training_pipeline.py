@@ -149,6 +149,7 @@ def test_train_evaluate_flow(pipeline_setup):
     # Verificar se os artefatos foram criados
     assert os.path.exists(model_path), f"Arquivo do modelo não foi criado em: {model_path}"
     assert os.path.exists(metrics_path), f"Arquivo de métricas não foi criado em: {metrics_path}"
+    assert os.path.exists(os.path.join(latest_run_dir, 'features.yaml')), "Manifesto de features não foi criado."
 
     # Verificar a métrica mínima de performance
     with open(metrics_path, 'r') as f:
@@ -159,3 +160,15 @@ def test_train_evaluate_flow(pipeline_setup):
     
     min_recall = 0.7 
     assert recall >= min_recall, f"Recall {recall:.2f} é menor que o mínimo esperado de {min_recall}."
+
+    # Verificar o resumo de tempos das etapas e os perfis do dataset copiados para o run
+    timing_path = os.path.join(latest_run_dir, train_pipeline.PIPELINE_TIMING_FILENAME)
+    assert os.path.exists(timing_path), f"Resumo de tempos não foi criado em: {timing_path}"
+    with open(timing_path, 'r') as f:
+        timing = yaml.safe_load(f)
+    assert set(timing['stages']) == {stage.name for stage in train_pipeline.PIPELINE_STAGES}
+    # Sem a seção 'pipeline' no config, as etapas rodam em sequência, como antes
+    assert timing['max_workers'] == 1
+    assert timing['critical_path']['stages'][0] == 'process_data'
+    for filename in ('dataset_stats.json', 'drift_reference.json'):
+        assert os.path.exists(os.path.join(latest_run_dir, filename)), f"{filename} não foi copiado para o run."
@@ -0,0 +1,103 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.detect_drift import detect_drift
+from src.data.profiling import (
+    build_dataset_stats, build_drift_reference, bin_counts, DATASET_STATS_FILENAME, DRIFT_REFERENCE_FILENAME
+)
+
+@pytest.fixture
+def processed_config(tmp_path):
+    """
+    Salva divisões de treino/teste processadas (com uma feature categórica) e a configuração que aponta para elas.
+    """
+    rng = np.random.default_rng(5)
+
+    def split(n: int):
+        X = pd.DataFrame({
+            'V1': rng.normal(size=n),
+            'Amount': rng.lognormal(3, 1, size=n),
+            'Canal': rng.choice(['web', 'loja'], size=n, p=[0.7, 0.3]),
+        })
+        y = pd.DataFrame({'Class': (rng.random(n) < 0.1).astype(int)})
+        return X, y
+
+    data = {'processed_data_dir': str(tmp_path / "processed")}
+    os.makedirs(data['processed_data_dir'])
+    for name, n in (('train', 2000), ('test', 500)):
+        X, y = split(n)
+        data[f'{name}_features_path'] = str(tmp_path / "processed" / f"{name}_processed.csv")
+        data[f'{name}_target_path'] = str(tmp_path / "processed" / f"{name}_processed_target.csv")
+        X.to_csv(data[f'{name}_features_path'], index=False)
+        y.to_csv(data[f'{name}_target_path'], index=False)
+    return {'data': data}
+
+def test_build_dataset_stats(processed_config):
+    """
+    Testa as estatísticas por divisão: linhas, classes, taxa de fraude e resumo de cada coluna.
+    """
+    # Act
+    path = build_dataset_stats(processed_config)
+
+    # Assert
+    assert os.path.basename(path) == DATASET_STATS_FILENAME
+    with open(path) as f:
+        stats = json.load(f)
+    train = stats['train']
+    target = pd.read_csv(processed_config['data']['train_target_path'])['Class']
+    assert (train['n_rows'], train['n_columns'], stats['test']['n_rows']) == (2000, 3, 500)
+    assert train['class_counts'] == {'0': int((target == 0).sum()), '1': int((target == 1).sum())}
+    assert train['fraud_rate'] == pytest.approx(target.mean())
+    assert train['columns']['V1']['p01'] <= train['columns']['V1']['p50'] <= train['columns']['V1']['p99']
+    assert (train['columns']['Canal']['missing'], train['columns']['Canal']['n_unique']) == (0, 2)
+    assert 'mean' not in train['columns']['Canal']
+
+def test_build_drift_reference(processed_config):
+    """
+    Testa o perfil de referência: faixas de quantis com proporções que somam 1 e frequências das categóricas.
+    """
+    # Act
+    path = build_drift_reference(processed_config, n_bins=5)
+
+    # Assert
+    assert os.path.basename(path) == DRIFT_REFERENCE_FILENAME
+    with open(path) as f:
+        profile = json.load(f)
+    v1 = profile['features']['V1']
+    assert v1['type'] == 'numerical'
+    assert len(v1['edges']) == 6
+    np.testing.assert_allclose(v1['proportions'], [0.2] * 5, atol=1e-3)
+    canal = profile['features']['Canal']
+    assert canal['type'] == 'categorical'
+    assert sum(canal['proportions'].values()) == pytest.approx(1.0)
+    assert canal['proportions']['web'] == pytest.approx(0.7, abs=0.05)
+
+def test_bin_counts_faixas_abertas_nas_pontas():
+    """
+    Testa que valores fora do intervalo do treino caem na primeira/última faixa.
+    """
+    counts = bin_counts([-10.0, 0.5, 1.5, 2.0, 99.0], edges=[0.0, 1.0, 2.0])
+
+    np.testing.assert_array_equal(counts, [2, 3])
+
+def test_detect_drift_com_perfil_de_referencia(processed_config, tmp_path):
+    """
+    Testa a checagem de desvio a partir do perfil salvo: sem desvio no teste, com desvio após deslocar V1.
+    """
+    # Arrange
+    profile_path = build_drift_reference(processed_config)
+    current = pd.read_csv(processed_config['data']['test_features_path'])
+    shifted_path = tmp_path / "shifted.csv"
+    current.assign(V1=current['V1'] + 1.0).to_csv(shifted_path, index=False)
+
+    # Act
+    same = detect_drift(profile_path, processed_config['data']['test_features_path'], str(tmp_path / "a.json"))
+    shifted = detect_drift(profile_path, str(shifted_path), str(tmp_path / "b.json"))
+
+    # Assert
+    assert set(same['feature_details']) == {'V1', 'Amount', 'Canal'}
+    assert not same['drift_detected']
+    assert shifted['drifted_features_list'] == ['V1']
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.sampling import resample
+
+@pytest.fixture
+def imbalanced():
+    """Dataset sintético com 2% de positivos."""
+    rng = np.random.default_rng(0)
+    n = 1000
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=['V1', 'V2', 'V3', 'Amount'])
+    y = pd.Series((np.arange(n) < 20).astype(int), name='Class')
+    X.loc[y == 1, 'V1'] += 5
+    return X, y
+
+def test_undersample_reaches_ratio(imbalanced):
+    """
+    Testa se a subamostragem mantém toda a minoria e reduz a maioria à razão pedida.
+    """
+    # Arrange
+    X, y = imbalanced
+
+    # Act
+    X_res, y_res = resample(X, y, method='undersample', sampling_ratio=0.5)
+
+    # Assert
+    assert (y_res == 1).sum() == 20
+    assert (y_res == 0).sum() == 40
+    assert len(X_res) == len(y_res)
+
+def test_smote_synthetic_samples_lie_between_minority_neighbours(imbalanced):
+    """
+    Testa se o SMOTE gera amostras dentro do envelope da classe minoritária.
+    """
+    # Arrange
+    X, y = imbalanced
+    minority = X[y == 1]
+
+    # Act
+    X_res, y_res = resample(X, y, method='SMOTE', sampling_ratio=0.5, k_neighbors=3)
+
+    # Assert
+    assert (y_res == 1).sum() == int(0.5 * 980)
+    assert (y_res == 0).sum() == 980
+    synthetic = X_res.iloc[len(X):]
+    assert (synthetic.min() >= minority.min() - 1e-9).all()
+    assert (synthetic.max() <= minority.max() + 1e-9).all()
+
+def test_resample_none_is_identity(imbalanced):
+    """
+    Testa se 'none' devolve os dados sem alteração.
+    """
+    X, y = imbalanced
+
+    X_res, y_res = resample(X, y, method='none')
+
+    assert X_res is X and y_res is y
+
+def test_resample_unknown_method(imbalanced):
+    """
+    Testa se um método desconhecido levanta ValueError.
+    """
+    X, y = imbalanced
+
+    with pytest.raises(ValueError):
+        resample(X, y, method='ADASYN')
+
+@pytest.mark.parametrize("method", ['undersample', 'SMOTE'])
+@pytest.mark.parametrize("ratio", [0, -0.5, 1.5])
+def test_resample_invalid_ratio(imbalanced, method, ratio):
+    """
+    Testa se uma razão de balanceamento fora de (0, 1] levanta ValueError com mensagem clara.
+    """
+    X, y = imbalanced
+
+    with pytest.raises(ValueError, match="sampling_ratio"):
+        resample(X, y, method=method, sampling_ratio=ratio)
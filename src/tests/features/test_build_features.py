@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.build_features import DerivedFeatureTransformer
+
+@pytest.fixture
+def transactions():
+    """Transações sintéticas fora de ordem e com empates em 'Time'."""
+    rng = np.random.default_rng(0)
+    time = rng.integers(0, 20_000, size=500).astype(float)
+    return pd.DataFrame({'Time': time, 'Amount': rng.exponential(80, size=500), 'V1': rng.random(500)})
+
+def test_transform_independe_da_divisao_em_lotes(transactions):
+    """
+    Testa se transformar o DataFrame em blocos (como no serving) dá o mesmo resultado que de uma vez.
+    """
+    # Arrange
+    transformer = DerivedFeatureTransformer().fit(transactions)
+    expected = transformer.transform(transactions, inplace=False)
+
+    # Act
+    chunks = [transformer.transform(transactions.iloc[i:i + 37].copy()) for i in range(0, len(transactions), 37)]
+
+    # Assert
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+def test_transform_is_inplace_and_adds_features(transactions):
+    """
+    Testa se as features são adicionadas no próprio DataFrame, com os valores esperados.
+    """
+    # Arrange
+    transformer = DerivedFeatureTransformer().fit(transactions)
+
+    # Act
+    result = transformer.transform(transactions)
+
+    # Assert
+    assert result is transactions
+    for col in DerivedFeatureTransformer.output_columns:
+        assert col in transactions.columns
+    np.testing.assert_allclose(transactions['Time_hour'], (transactions['Time'] / 3600) % 24)
+    np.testing.assert_allclose(transactions['Amount_log'], np.log1p(transactions['Amount']))
+
+def test_transform_requires_fit(transactions):
+    """
+    Testa se transform sem fit levanta ValueError.
+    """
+    with pytest.raises(ValueError):
+        DerivedFeatureTransformer().transform(transactions)
+
+def test_transform_missing_columns():
+    """
+    Testa se a ausência de 'Time' ou 'Amount' levanta ValueError.
+    """
+    with pytest.raises(ValueError):
+        DerivedFeatureTransformer().fit(pd.DataFrame({'V1': [1.0]}))
@@ -0,0 +1,134 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.models import batch_job
+from src.models.batch_job import run_checkpointed_job, JOB_MANIFEST_FILENAME
+
+@pytest.fixture
+def scoring_setup(tmp_path):
+    """
+    Treina um modelo pequeno e grava um CSV de entrada com 200 transações.
+    """
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, 3)), columns=['V1', 'V2', 'Amount'])
+    y = (X['V1'] > 0.8).astype(int)
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    input_path = tmp_path / "input.csv"
+    X.to_csv(input_path, index=False)
+    return model, X, str(input_path), str(tmp_path / "jobs" / "job1")
+
+def test_job_retomado_apos_falha(scoring_setup, monkeypatch):
+    """
+    Testa que um job interrompido é retomado do último bloco concluído, sem repontuar os anteriores.
+    """
+    # Arrange
+    model, X, input_path, job_dir = scoring_setup
+    original_score_chunk = batch_job._score_chunk
+    scored = []
+    fail_at = {3}
+
+    def counting_score_chunk(model, chunk, index, *args):
+        if index in fail_at:
+            raise RuntimeError("falha simulada")
+        scored.append(index)
+        return original_score_chunk(model, chunk, index, *args)
+
+    monkeypatch.setattr(batch_job, "_score_chunk", counting_score_chunk)
+    with pytest.raises(RuntimeError):
+        run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=30)
+    fail_at.clear()
+
+    # Act
+    output_path, monitor = run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=30)
+
+    # Assert
+    assert scored == [0, 1, 2, 3, 4, 5, 6]
+    predictions = pd.read_csv(output_path)
+    np.testing.assert_array_equal(predictions['predicao_raw'].values, model.predict(X))
+    assert monitor.n_rows == len(X)
+    with open(os.path.join(job_dir, JOB_MANIFEST_FILENAME)) as f:
+        job = json.load(f)
+    assert job['status'] == 'completed'
+    assert job['n_chunks'] == 7
+
+    # Um job concluído não é reprocessado
+    assert run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=30)[1] is None
+
+def test_job_rejeita_parametros_diferentes(scoring_setup):
+    """
+    Testa que um job não pode ser retomado com outro tamanho de bloco.
+    """
+    model, _, input_path, job_dir = scoring_setup
+    run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=30)
+
+    with pytest.raises(ValueError):
+        run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=50)
+
+def test_job_paralelo_preserva_ordem(scoring_setup):
+    """
+    Testa a pontuação em processos paralelos: a saída mantém a ordem das linhas de entrada.
+    """
+    # Arrange
+    model, X, input_path, job_dir = scoring_setup
+
+    # Act
+    output_path, _ = run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=25, workers=2)
+
+    # Assert
+    predictions = pd.read_csv(output_path)
+    assert len(predictions) == len(X)
+    np.testing.assert_allclose(predictions['probabilidade'].values, model.predict_proba(X).max(axis=1))
+
+def test_job_retomado_com_linhas_em_branco_e_quebras_entre_aspas(scoring_setup, monkeypatch):
+    """
+    Testa que a retomada mantém os mesmos blocos quando o CSV tem linhas em branco e campos
+    entre aspas com quebra de linha (nenhuma linha é repontuada nem pulada).
+    """
+    # Arrange
+    model, X, input_path, job_dir = scoring_setup
+    with_text = X.assign(Obs=[f'linha {i}\ncontinua' if i % 7 == 0 else 'ok' for i in range(len(X))])
+    lines = with_text.to_csv(index=False).split('\n')
+    # Linhas em branco entre os registros (fora dos campos entre aspas)
+    with open(input_path, 'w') as f:
+        f.write('\n'.join(line + ('\n' if line.startswith('0.') and i % 11 == 0 else '') for i, line in enumerate(lines)))
+    manifest = {'names': ['V1', 'V2', 'Amount'], 'dtypes': {}}
+    original_score_chunk = batch_job._score_chunk
+    fail_at = {2}
+
+    def failing_score_chunk(model, chunk, index, *args):
+        if index in fail_at:
+            raise RuntimeError("falha simulada")
+        return original_score_chunk(model, chunk, index, *args)
+
+    monkeypatch.setattr(batch_job, "_score_chunk", failing_score_chunk)
+    with pytest.raises(RuntimeError):
+        run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=30, manifest=manifest)
+    fail_at.clear()
+
+    # Act
+    output_path, monitor = run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=30, manifest=manifest)
+
+    # Assert
+    predictions = pd.read_csv(output_path)
+    assert monitor.n_rows == len(X)
+    np.testing.assert_array_equal(predictions['predicao_raw'].values, model.predict(X))
+
+def test_job_entrada_so_com_cabecalho(scoring_setup):
+    """
+    Testa que uma entrada sem linhas gera um predictions.csv com o cabeçalho de saída e zero linhas.
+    """
+    # Arrange
+    model, X, input_path, job_dir = scoring_setup
+    X.iloc[:0].to_csv(input_path, index=False)
+
+    # Act
+    output_path, _ = run_checkpointed_job(model, 'model.pkl', input_path, job_dir, chunksize=30)
+
+    # Assert
+    predictions = pd.read_csv(output_path)
+    assert list(predictions.columns) == ['status_predicao', 'predicao_raw', 'probabilidade']
+    assert len(predictions) == 0
@@ -0,0 +1,73 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from sklearn.ensemble import RandomForestClassifier
+
+from src.models.cascade import CascadeForest, build_cascade, CASCADE_REPORT_FILENAME
+from src.models.predict_model import predict_dataframe
+
+@pytest.fixture
+def imbalanced_forest():
+    """Floresta treinada em dados sintéticos desbalanceados, com um conjunto de validação."""
+    rng = np.random.default_rng(3)
+    n = 3000
+    X = pd.DataFrame(rng.normal(size=(n, 6)), columns=[f'V{i}' for i in range(1, 7)])
+    y = ((X['V1'] - X['V2'] + rng.normal(scale=0.3, size=n)) > 2.8).astype(int)
+    forest = RandomForestClassifier(n_estimators=40, max_depth=6, class_weight='balanced', random_state=0)
+    forest.fit(X[:2000], y[:2000])
+    return forest, X[2000:], y[2000:]
+
+def test_cascade_without_exits_matches_full_forest(imbalanced_forest):
+    """
+    Testa se, com margens zero (nenhuma saída antecipada), a cascata reproduz a floresta completa.
+    """
+    # Arrange
+    forest, X_val, _ = imbalanced_forest
+
+    # Act
+    cascade = CascadeForest(forest, stage_boundaries=[5, 20], margins=[0.0, 0.0])
+
+    # Assert
+    np.testing.assert_allclose(cascade.predict_proba(X_val), forest.predict_proba(X_val), atol=1e-6)
+
+def test_build_cascade_bounds_recall_loss(imbalanced_forest, tmp_path):
+    """
+    Testa se a cascata calibrada respeita o orçamento de perda de recall e reduz o custo por linha.
+    """
+    # Arrange
+    forest, X_val, y_val = imbalanced_forest
+    model_path = os.path.join(tmp_path, 'model.pkl')
+    joblib.dump(forest, model_path)
+
+    # Act
+    cascade_path = build_cascade(forest, model_path, X_val, y_val, stage_boundaries=[5, 20], max_recall_loss=0.05)
+
+    # Assert
+    with open(os.path.join(tmp_path, CASCADE_REPORT_FILENAME)) as f:
+        report = yaml.safe_load(f)
+    assert os.path.exists(cascade_path)
+    assert report['validation']['recall_loss_vs_full_model'] <= 0.05
+    assert report['validation']['mean_trees_per_row'] < 40
+    assert all(margin <= 0.5 for margin in report['margins'])
+
+def test_predict_dataframe_pontua_a_cascata_uma_vez(imbalanced_forest, monkeypatch):
+    """
+    Testa se a predição em lote pontua a cascata uma única vez por lote, com os mesmos rótulos de predict.
+    """
+    # Arrange
+    forest, X_val, _ = imbalanced_forest
+    cascade = CascadeForest(forest, stage_boundaries=[5, 20], margins=[0.05, 0.1], threshold=0.4)
+    expected = cascade.predict(X_val)
+    calls = []
+    original = cascade.score_with_exits
+    monkeypatch.setattr(cascade, 'score_with_exits', lambda X: calls.append(1) or original(X))
+
+    # Act
+    output = predict_dataframe(cascade, X_val.copy())
+
+    # Assert
+    assert len(calls) == 1
+    np.testing.assert_array_equal(output['predicao_raw'].to_numpy(), expected)
@@ -0,0 +1,52 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from sklearn.ensemble import RandomForestClassifier
+
+from src.models.compact_model import CompactForest, compact_model, COMPACTION_REPORT_FILENAME
+
+@pytest.fixture
+def forest_data():
+    """Floresta pequena treinada em dados sintéticos, com um conjunto de validação."""
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(rng.normal(size=(600, 5)), columns=[f'V{i}' for i in range(1, 6)])
+    y = ((X['V1'] + 0.5 * X['V2'] + rng.normal(scale=0.5, size=600)) > 1.5).astype(int)
+    forest = RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0).fit(X[:400], y[:400])
+    return forest, X[400:], y[400:]
+
+def test_compact_forest_matches_original_predictions(forest_data):
+    """
+    Testa se a floresta compacta (float32) reproduz as probabilidades do scikit-learn.
+    """
+    # Arrange
+    forest, X_val, _ = forest_data
+
+    # Act
+    compact = CompactForest(forest)
+
+    # Assert
+    np.testing.assert_allclose(compact.predict_proba(X_val), forest.predict_proba(X_val), atol=1e-6)
+    np.testing.assert_array_equal(compact.predict(X_val), forest.predict(X_val))
+
+def test_compact_model_respects_tolerance(forest_data, tmp_path):
+    """
+    Testa se a compactação salva o modelo e o relatório, dentro da tolerância de AUC.
+    """
+    # Arrange
+    forest, X_val, y_val = forest_data
+    model_path = os.path.join(tmp_path, 'model.pkl')
+    joblib.dump(forest, model_path)
+
+    # Act
+    compact_path = compact_model(forest, model_path, X_val, y_val, tolerance=0.01)
+
+    # Assert
+    with open(os.path.join(tmp_path, COMPACTION_REPORT_FILENAME)) as f:
+        report = yaml.safe_load(f)
+    assert os.path.exists(compact_path)
+    assert report['n_trees_compact'] <= report['n_trees_original']
+    assert report['validation_roc_auc_compact'] >= report['validation_roc_auc_original'] - 0.01
+    assert report['size_bytes_compact'] < report['size_bytes_original']
@@ -0,0 +1,46 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.cross_validation import run_cross_validation, save_cv_metrics, _effective_n_jobs
+
+@pytest.fixture
+def cv_config():
+    return {
+        'preprocessing': {'sampling_method': 'undersample', 'sampling_ratio': 0.5},
+        'training': {
+            'model_type': 'RandomForest',
+            'params': {'n_estimators': 5, 'max_depth': 4, 'random_state': 42},
+            'cross_validation': {'enable': True, 'n_splits': 3, 'n_jobs': 2},
+        },
+    }
+
+def test_run_cross_validation_reports_every_fold(cv_config, tmp_path):
+    """
+    Testa se a validação cruzada paralela gera métricas para todos os folds e o resumo agregado.
+    """
+    # Arrange
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((300, 4)), columns=['V1', 'V2', 'V3', 'Amount'])
+    y = pd.Series((X['V1'] > 0.85).astype(int), name='Class')
+
+    # Act
+    results = run_cross_validation(X, y, cv_config)
+    cv_path = save_cv_metrics(results, str(tmp_path))
+
+    # Assert
+    assert [fold['fold'] for fold in results['folds']] == [0, 1, 2]
+    assert sum(fold['validation_rows'] for fold in results['folds']) == len(X)
+    assert results['summary']['roc_auc']['mean'] > 0.9
+    assert os.path.exists(cv_path)
+
+def test_n_jobs_negativo_segue_a_convencao_do_sklearn(monkeypatch):
+    """
+    Testa a conversão de n_jobs em processos: negativos contam a partir do total de núcleos, com mínimo de 1.
+    """
+    monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+
+    assert [_effective_n_jobs(n) for n in (None, -1, -2, -8, -20, 3)] == [8, 8, 7, 1, 1, 3]
+    with pytest.raises(ValueError):
+        _effective_n_jobs(0)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+
+from src.models.explain import TreePathExplainer
+from src.models.predict_model import predict_dataframe
+
+@pytest.fixture
+def forest_and_data():
+    """
+    Floresta pequena em dados sintéticos em que a fraude depende apenas de V1 e V3.
+    """
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame(rng.random((400, 5)), columns=['V1', 'V2', 'V3', 'V4', 'Amount'])
+    y = ((X['V1'] > 0.7) & (X['V3'] > 0.5)).astype(int)
+    model = RandomForestClassifier(n_estimators=20, max_depth=6, random_state=3).fit(X, y)
+    return model, X
+
+def test_contribuicoes_reconstroem_probabilidade(forest_and_data):
+    """
+    Testa a decomposição: viés + soma das contribuições = P(fraude) do modelo.
+    """
+    # Arrange
+    model, X = forest_and_data
+    explainer = TreePathExplainer(model)
+
+    # Act
+    contributions = explainer.contributions(X)
+
+    # Assert
+    np.testing.assert_allclose(explainer.bias_ + contributions.sum(axis=1), model.predict_proba(X)[:, 1], atol=1e-9)
+
+def test_explicacoes_apenas_para_fraudes(forest_and_data):
+    """
+    Testa que apenas as linhas classificadas como fraude são explicadas, pelas features relevantes.
+    """
+    # Arrange
+    model, X = forest_and_data
+    explainer = TreePathExplainer(model, top_k=2)
+
+    # Act
+    output_df = predict_dataframe(model, X.copy(), explainer=explainer)
+
+    # Assert
+    flagged = output_df['predicao_raw'] == 1
+    assert flagged.any()
+    assert output_df.loc[~flagged, 'explicacao_feature_1'].isna().all()
+    top_features = set(output_df.loc[flagged, ['explicacao_feature_1', 'explicacao_feature_2']].to_numpy().ravel())
+    assert top_features == {'V1', 'V3'}
+    assert (output_df.loc[flagged, 'explicacao_contribuicao_1'] >= output_df.loc[flagged, 'explicacao_contribuicao_2']).all()
+
+def test_explicador_rejeita_modelo_sem_arvores_sklearn():
+    """
+    Testa que modelos que não são florestas de decisão são rejeitados.
+    """
+    X = pd.DataFrame(np.random.default_rng(0).random((50, 2)), columns=['V1', 'V2'])
+    model = HistGradientBoostingClassifier(max_iter=5).fit(X, (X['V1'] > 0.5).astype(int))
+
+    with pytest.raises(ValueError):
+        TreePathExplainer(model)
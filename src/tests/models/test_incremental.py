@@ -0,0 +1,101 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+
+from src.models.incremental import grow_forest, fit_incremental, save_lineage, LINEAGE_FILENAME
+
+def _make_data(seed: int, n: int = 300):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.random((n, 3)), columns=['V1', 'V2', 'Amount'])
+    y = (X['V1'] > 0.8).astype(int)
+    return X, y
+
+@pytest.fixture
+def base_forest():
+    X, y = _make_data(0, n=1000)
+    return RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(X, y)
+
+def test_grow_forest_acrescenta_arvores_ajustadas_nos_dados_novos(base_forest):
+    """
+    Testa que as árvores existentes são mantidas e as novas veem apenas os dados recentes.
+    """
+    # Arrange
+    X_new, y_new = _make_data(1, n=100)
+    original_trees = list(base_forest.estimators_)
+
+    # Act
+    model, n_dropped = grow_forest(base_forest, X_new, y_new, n_new_trees=5)
+
+    # Assert
+    assert n_dropped == 0
+    assert len(model.estimators_) == 15
+    assert all(a is b for a, b in zip(model.estimators_[:10], original_trees))
+    assert all(tree.tree_.n_node_samples[0] <= len(X_new) for tree in model.estimators_[10:])
+    assert model.predict_proba(X_new).shape == (len(X_new), 2)
+    assert model.warm_start is False
+
+def test_janela_deslizante_descarta_as_arvores_mais_antigas(base_forest):
+    """
+    Testa que, acima de max_trees, as árvores mais antigas são descartadas.
+    """
+    # Arrange
+    X_new, y_new = _make_data(2, n=100)
+    original_trees = list(base_forest.estimators_)
+
+    # Act
+    model, n_dropped = grow_forest(base_forest, X_new, y_new, n_new_trees=4, max_trees=12)
+
+    # Assert
+    assert n_dropped == 2
+    assert len(model.estimators_) == model.n_estimators == 12
+    assert model.estimators_[0] is original_trees[2]
+
+def test_grow_forest_rejeita_dados_incompativeis(base_forest):
+    """
+    Testa as validações: features diferentes, classes ausentes e modelos sem warm_start.
+    """
+    X_new, y_new = _make_data(3, n=100)
+
+    with pytest.raises(ValueError, match="features"):
+        grow_forest(base_forest, X_new[['V2', 'V1', 'Amount']], y_new, n_new_trees=2)
+    with pytest.raises(ValueError, match="classes"):
+        grow_forest(base_forest, X_new, np.zeros(len(X_new), dtype=int), n_new_trees=2)
+    boosting = HistGradientBoostingClassifier(max_iter=5).fit(X_new, y_new)
+    with pytest.raises(ValueError, match="florestas"):
+        grow_forest(boosting, X_new, y_new, n_new_trees=2)
+
+def test_linhagem_acompanha_as_geracoes(base_forest, tmp_path):
+    """
+    Testa a linhagem em duas gerações: ancestrais, geração e árvores por run de origem.
+    """
+    # Arrange
+    runs = tmp_path / "runs"
+    for run in ("train1", "train2", "train3"):
+        (runs / run).mkdir(parents=True)
+    joblib.dump(base_forest, runs / "train1" / "model.pkl")
+    X_new, y_new = _make_data(4, n=100)
+
+    # Act
+    model, lineage = fit_incremental(X_new, y_new, {'base_model_path': str(runs / "train1" / "model.pkl"), 'n_new_trees': 5})
+    joblib.dump(model, runs / "train2" / "model.pkl")
+    save_lineage(lineage, str(runs / "train2"))
+    model, lineage = fit_incremental(X_new, y_new, {
+        'base_model_path': str(runs / "train2" / "model.pkl"), 'n_new_trees': 5, 'max_trees': 12
+    })
+    save_lineage(lineage, str(runs / "train3"))
+
+    # Assert
+    with open(runs / "train3" / LINEAGE_FILENAME) as f:
+        saved = yaml.safe_load(f)
+    assert saved['run'] == 'train3'
+    assert saved['generation'] == 2
+    assert saved['ancestors'] == ['train1', 'train2']
+    assert saved['trees_dropped'] == 8
+    assert saved['segments'] == [
+        {'run': 'train1', 'n_trees': 2}, {'run': 'train2', 'n_trees': 5}, {'run': 'train3', 'n_trees': 5}
+    ]
+    assert sum(s['n_trees'] for s in saved['segments']) == len(model.estimators_)
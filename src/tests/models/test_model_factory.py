@@ -0,0 +1,57 @@
+import pytest
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+
+from src.models.model_factory import build_model, resolve_params
+
+def test_build_model_backends():
+    """
+    Testa se cada model_type suportado gera o estimador correspondente.
+    """
+    assert isinstance(build_model('RandomForest', {'n_estimators': 5}), RandomForestClassifier)
+    assert isinstance(build_model('HistGradientBoosting', {'max_iter': 5}), HistGradientBoostingClassifier)
+
+def test_build_model_uses_backend_defaults():
+    """
+    Testa se, sem params, os padrões do backend (balanceamento e early stopping) são aplicados.
+    """
+    model = build_model('HistGradientBoosting')
+
+    assert model.class_weight == 'balanced'
+    assert model.early_stopping is True
+
+def test_build_model_unsupported_type():
+    """
+    Testa se um model_type desconhecido levanta ValueError.
+    """
+    with pytest.raises(ValueError):
+        build_model('XGBoost', {})
+
+def test_build_model_params_sobrepoem_padroes():
+    """
+    Testa se params sobrepõem apenas as chaves informadas, mantendo os demais padrões do backend.
+    """
+    model = build_model('HistGradientBoosting', {'max_iter': 5})
+
+    assert model.max_iter == 5
+    assert model.class_weight == 'balanced'
+    assert model.early_stopping is True
+
+def test_resolve_params_por_backend_e_formato_antigo():
+    """
+    Testa a leitura de training.params com seções por backend e no formato antigo (plano).
+    """
+    # Arrange
+    per_backend = {
+        'model_type': 'HistGradientBoosting',
+        'params': {'RandomForest': {'n_estimators': 7}, 'HistGradientBoosting': {'max_iter': 9}},
+    }
+    flat = {'model_type': 'RandomForest', 'params': {'n_estimators': 7, 'max_depth': 3}}
+
+    # Act / Assert
+    assert resolve_params(per_backend) == {'max_iter': 9}
+    assert resolve_params(per_backend, 'RandomForest') == {'n_estimators': 7}
+    assert resolve_params(flat) == {'n_estimators': 7, 'max_depth': 3}
+    # Parâmetros planos são do backend configurado: não vazam para outro backend
+    assert resolve_params(flat, 'HistGradientBoosting') == {}
+    assert isinstance(build_model('HistGradientBoosting', resolve_params(flat, 'HistGradientBoosting')),
+                      HistGradientBoostingClassifier)
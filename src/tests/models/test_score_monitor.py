@@ -0,0 +1,64 @@
+import numpy as np
+
+from src.models.score_monitor import (
+    ScoreMonitor,
+    population_stability_index,
+    save_score_reference,
+    score_drift_report,
+    score_histogram,
+)
+
+def test_score_histogram_limites():
+    """
+    Testa que os scores 0 e 1 caem na primeira e na última faixa.
+    """
+    # Act
+    counts = score_histogram(np.array([0.0, 0.04, 0.5, 0.99, 1.0]), n_bins=10)
+
+    # Assert
+    assert counts.sum() == 5
+    assert counts[0] == 2
+    assert counts[5] == 1
+    assert counts[9] == 2
+
+def test_psi_distribuicoes_iguais_e_deslocadas():
+    """
+    Testa que o PSI é zero para distribuições iguais e alto para distribuições deslocadas.
+    """
+    # Arrange
+    reference = score_histogram(np.random.default_rng(0).beta(1, 20, 5000))
+    shifted = score_histogram(np.random.default_rng(1).beta(5, 5, 5000))
+
+    # Act / Assert
+    assert population_stability_index(reference, reference) == 0.0
+    assert population_stability_index(reference, shifted) > 0.25
+
+def test_score_drift_report(tmp_path):
+    """
+    Testa o relatório de desvio: um lote por flush, com PSI e taxa de fraude por lote.
+    """
+    # Arrange
+    rng = np.random.default_rng(42)
+    reference_scores = rng.beta(1, 20, 2000)
+    save_score_reference(reference_scores, (reference_scores > 0.5).astype(int), str(tmp_path))
+
+    stable = ScoreMonitor()
+    for chunk in np.array_split(rng.beta(1, 20, 2000), 4):
+        stable.update(chunk, (chunk > 0.5).astype(int))
+    stable.flush(str(tmp_path), source='estavel.csv')
+
+    drifted = ScoreMonitor()
+    scores = rng.beta(5, 5, 2000)
+    drifted.update(scores, (scores > 0.5).astype(int))
+    drifted.flush(str(tmp_path), source='desviado.csv')
+
+    # Act
+    report = score_drift_report(str(tmp_path))
+
+    # Assert
+    assert [b['source'] for b in report['batches']] == ['estavel.csv', 'desviado.csv']
+    assert report['batches'][0]['n_rows'] == 2000
+    assert report['batches'][0]['status'] == 'stable'
+    assert report['batches'][1]['status'] == 'significant'
+    assert report['batches'][1]['fraud_rate'] > report['batches'][0]['fraud_rate']
+    assert score_drift_report(str(tmp_path), last_n=1)['aggregate']['n_batches'] == 1
@@ -0,0 +1,97 @@
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from src.app.predict import run_shadow_predictions
+from src.models.score_monitor import SCORE_LOG_FILENAME
+from src.models.shadow_scoring import shadow_score, shadow_model_name, SHADOW_SUMMARY_FILENAME
+from src.utils.model_utils import save_feature_manifest
+
+@pytest.fixture
+def shadow_setup(tmp_path):
+    """
+    Salva um campeão (V1, V2, Amount) e um desafiante treinado com outras features (V1, V2),
+    cada um em seu run, e grava um CSV de entrada com uma coluna extra não usada.
+    """
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame(rng.random((250, 3)), columns=['V1', 'V2', 'Amount'])
+    y = ((X['V1'] + X['V2']) > 1.3).astype(int)
+    model_paths = []
+    for run, columns, seed in (("train1", ['V1', 'V2', 'Amount'], 0), ("train2", ['V1', 'V2'], 1)):
+        run_dir = tmp_path / "runs" / run
+        run_dir.mkdir(parents=True)
+        model = RandomForestClassifier(n_estimators=5, random_state=seed).fit(X[columns], y)
+        joblib.dump(model, run_dir / "model.pkl")
+        save_feature_manifest(X[columns], str(run_dir))
+        model_paths.append(str(run_dir / "model.pkl"))
+
+    input_path = tmp_path / "batch.csv"
+    X.assign(extra='nao usada').to_csv(input_path, index=False)
+    return model_paths, X, str(input_path)
+
+def test_shadow_score_le_a_entrada_uma_vez(shadow_setup, tmp_path, monkeypatch):
+    """
+    Testa que os dois modelos são pontuados a partir de uma única leitura do CSV, com
+    probabilidades idênticas às da pontuação individual e o resumo de concordância coerente.
+    """
+    # Arrange
+    model_paths, X, input_path = shadow_setup
+    champion, challenger = (joblib.load(path) for path in model_paths)
+    models = [
+        {'name': 'campeao', 'model': champion, 'manifest': {'names': ['V1', 'V2', 'Amount'], 'dtypes': {}}, 'transformer': None},
+        {'name': 'desafiante', 'model': challenger, 'manifest': {'names': ['V1', 'V2'], 'dtypes': {}}, 'transformer': None},
+    ]
+    reads = []
+    original_read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda *args, **kwargs: reads.append(args[0]) or original_read_csv(*args, **kwargs))
+    output_path = tmp_path / "shadow.csv"
+
+    # Act
+    summary = shadow_score(models, input_path, str(output_path), chunksize=60)
+
+    # Assert
+    assert reads == [input_path]
+    monkeypatch.undo()
+    output = pd.read_csv(output_path)
+    np.testing.assert_allclose(output['probabilidade_fraude_campeao'], champion.predict_proba(X)[:, 1])
+    np.testing.assert_allclose(output['probabilidade_fraude_desafiante'], challenger.predict_proba(X[['V1', 'V2']])[:, 1])
+
+    champion_preds, challenger_preds = champion.predict(X), challenger.predict(X[['V1', 'V2']])
+    np.testing.assert_array_equal(output['concordancia'], champion_preds == challenger_preds)
+    comparison = summary['comparisons']['desafiante']
+    assert summary['n_rows'] == len(X) and summary['n_chunks'] == 5
+    assert comparison['disagreements'] == int((champion_preds != challenger_preds).sum())
+    assert comparison['only_champion'] == int(((champion_preds == 1) & (challenger_preds == 0)).sum())
+    assert comparison['agreement_rate'] == pytest.approx(output['concordancia'].mean())
+    assert summary['models']['campeao']['flagged'] == int(champion_preds.sum())
+
+def test_run_shadow_predictions_grava_resumo_e_monitoramento(shadow_setup):
+    """
+    Testa o fluxo completo: saída em runs/train1/shadow1 e scores registrados no run de cada modelo.
+    """
+    # Arrange
+    (champion_path, challenger_path), X, input_path = shadow_setup
+
+    # Act
+    output_path = run_shadow_predictions(champion_path, [challenger_path], input_path, chunksize=100)
+
+    # Assert
+    assert os.path.dirname(output_path) == os.path.join(os.path.dirname(champion_path), "shadow1")
+    with open(os.path.join(os.path.dirname(output_path), SHADOW_SUMMARY_FILENAME)) as f:
+        summary = json.load(f)
+    assert summary['champion'] == 'train1'
+    assert set(summary['comparisons']) == {'train2'}
+    for path in (champion_path, challenger_path):
+        with open(os.path.join(os.path.dirname(path), SCORE_LOG_FILENAME)) as f:
+            assert json.loads(f.readline())['n_rows'] == len(X)
+
+def test_nome_do_modelo_na_saida():
+    """
+    Testa os rótulos das colunas: o nome do run, mais o arquivo para modelos derivados.
+    """
+    assert shadow_model_name("runs/train3/model.pkl") == "train3"
+    assert shadow_model_name("runs/train3/model_compact.pkl") == "train3_model_compact"
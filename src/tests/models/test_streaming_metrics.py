@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import average_precision_score, classification_report, confusion_matrix, roc_auc_score
+
+from src.models import evaluate_model
+from src.models.streaming_metrics import StreamingEvaluator
+
+def _flatten(report: dict) -> dict:
+    """Achata o relatório de classificação ({'classe': {'metrica': valor}}) para comparação com approx."""
+    flat = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            flat.update({f"{key}/{metric}": v for metric, v in value.items()})
+        else:
+            flat[key] = value
+    return flat
+
+@pytest.fixture
+def scored_labels():
+    """
+    Rótulos, predições e scores sintéticos (scores em múltiplos de 0,01, como numa floresta de 100 árvores).
+    """
+    rng = np.random.default_rng(11)
+    y_true = (rng.random(5000) < 0.05).astype(float)
+    y_score = np.clip(np.round(0.6 * y_true + rng.normal(0.2, 0.2, 5000), 2), 0, 1)
+    y_pred = (y_score > 0.5).astype(float)
+    return y_true, y_pred, y_score
+
+def test_metricas_em_blocos_iguais_as_do_sklearn(scored_labels):
+    """
+    Testa que as métricas acumuladas em blocos coincidem com as do scikit-learn no conjunto inteiro.
+    """
+    # Arrange
+    y_true, y_pred, y_score = scored_labels
+    evaluator = StreamingEvaluator(positive_label=1.0)
+
+    # Act
+    for chunk in np.array_split(np.arange(len(y_true)), 7):
+        evaluator.update(y_true[chunk], y_pred[chunk], y_score[chunk])
+
+    # Assert
+    np.testing.assert_array_equal(evaluator.confusion_matrix(), confusion_matrix(y_true, y_pred))
+    expected_report = classification_report(y_true, y_pred, output_dict=True)
+    assert _flatten(evaluator.classification_report()) == pytest.approx(_flatten(expected_report))
+    assert evaluator.roc_auc() == pytest.approx(roc_auc_score(y_true, y_score))
+    assert evaluator.average_precision() == pytest.approx(average_precision_score(y_true, y_score))
+
+def test_avaliacao_em_blocos_mesmo_esquema(tmp_path):
+    """
+    Testa que a avaliação em blocos gera o mesmo metrics.yaml da avaliação em memória.
+    """
+    # Arrange
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame(rng.random((600, 4)), columns=['V1', 'V2', 'V3', 'Amount'])
+    y = pd.DataFrame({'Class': ((X['V1'] + 0.3 * rng.random(600)) > 0.9).astype(float)})
+    model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=5).fit(X, y['Class'])
+    X.to_csv(tmp_path / "test.csv", index=False)
+    y.to_csv(tmp_path / "test_target.csv", index=False)
+
+    metrics_by_mode = {}
+    for mode, streaming in [('memoria', False), ('blocos', True)]:
+        run_dir = tmp_path / mode
+        run_dir.mkdir()
+        model_path = run_dir / "model.pkl"
+        pd.to_pickle(model, model_path)
+        config = {
+            'data': {'test_features_path': str(tmp_path / "test.csv"), 'test_target_path': str(tmp_path / "test_target.csv")},
+            'evaluation': {'streaming': {'enable': streaming, 'chunksize': 128}},
+        }
+
+        # Act
+        evaluate_model.run(config, str(model_path))
+        with open(run_dir / "metrics.yaml") as f:
+            metrics_by_mode[mode] = yaml.safe_load(f)
+
+    # Assert
+    memory, streamed = metrics_by_mode['memoria'], metrics_by_mode['blocos']
+    assert _flatten(streamed['classification_report']) == pytest.approx(_flatten(memory['classification_report']))
+    assert streamed['roc_auc_score'] == pytest.approx(memory['roc_auc_score'])
+    assert (tmp_path / "blocos" / "roc_curve.png").exists()
@@ -3,7 +3,7 @@ import pytest
 import joblib
 from sklearn.linear_model import LogisticRegression  # Um modelo de exemplo
 
-from src.utils.model_utils import load_model_from_pkl
+from src.utils.model_utils import load_model_from_pkl, save_feature_manifest, load_feature_manifest
 
 def test_load_model_from_pkl_success(tmp_path):
     """
@@ -57,3 +57,27 @@ def test_load_model_from_pkl_corrupted_file(tmp_path):
     with pytest.raises(Exception):
         load_model_from_pkl(corrupted_file_path)
 
+def test_feature_manifest_roundtrip(tmp_path):
+    """
+    Testa se o manifesto de features preserva nomes, ordem e dtypes do treino.
+    """
+    # Arrange
+    import pandas as pd
+    X = pd.DataFrame({'V2': [0.1, 0.2], 'Time': [1, 2], 'V1': [0.3, 0.4]})
+    model_path = os.path.join(tmp_path, "model.pkl")
+
+    # Act
+    save_feature_manifest(X, str(tmp_path))
+    manifest = load_feature_manifest(model_path)
+
+    # Assert
+    assert manifest['names'] == ['V2', 'Time', 'V1']
+    assert manifest['dtypes'] == {'V2': 'float64', 'Time': 'int64', 'V1': 'float64'}
+
+def test_load_feature_manifest_missing(tmp_path):
+    """
+    Testa se runs sem manifesto (treinados antes dele existir) retornam None.
+    """
+    model_path = os.path.join(tmp_path, "model.pkl")
+
+    assert load_feature_manifest(model_path) is None
@@ -76,3 +76,21 @@ def test_get_next_version_dir_base_dir_does_not_exist(tmp_path):
     assert os.path.isdir(base_dir) # Garante que a pasta base foi criada
     assert next_dir == expected_dir
     assert os.path.isdir(expected_dir)
+
+def test_get_next_version_dir_numero_ja_reservado(tmp_path, monkeypatch):
+    """
+    Testa que, se outro processo criou o diretório entre a listagem e a criação, o número
+    seguinte é usado em vez de reaproveitar o diretório existente.
+    """
+    # Arrange
+    base_dir = str(tmp_path)
+    os.mkdir(os.path.join(base_dir, "predict1"))
+    # Listagem "atrasada": não enxerga o predict1 recém-criado por outro worker
+    monkeypatch.setattr(os, "listdir", lambda path: [])
+
+    # Act
+    next_dir = get_next_version_dir(base_dir=base_dir, prefix="predict")
+
+    # Assert
+    assert next_dir == os.path.join(base_dir, "predict2")
+    assert os.path.isdir(next_dir)
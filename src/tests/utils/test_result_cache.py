@@ -0,0 +1,70 @@
+import os
+
+from src.utils.result_cache import ResultCache
+
+def test_fingerprint_muda_com_o_conteudo(tmp_path):
+    """
+    Testa que a impressão digital acompanha o conteúdo e é reaproveitada para o mesmo arquivo.
+    """
+    # Arrange
+    cache = ResultCache(str(tmp_path / "cache"))
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n")
+
+    # Act
+    first = cache.fingerprint(str(path))
+    again = cache.fingerprint(str(path))
+    path.write_text("a,b\n1,3\n")
+    changed = cache.fingerprint(str(path))
+
+    # Assert
+    assert first == again
+    assert changed['sha256'] != first['sha256']
+    assert ResultCache.make_key('drift', current=changed) != ResultCache.make_key('drift', current=first)
+
+def test_get_e_put_contabilizam_acertos_e_falhas(tmp_path):
+    """
+    Testa o ciclo falha -> put -> acerto para resultados JSON e arquivos.
+    """
+    # Arrange
+    cache = ResultCache(str(tmp_path / "cache"))
+    output = tmp_path / "predictions.csv"
+    output.write_text("predicao\n1\n")
+
+    # Act
+    missing = cache.get_json('drift', 'k1')
+    cache.put_json('drift', 'k1', {'drift_detected': True})
+    cached_report = cache.get_json('drift', 'k1')
+    cache.put_file('predictions', 'k2', str(output))
+    cached_output = cache.get_path('predictions', 'k2')
+
+    # Assert
+    assert missing is None
+    assert cached_report == {'drift_detected': True}
+    with open(cached_output) as f:
+        assert f.read() == "predicao\n1\n"
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert (stats['hits'], stats['misses']) == (2, 1)
+    assert stats['by_kind']['drift'] == {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+def test_remove_entradas_menos_usadas_ao_exceder_o_limite(tmp_path):
+    """
+    Testa a remoção LRU: a entrada acessada há mais tempo sai primeiro.
+    """
+    # Arrange
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=250)
+    payload = {'valor': 'x' * 80}
+    cache.put_json('drift', 'a', payload)
+    cache.put_json('drift', 'b', payload)
+    cache.get_path('drift', 'a') # 'a' passa a ser a mais recente
+
+    # Act
+    cache.put_json('drift', 'c', payload)
+
+    # Assert
+    assert cache.get_path('drift', 'b') is None
+    assert cache.get_path('drift', 'a') is not None
+    assert cache.get_path('drift', 'c') is not None
+    assert not os.path.exists(os.path.join(cache.entries_dir, 'b'))
+    assert cache.stats()['size_bytes'] <= 250
@@ -0,0 +1,66 @@
+import time
+import pytest
+
+from src.utils.stage_dag import Stage, run_stages
+
+# Funções de etapa no nível do módulo: são enviadas para processos de trabalho
+
+def _load(n: int) -> dict:
+    return {'data': list(range(n))}
+
+def _slow_sum(data: list) -> dict:
+    time.sleep(0.5)
+    return {'total': sum(data)}
+
+def _slow_count(data: list) -> dict:
+    time.sleep(0.5)
+    return {'count': len(data)}
+
+def _mean(total: int, count: int) -> dict:
+    return {'mean': total / count}
+
+def _stages():
+    return [
+        Stage('load', _load, inputs=['n'], outputs=['data']),
+        Stage('sum', _slow_sum, inputs=['data'], outputs=['total']),
+        Stage('count', _slow_count, inputs=['data'], outputs=['count']),
+        Stage('mean', _mean, inputs=['total', 'count'], outputs=['mean']),
+    ]
+
+def test_etapas_independentes_rodam_em_paralelo():
+    """
+    Testa que as duas etapas independentes se sobrepõem no tempo e que o resumo traz o caminho crítico.
+    """
+    # Act
+    artifacts, summary = run_stages(_stages(), initial={'n': 10}, max_workers=2)
+
+    # Assert
+    assert artifacts['mean'] == 4.5
+    stages = summary['stages']
+    assert stages['sum']['start'] < stages['count']['end'] and stages['count']['start'] < stages['sum']['end']
+    assert summary['critical_path']['stages'][0] == 'load' and summary['critical_path']['stages'][-1] == 'mean'
+    assert len(summary['critical_path']['stages']) == 3
+    assert summary['wall_seconds'] < summary['serial_seconds']
+    assert stages['mean']['depends_on'] == ['count', 'sum']
+
+def test_limite_de_paralelismo_um_executa_em_sequencia():
+    """
+    Testa que, com max_workers = 1, nenhuma etapa começa antes de a anterior terminar.
+    """
+    artifacts, summary = run_stages(_stages(), initial={'n': 4}, max_workers=1)
+
+    assert artifacts['mean'] == 1.5
+    intervals = sorted((t['start'], t['end']) for t in summary['stages'].values())
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+
+def test_grafo_invalido():
+    """
+    Testa as validações do grafo: entrada sem produtor e ciclo entre etapas.
+    """
+    with pytest.raises(ValueError, match="sem produtor"):
+        run_stages([Stage('mean', _mean, inputs=['total', 'count'], outputs=['mean'])])
+    with pytest.raises(ValueError, match="Ciclo"):
+        run_stages([
+            Stage('a', _slow_sum, inputs=['count'], outputs=['total']),
+            Stage('b', _slow_count, inputs=['total'], outputs=['count']),
+        ])
@@ -1,6 +1,6 @@
-import joblib
 import logging
 import os
+import yaml
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,8 @@ def load_model_from_pkl(model_path: str):
             raise FileNotFoundError(f"Arquivo do modelo não encontrado: {model_path}")
         
         logger.info(f"Carregando modelo de: {model_path}")
+        import joblib # Importado sob demanda: joblib carrega o numpy
+
         model = joblib.load(model_path)
         logger.info("Modelo carregado com sucesso.")
     
@@ -26,3 +28,69 @@ def load_model_from_pkl(model_path: str):
     except Exception as e:
         logger.error(f"Erro inesperado ao carregar o modelo de {model_path}: {e}", exc_info=True)
         raise
+
+FEATURE_MANIFEST_FILENAME = 'features.yaml'
+
+def save_feature_manifest(X, run_dir: str) -> str:
+    """
+    Salva o manifesto de features (nomes, ordem e dtypes) usado no treino, ao lado do model.pkl.
+
+    Args:
+        X (pd.DataFrame): Features exatamente como foram passadas ao fit do modelo.
+        run_dir (str): Diretório do run (ex: runs/train1).
+
+    Returns:
+        str: Caminho do manifesto salvo.
+    """
+    manifest = {
+        'features': [{'name': str(col), 'dtype': str(dtype)} for col, dtype in X.dtypes.items()]
+    }
+    manifest_path = os.path.join(run_dir, FEATURE_MANIFEST_FILENAME)
+    with open(manifest_path, 'w') as f:
+        yaml.safe_dump(manifest, f, sort_keys=False)
+    logger.info(f"Manifesto de features salvo em: {manifest_path}")
+    return manifest_path
+
+def load_feature_manifest(model_path: str):
+    """
+    Carrega o manifesto de features do diretório do modelo.
+
+    Args:
+        model_path (str): Caminho do modelo (.pkl); o manifesto é procurado no mesmo diretório.
+
+    Returns:
+        dict | None: {'names': [...], 'dtypes': {nome: dtype}} ou None se o run não tiver manifesto
+        (modelos treinados antes da introdução do manifesto).
+    """
+    manifest_path = os.path.join(os.path.dirname(model_path), FEATURE_MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        logger.warning(f"Manifesto de features não encontrado em: {manifest_path}")
+        return None
+
+    with open(manifest_path, 'r') as f:
+        manifest = yaml.safe_load(f)
+    features = manifest['features']
+    return {
+        'names': [feat['name'] for feat in features],
+        'dtypes': {feat['name']: feat['dtype'] for feat in features}
+    }
+
+FEATURE_TRANSFORMER_FILENAME = 'feature_transformer.pkl'
+
+def load_feature_transformer(model_path: str):
+    """
+    Carrega o transformador de features derivadas salvo no diretório do modelo.
+
+    Args:
+        model_path (str): Caminho do modelo (.pkl); o transformador é procurado no mesmo diretório.
+
+    Returns:
+        DerivedFeatureTransformer | None: None se o run foi treinado sem features derivadas.
+    """
+    transformer_path = os.path.join(os.path.dirname(model_path), FEATURE_TRANSFORMER_FILENAME)
+    if not os.path.exists(transformer_path):
+        return None
+    logger.info(f"Carregando transformador de features de: {transformer_path}")
+    import joblib
+
+    return joblib.load(transformer_path)
@@ -29,10 +29,14 @@ def get_next_version_dir(base_dir: str = 'runs', prefix: str = 'run') -> str:
             if num > max_num:
                 max_num = num
                 
+    # Criação atômica: com vários processos/threads escolhendo o mesmo número ao mesmo tempo,
+    # apenas um consegue criar o diretório; os demais tentam o número seguinte
     next_num = max_num + 1
-    next_dir = os.path.join(base_dir, f'{prefix}{next_num}')
-    
-    os.makedirs(next_dir, exist_ok=True)
-    
-    return next_dir
+    while True:
+        next_dir = os.path.join(base_dir, f'{prefix}{next_num}')
+        try:
+            os.mkdir(next_dir)
+            return next_dir
+        except FileExistsError:
+            next_num += 1
 
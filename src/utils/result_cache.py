@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_INDEX_FILENAME = 'index.sqlite'
+HASH_BLOCK_BYTES = 1024 * 1024
+
+class ResultCache:
+    """
+    Cache em disco de resultados (relatórios JSON e arquivos de saída), com tamanho limitado
+    e remoção do item usado há mais tempo (LRU).
+
+    As chaves são montadas a partir de impressões digitais do conteúdo das entradas
+    (tamanho, data de modificação e SHA-256). O SHA-256 de cada arquivo é memorizado no
+    índice pelo (caminho, tamanho, data de modificação, inode), então uma entrada já vista
+    custa apenas um stat; o arquivo só é relido quando muda.
+
+    As entradas são cópias independentes das saídas (não hard links): editar uma saída
+    entregue não altera o cache nem as outras saídas geradas a partir dele.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.entries_dir = os.path.join(cache_dir, 'entries')
+        os.makedirs(self.entries_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(cache_dir, RESULT_CACHE_INDEX_FILENAME), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY, kind TEXT, filename TEXT, size_bytes INTEGER,
+                    created_at REAL, last_access REAL, hits INTEGER DEFAULT 0
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS file_digests (
+                    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, digest TEXT
+                )"""
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats (kind TEXT PRIMARY KEY, hits INTEGER, misses INTEGER)"
+            )
+
+    def fingerprint(self, path: str) -> dict:
+        """
+        Returns:
+            dict: {'size', 'mtime', 'sha256'} do arquivo (FileNotFoundError se não existir).
+        """
+        stat = os.stat(path)
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM file_digests WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                (abs_path, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            ).fetchone()
+        if row:
+            digest = row[0]
+        else:
+            sha256 = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b''):
+                    sha256.update(block)
+            digest = sha256.hexdigest()
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO file_digests (path, size, mtime_ns, inode, digest) VALUES (?, ?, ?, ?, ?)",
+                    (abs_path, stat.st_size, stat.st_mtime_ns, stat.st_ino, digest)
+                )
+        return {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': digest}
+
+    def fingerprint_if_exists(self, path: str):
+        """Impressão digital de um arquivo opcional do run (None se ele não existir)."""
+        return self.fingerprint(path) if os.path.exists(path) else None
+
+    @staticmethod
+    def make_key(kind: str, **params) -> str:
+        """Chave do resultado: hash dos parâmetros (impressões digitais, alpha, ...) em JSON canônico."""
+        payload = json.dumps({'kind': kind, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _count(self, kind: str, hit: bool) -> None:
+        self._conn.execute("INSERT OR IGNORE INTO stats (kind, hits, misses) VALUES (?, 0, 0)", (kind,))
+        column = 'hits' if hit else 'misses'
+        self._conn.execute(f"UPDATE stats SET {column} = {column} + 1 WHERE kind = ?", (kind,))
+
+    def get_path(self, kind: str, key: str):
+        """
+        Procura um resultado no cache e contabiliza o acerto ou a falha.
+
+        Returns:
+            str | None: Caminho do arquivo guardado, ou None se não estiver no cache.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT filename FROM entries WHERE key = ?", (key,)).fetchone()
+            path = os.path.join(self.entries_dir, key, row[0]) if row else None
+            if path and not os.path.exists(path):
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                path = None
+            if path:
+                self._conn.execute(
+                    "UPDATE entries SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+                )
+            self._count(kind, hit=path is not None)
+        logger.info(f"Cache de resultados ({kind}): {'acerto' if path else 'falha'} para a chave {key[:12]}.")
+        return path
+
+    def _tmp_path(self, key: str, filename: str) -> str:
+        entry_dir = os.path.join(self.entries_dir, key)
+        os.makedirs(entry_dir, exist_ok=True)
+        return os.path.join(entry_dir, f"{filename}.tmp-{os.getpid()}-{threading.get_ident()}")
+
+    def _register(self, kind: str, key: str, tmp_path: str, filename: str) -> str:
+        """Publica o arquivo temporário da entrada, registra-a no índice e aplica o limite de tamanho."""
+        path = os.path.join(self.entries_dir, key, filename)
+        os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, filename, size_bytes, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, filename, os.path.getsize(path), now, now)
+            )
+            self._evict()
+        return path
+
+    def put_file(self, kind: str, key: str, src_path: str) -> str:
+        """
+        Guarda uma cópia de um arquivo de resultado e aplica o limite de tamanho.
+
+        Returns:
+            str: Caminho do arquivo no cache (pode já ter sido removido se exceder max_bytes).
+        """
+        filename = os.path.basename(src_path)
+        tmp_path = self._tmp_path(key, filename)
+        shutil.copyfile(src_path, tmp_path)
+        return self._register(kind, key, tmp_path, filename)
+
+    def get_json(self, kind: str, key: str):
+        """
+        Returns:
+            dict | None: Resultado JSON guardado, ou None se não estiver no cache.
+        """
+        path = self.get_path(kind, key)
+        if path is None:
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def put_json(self, kind: str, key: str, data: dict) -> str:
+        """Guarda um resultado JSON (mesma formatação dos relatórios: indentação de 4 espaços)."""
+        tmp_path = self._tmp_path(key, 'result.json')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=4)
+        return self._register(kind, key, tmp_path, 'result.json')
+
+    def _evict(self) -> None:
+        """Remove as entradas usadas há mais tempo até o total caber em max_bytes (chamado com o lock)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size_bytes in self._conn.execute(
+                "SELECT key, size_bytes FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            shutil.rmtree(os.path.join(self.entries_dir, key), ignore_errors=True)
+            total -= size_bytes
+            logger.info(f"Cache de resultados: entrada {key[:12]} removida ({size_bytes} bytes).")
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: Entradas, bytes ocupados, limite e acertos/falhas (totais e por tipo de resultado).
+        """
+        with self._lock:
+            n_entries, size_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries"
+            ).fetchone()
+            rows = self._conn.execute("SELECT kind, hits, misses FROM stats ORDER BY kind").fetchall()
+
+        def summary(hits: int, misses: int) -> dict:
+            lookups = hits + misses
+            return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / lookups, 4) if lookups else None}
+
+        return {
+            'entries': n_entries,
+            'size_bytes': size_bytes,
+            'max_bytes': self.max_bytes,
+            **summary(sum(r[1] for r in rows), sum(r[2] for r in rows)),
+            'by_kind': {kind: summary(hits, misses) for kind, hits, misses in rows},
+        }
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,156 @@
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+logger = logging.getLogger(__name__)
+
+class Stage:
+    """
+    Etapa do pipeline com entradas e saídas declaradas.
+
+    A função recebe as entradas como argumentos nomeados e retorna um dict com exatamente as
+    saídas declaradas. As dependências entre etapas vêm dessas declarações: uma etapa depende
+    das etapas que produzem as suas entradas.
+    """
+
+    def __init__(self, name: str, func, inputs=(), outputs=()):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+
+def _execute(func, kwargs: dict):
+    """Executa a etapa (em um processo de trabalho) e mede o horário de início e fim."""
+    start = time.time()
+    outputs = func(**kwargs)
+    return outputs, start, time.time()
+
+def _dependencies(stages: list, initial: dict) -> dict:
+    """Resolve o grafo: para cada etapa, as etapas que produzem as suas entradas."""
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers or output in initial:
+                raise ValueError(f"Artefato '{output}' produzido por mais de uma fonte.")
+            producers[output] = stage.name
+
+    dependencies = {}
+    for stage in stages:
+        missing = [name for name in stage.inputs if name not in producers and name not in initial]
+        if missing:
+            raise ValueError(f"Etapa '{stage.name}': entradas sem produtor: {missing}")
+        dependencies[stage.name] = {producers[name] for name in stage.inputs if name in producers}
+
+    # Detecção de ciclos (ordenação topológica)
+    resolved = set()
+    while len(resolved) < len(stages):
+        ready = [name for name, deps in dependencies.items() if name not in resolved and deps <= resolved]
+        if not ready:
+            raise ValueError(f"Ciclo entre as etapas: {sorted(set(dependencies) - resolved)}")
+        resolved.update(ready)
+    return dependencies
+
+def critical_path(timings: dict, dependencies: dict) -> dict:
+    """
+    Caminho crítico: a cadeia de dependências com a maior soma de durações, ou seja, o menor
+    tempo total possível com paralelismo ilimitado.
+
+    Returns:
+        dict: {'stages': [...], 'seconds': duração total da cadeia}
+    """
+    finish, previous = {}, {}
+    pending = dict(dependencies)
+    while pending:
+        for name, deps in list(pending.items()):
+            if all(dep in finish for dep in deps):
+                before = max(deps, key=lambda dep: finish[dep], default=None)
+                previous[name] = before
+                finish[name] = timings[name]['seconds'] + (finish[before] if before else 0.0)
+                del pending[name]
+
+    # Em empate (etapas com duração ~0), fica a etapa mais adiante na ordem topológica
+    name = max(reversed(list(finish)), key=finish.get)
+    chain = []
+    while name is not None:
+        chain.append(name)
+        name = previous[name]
+    return {'stages': chain[::-1], 'seconds': round(max(finish.values()), 4)}
+
+def run_stages(stages: list, initial: dict = None, max_workers: int = 1):
+    """
+    Executa as etapas respeitando as dependências, com até max_workers etapas em paralelo,
+    cada uma em um processo próprio. Com max_workers = 1, as etapas rodam em sequência no
+    próprio processo.
+
+    Args:
+        stages (list[Stage]): Etapas do pipeline.
+        initial (dict): Artefatos disponíveis antes da primeira etapa (ex: {'config': ...}).
+        max_workers (int): Limite de etapas simultâneas.
+
+    Returns:
+        (artefatos, resumo de tempos): todos os artefatos produzidos e, por etapa, início, fim
+        e duração (em segundos desde o início do pipeline), o tempo total, a soma das
+        durações e o caminho crítico.
+    """
+    artifacts = dict(initial or {})
+    dependencies = _dependencies(stages, artifacts)
+    by_name = {stage.name: stage for stage in stages}
+    timings = {}
+    done = set()
+    pipeline_start = time.time()
+
+    def record(stage: Stage, outputs: dict, start: float, end: float) -> None:
+        outputs = outputs or {}
+        if set(outputs) != set(stage.outputs):
+            raise ValueError(f"Etapa '{stage.name}' retornou {sorted(outputs)}; esperado {sorted(stage.outputs)}.")
+        artifacts.update(outputs)
+        timings[stage.name] = {
+            'start': round(start - pipeline_start, 4),
+            'end': round(end - pipeline_start, 4),
+            'seconds': round(end - start, 4),
+        }
+        done.add(stage.name)
+        logger.info(f"Etapa '{stage.name}' concluída em {end - start:.2f}s.")
+
+    def ready() -> list:
+        return [name for name, deps in dependencies.items()
+                if name not in done and name not in running and deps <= done]
+
+    running = {}
+    if max_workers <= 1:
+        while len(done) < len(stages):
+            for name in ready():
+                stage = by_name[name]
+                record(stage, *_execute(stage.func, {key: artifacts[key] for key in stage.inputs}))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            while len(done) < len(stages):
+                for name in ready():
+                    if len(running) >= max_workers:
+                        break
+                    stage = by_name[name]
+                    logger.info(f"Etapa '{name}' iniciada.")
+                    future = executor.submit(_execute, stage.func, {key: artifacts[key] for key in stage.inputs})
+                    running[name] = future
+                finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name, future in list(running.items()):
+                    if future in finished:
+                        del running[name]
+                        record(by_name[name], *future.result())
+
+    wall_seconds = time.time() - pipeline_start
+    serial_seconds = sum(t['seconds'] for t in timings.values())
+    path = critical_path(timings, dependencies)
+    summary = {
+        'max_workers': max_workers,
+        'wall_seconds': round(wall_seconds, 4),
+        'serial_seconds': round(serial_seconds, 4),
+        'parallel_speedup': round(serial_seconds / wall_seconds, 3) if wall_seconds else None,
+        'critical_path': path,
+        'stages': {
+            name: {**timings[name], 'depends_on': sorted(dependencies[name]),
+                   'on_critical_path': name in path['stages']}
+            for name in sorted(timings, key=lambda n: timings[n]['start'])
+        },
+    }
+    return artifacts, summary
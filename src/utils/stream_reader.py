@@ -0,0 +1,70 @@
+import io
+import queue
+
+class QueueStreamReader(io.RawIOBase):
+    """
+    Arquivo binário somente-leitura alimentado por blocos de bytes vindos de outra thread.
+
+    Permite que um produtor (ex: o loop assíncrono recebendo o corpo de uma requisição HTTP)
+    entregue blocos via feed() enquanto um consumidor bloqueante (ex: pd.read_csv) lê o
+    mesmo fluxo em uma thread de trabalho. A fila é limitada, o que aplica contrapressão
+    ao produtor quando o consumidor está mais lento.
+    """
+
+    def __init__(self, max_pending_chunks: int = 64):
+        self._queue = queue.Queue(maxsize=max_pending_chunks)
+        self._buffer = b''
+        self._eof = False
+        self._error = None
+
+    def readable(self) -> bool:
+        return True
+
+    def feed(self, data: bytes) -> None:
+        """
+        Entrega um bloco de bytes ao leitor (bloqueia se a fila estiver cheia).
+
+        Levanta ValueError se o consumidor já fechou o leitor, evitando que o produtor
+        fique bloqueado indefinidamente após uma falha na leitura.
+        """
+        if data:
+            self._put(data)
+
+    def close_feed(self) -> None:
+        """Sinaliza o fim do fluxo."""
+        self._put(None)
+
+    def abort(self, error: Exception) -> None:
+        """Interrompe o fluxo; a próxima leitura levanta a exceção informada."""
+        self._error = error
+        # Descarta blocos pendentes para que o sentinela sempre caiba na fila
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put_nowait(None)
+
+    def _put(self, item) -> None:
+        while True:
+            if self.closed:
+                raise ValueError("Leitor fechado pelo consumidor.")
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readinto(self, b) -> int:
+        while not self._buffer and not self._eof and self._error is None:
+            data = self._queue.get()
+            if data is None:
+                self._eof = True
+            else:
+                self._buffer = data
+        if self._error is not None:
+            raise self._error
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n